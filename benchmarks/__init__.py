@@ -0,0 +1 @@
+"""Benchmarks package - Mesures de performance et de mémoire"""
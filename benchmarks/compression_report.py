@@ -0,0 +1,104 @@
+"""
+Compression Report
+Compare le chargement de orders.csv brut et compressé (gzip, bz2, xz):
+taille lue sur disque et temps de bout en bout (lecture + décompression
++ parsing).
+
+Usage:
+    python -m benchmarks.compression_report [--orders 200000] [--repeats 3]
+"""
+
+import argparse
+import bz2
+import gzip
+import lzma
+import shutil
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.synthetic import DatasetSpec, generate_dataset
+from src.repositories.order_repository import OrderRepository
+from src.repositories.parse_cache import PARSE_CACHE
+
+
+_COMPRESSORS = {
+    'gzip': ('.gz', lambda src, dst: _stream(src, gzip.open(dst, 'wb', compresslevel=6))),
+    'bz2': ('.bz2', lambda src, dst: _stream(src, bz2.open(dst, 'wb'))),
+    'xz': ('.xz', lambda src, dst: _stream(src, lzma.open(dst, 'wb', preset=6))),
+}
+
+
+def _stream(source: Path, target) -> None:
+    with open(source, 'rb') as src, target as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+
+
+@dataclass(frozen=True)
+class CompressionMeasure:
+    """
+    Chargement de orders.csv dans un format donné.
+
+    Attributes:
+        label: Format ('brut', 'gzip'...)
+        file_bytes: Taille du fichier lu
+        orders: Commandes chargées
+        median_s: Durée médiane du chargement
+    """
+    label: str
+    file_bytes: int
+    orders: int
+    median_s: float
+
+
+def measure(path: Path, label: str, repeats: int) -> CompressionMeasure:
+    """Charge `repeats` fois le fichier (sans cache des fichiers parsés), retourne la médiane"""
+    durations = []
+    orders = []
+    for _ in range(repeats):
+        PARSE_CACHE.invalidate()
+        start = time.perf_counter()
+        orders = OrderRepository().load_all(path)
+        durations.append(time.perf_counter() - start)
+    return CompressionMeasure(label, path.stat().st_size, len(orders), statistics.median(durations))
+
+
+def build_report(measures: List[CompressionMeasure]) -> str:
+    """Formate les mesures (la première sert de référence)"""
+    baseline = measures[0]
+    lines = [f"{'Format':<8} {'Taille Mo':>10} {'Ratio':>7} {'Commandes':>10} "
+             f"{'Médiane s':>10} {'vs brut':>8}"]
+    for m in measures:
+        lines.append(
+            f"{m.label:<8} {m.file_bytes / 1e6:>10.2f} {m.file_bytes / baseline.file_bytes:>7.1%} "
+            f"{m.orders:>10} {m.median_s:>10.3f} {m.median_s / baseline.median_s - 1:>+8.1%}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> str:
+    parser = argparse.ArgumentParser(description="Chargement de orders.csv compressé")
+    parser.add_argument('--orders', type=int, default=200_000)
+    parser.add_argument('--customers', type=int, default=5_000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = generate_dataset(tmp, DatasetSpec(customers=args.customers, orders=args.orders))
+        plain = data_dir / 'orders.csv'
+        measures = [measure(plain, 'brut', args.repeats)]
+        for label, (suffix, compress) in _COMPRESSORS.items():
+            target = data_dir / f'orders{suffix}'
+            compress(plain, target)
+            measures.append(measure(target, label, args.repeats))
+
+    report = build_report(measures)
+    print(report)
+    return report
+
+
+if __name__ == '__main__':
+    main()
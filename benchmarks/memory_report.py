@@ -0,0 +1,101 @@
+"""
+Memory Report
+Mesure la mémoire occupée par ligne de commande chargée, avec et sans
+encodage par dictionnaire des colonnes répétitives de orders.csv.
+
+Usage:
+    python -m benchmarks.memory_report [--orders 200000] [--customers 5000]
+"""
+
+import argparse
+import gc
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.synthetic import DatasetSpec, generate_dataset
+from src.repositories.order_repository import OrderRepository
+
+
+@dataclass(frozen=True)
+class MemoryMeasure:
+    """
+    Mémoire retenue par un chargement de orders.csv.
+
+    Attributes:
+        label: Configuration mesurée
+        orders: Nombre de commandes chargées
+        total_bytes: Octets retenus après chargement
+    """
+    label: str
+    orders: int
+    total_bytes: int
+
+    @property
+    def bytes_per_order(self) -> float:
+        """Octets par ligne de commande"""
+        return self.total_bytes / self.orders if self.orders else 0.0
+
+
+def measure_orders(orders_path: Path, intern_strings: bool) -> MemoryMeasure:
+    """
+    Charge orders.csv et mesure la mémoire retenue par le résultat.
+
+    Args:
+        orders_path: Fichier à charger
+        intern_strings: Active l'encodage par dictionnaire
+
+    Returns:
+        La mesure (le pool de valeurs partagées est inclus)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        repo = OrderRepository(intern_strings=intern_strings)
+        orders = repo.load_all(orders_path)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    label = 'encodage dictionnaire' if intern_strings else 'chaînes par ligne'
+    return MemoryMeasure(label, len(orders), retained)
+
+
+def build_report(measures: List[MemoryMeasure]) -> str:
+    """Formate les mesures (la première sert de référence)"""
+    baseline = measures[0]
+    lines = [f"{'Configuration':<24} {'Commandes':>10} {'Octets/ligne':>13} {'Gain':>7}"]
+    for m in measures:
+        gain = 1 - m.bytes_per_order / baseline.bytes_per_order if baseline.bytes_per_order else 0.0
+        lines.append(f"{m.label:<24} {m.orders:>10} {m.bytes_per_order:>13.1f} {gain:>6.1%}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> str:
+    parser = argparse.ArgumentParser(description="Mémoire par ligne de commande")
+    parser.add_argument('--orders', type=int, default=200_000)
+    parser.add_argument('--customers', type=int, default=5_000)
+    parser.add_argument('--data-dir', type=Path, default=None,
+                        help="Jeu de données existant (sinon synthétique)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or generate_dataset(
+            tmp, DatasetSpec(customers=args.customers, orders=args.orders)
+        )
+        orders_path = Path(data_dir) / 'orders.csv'
+        report = build_report([
+            measure_orders(orders_path, intern_strings=False),
+            measure_orders(orders_path, intern_strings=True),
+        ])
+
+    print(report)
+    return report
+
+
+if __name__ == '__main__':
+    main()
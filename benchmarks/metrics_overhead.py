@@ -0,0 +1,87 @@
+"""
+Metrics Overhead
+Mesure le surcoût de la collecte des métriques d'exécution: temps de
+l'étape de calcul avec OrderProcessor (chemin de production) et avec
+MeteredOrderProcessor. Les deux configurations sont exécutées en
+alternance pour que la dérive de la machine pèse autant sur chacune.
+
+L'enregistrement d'un chargement (record_load) est un appel par fichier:
+son coût est affiché en microsecondes.
+
+Usage:
+    python -m benchmarks.metrics_overhead [--orders 200000] [--repeats 5]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.synthetic import DatasetSpec, generate_dataset
+from src.repositories.customer_repository import CustomerRepository
+from src.repositories.order_repository import OrderRepository
+from src.repositories.product_repository import ProductRepository
+from src.repositories.promotion_repository import PromotionRepository
+from src.repositories.shipping_zone_repository import ShippingZoneRepository
+from src.services.order_enricher import OrderEnricher
+from src.services.order_processor import OrderProcessor
+from src.services.run_metrics import MeteredOrderProcessor, RunMetrics
+
+
+def _time_interleaved(processors: List[OrderProcessor], customers, lines_by_customer, zones, repeats: int) -> List[float]:
+    """Durées médianes du calcul de tous les résumés, processeurs exécutés en alternance"""
+    durations: List[List[float]] = [[] for _ in processors]
+    for _ in range(repeats):
+        for processor, samples in zip(processors, durations):
+            start = time.perf_counter()
+            for _summary in processor.iter_summaries(customers, lines_by_customer, zones):
+                pass
+            samples.append(time.perf_counter() - start)
+    return [statistics.median(samples) for samples in durations]
+
+
+def main(argv: Optional[List[str]] = None) -> str:
+    parser = argparse.ArgumentParser(description="Surcoût de la collecte des métriques")
+    parser.add_argument('--orders', type=int, default=200_000)
+    parser.add_argument('--customers', type=int, default=5_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(generate_dataset(tmp, DatasetSpec(customers=args.customers, orders=args.orders)))
+        order_repo = OrderRepository()
+        orders = order_repo.load_all(data_dir / 'orders.csv')
+        customers = CustomerRepository().load_all(data_dir / 'customers.csv')
+        products = ProductRepository().load_all(data_dir / 'products.csv')
+        promotions = PromotionRepository().load_all(data_dir / 'promotions.csv')
+        zones = ShippingZoneRepository().load_all(data_dir / 'shipping_zones.csv')
+
+    lines_by_customer = OrderProcessor.group_by_customer(
+        OrderEnricher().enrich(orders, products, promotions)
+    )
+    metrics = RunMetrics()
+    baseline, metered = _time_interleaved(
+        [OrderProcessor(), MeteredOrderProcessor(metrics)],
+        customers, lines_by_customer, zones, args.repeats
+    )
+    start = time.perf_counter()
+    for _ in range(1000):
+        metrics.record_load('orders', order_repo.last_stats, 1.0)
+    record_us = (time.perf_counter() - start) * 1000
+
+    lines = [
+        f"{'Configuration':<28} {'Médiane s':>10} {'vs prod':>8}",
+        f"{'Calcul (production)':<28} {baseline:>10.3f} {0:>+8.1%}",
+        f"{'Calcul mesuré':<28} {metered:>10.3f} {metered / baseline - 1:>+8.1%}",
+        f"record_load: {record_us:.1f} µs par fichier chargé",
+    ]
+
+    report = '\n'.join(lines)
+    print(report)
+    return report
+
+
+if __name__ == '__main__':
+    main()
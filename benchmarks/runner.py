@@ -0,0 +1,323 @@
+"""
+Benchmark Runner
+Garde-fou de performance: chaque étape du pipeline est mesurée sur un jeu
+de données synthétique fixe, puis comparée à une baseline JSON.
+
+- Plusieurs répétitions par étape: médiane et écart interquartile (IQR)
+- Pic mémoire mesuré à part (tracemalloc fausse les temps)
+- Cache des fichiers parsés (PARSE_CACHE) vidé avant chaque exécution:
+  les étapes de chargement mesurent le parsing, pas un accès au cache
+- Une régression n'est signalée que si l'écart dépasse la tolérance ET le
+  bruit mesuré (IQR de la baseline + IQR du run)
+
+Usage:
+    python -m benchmarks.runner record --baseline benchmarks/baseline.json
+    python -m benchmarks.runner compare --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic import DatasetSpec, generate_dataset
+from src.formatters.text_formatter import TextReportFormatter
+from src.repositories.customer_repository import CustomerRepository
+from src.repositories.order_repository import OrderRepository
+from src.repositories.parse_cache import PARSE_CACHE
+from src.repositories.product_repository import ProductRepository
+from src.repositories.promotion_repository import PromotionRepository
+from src.repositories.shipping_zone_repository import ShippingZoneRepository
+from src.services.order_enricher import OrderEnricher
+from src.services.order_processor import OrderProcessor
+
+
+# Incrémenté quand le contenu de la baseline change de sens
+# (2: chargements mesurés sans le cache des fichiers parsés)
+BASELINE_FORMAT_VERSION = 2
+
+WORKLOADS: Dict[str, DatasetSpec] = {
+    'small': DatasetSpec(customers=200, products=50, orders=5_000),
+    'medium': DatasetSpec(customers=2_000, products=200, orders=50_000),
+    'large': DatasetSpec(customers=10_000, products=500, orders=300_000),
+}
+
+
+@dataclass(frozen=True)
+class StageResult:
+    """
+    Mesures d'une étape du pipeline.
+
+    Attributes:
+        items: Éléments traités par exécution (lignes, résumés...)
+        median_s: Durée médiane d'une exécution
+        iqr_s: Écart interquartile des durées
+        peak_bytes: Pic mémoire alloué pendant l'étape
+    """
+    items: int
+    median_s: float
+    iqr_s: float
+    peak_bytes: int
+
+    @property
+    def throughput(self) -> float:
+        """Éléments par seconde (médiane)"""
+        return self.items / self.median_s if self.median_s else float('inf')
+
+
+@dataclass(frozen=True)
+class Regression:
+    """
+    Écart hors tolérance par rapport à la baseline.
+
+    Attributes:
+        stage: Étape concernée
+        metric: 'time' ou 'memory'
+        baseline: Valeur de référence
+        current: Valeur mesurée
+    """
+    stage: str
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        ratio = self.current / self.baseline if self.baseline else float('inf')
+        return f"{self.stage}: {self.metric} x{ratio:.2f} ({self.baseline:.6g} -> {self.current:.6g})"
+
+
+@dataclass
+class _Context:
+    """Données passées d'une étape à la suivante"""
+    data_dir: Path
+    orders: list = field(default_factory=list)
+    customers: dict = field(default_factory=dict)
+    products: dict = field(default_factory=dict)
+    promotions: dict = field(default_factory=dict)
+    zones: dict = field(default_factory=dict)
+    lines: list = field(default_factory=list)
+    summaries: list = field(default_factory=list)
+
+
+def _load_orders(ctx: _Context) -> int:
+    ctx.orders = OrderRepository().load_all(ctx.data_dir / 'orders.csv')
+    return len(ctx.orders)
+
+
+def _load_references(ctx: _Context) -> int:
+    ctx.customers = CustomerRepository().load_all(ctx.data_dir / 'customers.csv')
+    ctx.products = ProductRepository().load_all(ctx.data_dir / 'products.csv')
+    ctx.promotions = PromotionRepository().load_all(ctx.data_dir / 'promotions.csv')
+    ctx.zones = ShippingZoneRepository().load_all(ctx.data_dir / 'shipping_zones.csv')
+    return len(ctx.customers) + len(ctx.products) + len(ctx.promotions) + len(ctx.zones)
+
+
+def _enrich(ctx: _Context) -> int:
+    ctx.lines = OrderEnricher().enrich(ctx.orders, ctx.products, ctx.promotions)
+    return len(ctx.lines)
+
+
+def _process(ctx: _Context) -> int:
+    processor = OrderProcessor()
+    ctx.summaries = list(processor.iter_summaries(
+        ctx.customers, processor.group_by_customer(ctx.lines), ctx.zones
+    ))
+    return len(ctx.lines)
+
+
+def _format(ctx: _Context) -> int:
+    TextReportFormatter().format(ctx.summaries)
+    return len(ctx.summaries)
+
+
+# Étapes dans l'ordre du pipeline (chacune dépend des précédentes)
+STAGES: Dict[str, Callable[[_Context], int]] = {
+    'load_orders': _load_orders,
+    'load_references': _load_references,
+    'enrich': _enrich,
+    'process': _process,
+    'format': _format,
+}
+
+
+def _quartiles(samples: List[float]) -> tuple:
+    """(médiane, IQR) d'une série de durées"""
+    if len(samples) < 2:
+        return samples[0], 0.0
+    q1, median, q3 = statistics.quantiles(samples, n=4, method='inclusive')
+    return median, q3 - q1
+
+
+def _peak_memory(stage: Callable[[_Context], int], ctx: _Context) -> int:
+    """Pic mémoire d'une exécution de l'étape"""
+    PARSE_CACHE.invalidate()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        stage(ctx)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_stages(data_dir: Path, repeats: int = 5) -> Dict[str, StageResult]:
+    """
+    Mesure chaque étape du pipeline sur un jeu de données.
+
+    Args:
+        data_dir: Répertoire des CSV
+        repeats: Exécutions chronométrées par étape
+
+    Returns:
+        Résultats par étape, dans l'ordre du pipeline
+    """
+    ctx = _Context(Path(data_dir))
+    results = {}
+    for name, stage in STAGES.items():
+        items = stage(ctx)  # Échauffement (caches, index) et entrées de l'étape suivante
+        durations = []
+        for _ in range(repeats):
+            PARSE_CACHE.invalidate()
+            gc.collect()
+            start = time.perf_counter()
+            stage(ctx)
+            durations.append(time.perf_counter() - start)
+        median, iqr = _quartiles(durations)
+        results[name] = StageResult(items, median, iqr, _peak_memory(stage, ctx))
+    return results
+
+
+def build_baseline(workload: str, repeats: int, results: Dict[str, StageResult]) -> dict:
+    """Contenu JSON d'une baseline"""
+    return {
+        'format_version': BASELINE_FORMAT_VERSION,
+        'workload': workload,
+        'spec': asdict(WORKLOADS[workload]),
+        'repeats': repeats,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'stages': {name: asdict(result) for name, result in results.items()},
+    }
+
+
+def load_baseline(path: Path) -> dict:
+    """
+    Lit une baseline.
+
+    Raises:
+        ValueError: Si la version de format n'est pas supportée, ou si le
+            jeu de données de la baseline ne correspond plus à WORKLOADS
+    """
+    baseline = json.loads(Path(path).read_text(encoding='utf-8'))
+    if baseline.get('format_version') != BASELINE_FORMAT_VERSION:
+        raise ValueError(
+            f"Baseline au format {baseline.get('format_version')}, "
+            f"attendu {BASELINE_FORMAT_VERSION}: relancer 'record'"
+        )
+    spec = WORKLOADS.get(baseline.get('workload'))
+    if spec is None or asdict(spec) != baseline.get('spec'):
+        raise ValueError(
+            f"Jeu de données '{baseline.get('workload')}' modifié depuis la baseline: "
+            "relancer 'record'"
+        )
+    return baseline
+
+
+def compare(
+    baseline: dict,
+    results: Dict[str, StageResult],
+    time_tolerance: float = 0.25,
+    memory_tolerance: float = 0.10
+) -> List[Regression]:
+    """
+    Compare un run à la baseline.
+
+    Temps: régression si la médiane dépasse celle de la baseline de plus de
+    `time_tolerance` ET de plus que le bruit (somme des IQR). Mémoire:
+    régression si le pic dépasse de plus de `memory_tolerance`.
+
+    Args:
+        baseline: Baseline (voir load_baseline)
+        results: Mesures du run courant
+        time_tolerance: Ralentissement relatif toléré
+        memory_tolerance: Hausse relative du pic mémoire tolérée
+
+    Returns:
+        Régressions détectées (vide si aucune)
+    """
+    regressions = []
+    for name, ref in baseline['stages'].items():
+        current = results.get(name)
+        if current is None:
+            continue
+        # Durées ramenées à un élément: la baseline reste valable si le
+        # nombre d'éléments change (ex: lignes rejetées)
+        ref_unit = ref['median_s'] / ref['items'] if ref['items'] else ref['median_s']
+        cur_unit = current.median_s / current.items if current.items else current.median_s
+        noise = (ref['iqr_s'] + current.iqr_s) / max(current.items, 1)
+        if cur_unit > ref_unit * (1 + time_tolerance) and cur_unit - ref_unit > noise:
+            regressions.append(Regression(name, 'time', ref_unit, cur_unit))
+        if current.peak_bytes > ref['peak_bytes'] * (1 + memory_tolerance):
+            regressions.append(Regression(name, 'memory', ref['peak_bytes'], current.peak_bytes))
+    return regressions
+
+
+def format_results(results: Dict[str, StageResult], baseline: Optional[dict] = None) -> str:
+    """Tableau des mesures (avec l'écart à la baseline si fournie)"""
+    lines = [f"{'Étape':<16} {'Éléments':>9} {'Médiane ms':>11} {'IQR ms':>8} "
+             f"{'Éléments/s':>12} {'Pic Mo':>8} {'vs base':>8}"]
+    for name, r in results.items():
+        delta = ''
+        ref = (baseline or {}).get('stages', {}).get(name)
+        if ref and ref['median_s']:
+            delta = f"{r.median_s / ref['median_s'] - 1:+.1%}"
+        lines.append(
+            f"{name:<16} {r.items:>9} {r.median_s * 1000:>11.2f} {r.iqr_s * 1000:>8.2f} "
+            f"{r.throughput:>12.0f} {r.peak_bytes / 1e6:>8.2f} {delta:>8}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline avec baseline")
+    parser.add_argument('command', choices=('record', 'compare'))
+    parser.add_argument('--baseline', type=Path, default=Path('benchmarks/baseline.json'))
+    parser.add_argument('--workload', choices=sorted(WORKLOADS), default='medium')
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--time-tolerance', type=float, default=0.25)
+    parser.add_argument('--memory-tolerance', type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline) if args.command == 'compare' else None
+    workload = baseline['workload'] if baseline else args.workload
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = generate_dataset(tmp, WORKLOADS[workload])
+        results = run_stages(data_dir, args.repeats)
+
+    print(format_results(results, baseline))
+
+    if baseline is None:
+        args.baseline.write_text(
+            json.dumps(build_baseline(workload, args.repeats, results), indent=2) + '\n',
+            encoding='utf-8'
+        )
+        print(f"Baseline écrite: {args.baseline}")
+        return 0
+
+    regressions = compare(baseline, results, args.time_tolerance, args.memory_tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
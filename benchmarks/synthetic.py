@@ -0,0 +1,121 @@
+"""
+Synthetic Dataset
+Génère des jeux de données CSV reproductibles au format de legacy/data.
+
+Les valeurs répétitives (clients, produits, dates, heures, codes promo)
+suivent la distribution d'un export réel: peu de valeurs distinctes,
+beaucoup de répétitions.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+
+LEVELS = ('BASIC', 'BASIC', 'BASIC', 'PREMIUM', 'VIP')
+ZONES = ('ZONE1', 'ZONE2', 'ZONE3', 'ZONE4')
+CURRENCIES = ('EUR', 'EUR', 'EUR', 'USD', 'GBP')
+PROMOTIONS = (
+    'code,type,value,active\n'
+    'PREMIUM10,PERCENTAGE,10,true\n'
+    'WEEKEND5,PERCENTAGE,5,true\n'
+    'BULK15,PERCENTAGE,15,true\n'
+    'FIXED20,FIXED,20,true\n'
+    'SUMMER25,PERCENTAGE,25,false\n'
+)
+PROMO_CODES = ('PREMIUM10', 'WEEKEND5', 'BULK15', 'FIXED20', 'SUMMER25', 'UNKNOWN')
+SHIPPING_ZONES = (
+    'zone,base,per_kg\n'
+    'ZONE1,5.00,0.50\n'
+    'ZONE2,7.50,0.60\n'
+    'ZONE3,10.00,0.80\n'
+    'ZONE4,12.50,1.00\n'
+)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """
+    Paramètres d'un jeu de données synthétique.
+
+    Attributes:
+        customers: Nombre de clients
+        products: Nombre de produits
+        orders: Nombre de lignes de commande
+        days: Nombre de jours couverts par les commandes
+        promo_rate: Part des lignes avec un code promo
+        sorted_by_customer: Lignes regroupées et triées par client
+        seed: Graine du générateur
+    """
+    customers: int = 1000
+    products: int = 200
+    orders: int = 100_000
+    days: int = 90
+    promo_rate: float = 0.1
+    sorted_by_customer: bool = False
+    seed: int = 42
+
+
+def generate_dataset(target: Path | str, spec: DatasetSpec = DatasetSpec()) -> Path:
+    """
+    Écrit customers/products/orders/promotions/shipping_zones.csv dans `target`.
+
+    Args:
+        target: Répertoire de sortie (créé si besoin)
+        spec: Paramètres du jeu de données
+
+    Returns:
+        Le répertoire de sortie
+    """
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(spec.seed)
+
+    customer_ids = [f'C{i:06d}' for i in range(1, spec.customers + 1)]
+    product_ids = [f'P{i:05d}' for i in range(1, spec.products + 1)]
+    prices = {pid: round(rng.uniform(1.0, 1500.0), 2) for pid in product_ids}
+
+    with open(target / 'customers.csv', 'w', encoding='utf-8', newline='') as f:
+        f.write('id,name,level,shipping_zone,currency\n')
+        for cid in customer_ids:
+            f.write(f'{cid},Customer {cid},{rng.choice(LEVELS)},'
+                    f'{rng.choice(ZONES)},{rng.choice(CURRENCIES)}\n')
+
+    with open(target / 'products.csv', 'w', encoding='utf-8', newline='') as f:
+        f.write('id,name,category,price,weight,taxable\n')
+        for pid in product_ids:
+            taxable = 'false' if rng.random() < 0.1 else 'true'
+            f.write(f'{pid},Product {pid},Category {rng.randint(1, 12)},'
+                    f'{prices[pid]:.2f},{rng.uniform(0.1, 25.0):.1f},{taxable}\n')
+
+    (target / 'promotions.csv').write_text(PROMOTIONS, encoding='utf-8')
+    (target / 'shipping_zones.csv').write_text(SHIPPING_ZONES, encoding='utf-8')
+
+    start = date(2025, 1, 1)
+    dates = [(start + timedelta(days=d)).isoformat() for d in range(spec.days)]
+    times = [f'{h:02d}:{m:02d}' for h in range(7, 22) for m in (0, 15, 30, 45)]
+
+    lines = []
+    for i in range(1, spec.orders + 1):
+        pid = rng.choice(product_ids)
+        promo = rng.choice(PROMO_CODES) if rng.random() < spec.promo_rate else ''
+        lines.append((
+            rng.choice(customer_ids),
+            f'O{i:09d}',
+            pid,
+            rng.randint(1, 12),
+            prices[pid],
+            rng.choice(dates),
+            promo,
+            rng.choice(times)
+        ))
+    if spec.sorted_by_customer:
+        lines.sort(key=lambda line: line[0])
+
+    with open(target / 'orders.csv', 'w', encoding='utf-8', newline='') as f:
+        f.write('id,customer_id,product_id,qty,unit_price,date,promo_code,time\n')
+        for cid, oid, pid, qty, price, day, promo, hour in lines:
+            f.write(f'{oid},{cid},{pid},{qty},{price:.2f},{day},{promo},{hour}\n')
+
+    return target
@@ -0,0 +1,78 @@
+"""
+Trace Overhead
+Vérifie que le mode explain ne coûte rien quand il est désactivé: temps
+de l'étape de calcul avec OrderProcessor (chemin de production), avec
+TracingOrderProcessor sans client sélectionné, et avec un client tracé.
+
+Usage:
+    python -m benchmarks.trace_overhead [--orders 200000] [--repeats 5]
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from benchmarks.synthetic import DatasetSpec, generate_dataset
+from src.repositories.customer_repository import CustomerRepository
+from src.repositories.order_repository import OrderRepository
+from src.repositories.product_repository import ProductRepository
+from src.repositories.promotion_repository import PromotionRepository
+from src.repositories.shipping_zone_repository import ShippingZoneRepository
+from src.services.calculation_trace import TracingOrderProcessor
+from src.services.order_enricher import OrderEnricher
+from src.services.order_processor import OrderProcessor
+
+
+def _time_processing(processor: OrderProcessor, customers, lines_by_customer, zones, repeats: int) -> float:
+    """Durée médiane du calcul de tous les résumés"""
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _summary in processor.iter_summaries(customers, lines_by_customer, zones):
+            pass
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main(argv: Optional[List[str]] = None) -> str:
+    parser = argparse.ArgumentParser(description="Surcoût du mode explain")
+    parser.add_argument('--orders', type=int, default=200_000)
+    parser.add_argument('--customers', type=int, default=5_000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(generate_dataset(tmp, DatasetSpec(customers=args.customers, orders=args.orders)))
+        customers = CustomerRepository().load_all(data_dir / 'customers.csv')
+        orders = OrderRepository().load_all(data_dir / 'orders.csv')
+        products = ProductRepository().load_all(data_dir / 'products.csv')
+        promotions = PromotionRepository().load_all(data_dir / 'promotions.csv')
+        zones = ShippingZoneRepository().load_all(data_dir / 'shipping_zones.csv')
+
+    lines_by_customer = OrderProcessor.group_by_customer(
+        OrderEnricher().enrich(orders, products, promotions)
+    )
+    traced_id = min(lines_by_customer)
+    runs = [
+        ('OrderProcessor (production)', OrderProcessor()),
+        ('Tracing, aucun client', TracingOrderProcessor([])),
+        (f'Tracing, 1 client ({traced_id})', TracingOrderProcessor([traced_id])),
+    ]
+
+    baseline = None
+    lines = [f"{'Configuration':<34} {'Médiane s':>10} {'vs prod':>8}"]
+    for label, processor in runs:
+        median = _time_processing(processor, customers, lines_by_customer, zones, args.repeats)
+        baseline = baseline or median
+        lines.append(f"{label:<34} {median:>10.3f} {median / baseline - 1:>+8.1%}")
+
+    report = '\n'.join(lines)
+    print(report)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+"""
+Report Manifest
+Manifeste d'un rapport texte: empreinte de chaque section client, pour
+comparer deux rapports sans les relire.
+
+- Par client: empreinte du OrderSummary (valeurs exactes, avant arrondi
+  d'affichage), empreinte de la section rendue, position de la section dans
+  le rapport (octets).
+- Les clients sont répartis en seaux par empreinte de leur ID; chaque seau a
+  une empreinte, et l'empreinte du rapport est celle de la liste des seaux
+  (arbre de Merkle à deux niveaux). Les positions ne font pas partie des
+  empreintes: une section qui change de longueur ne modifie pas les seaux
+  des sections suivantes.
+
+Format du fichier: une ligne d'en-tête JSON (empreinte du rapport, pieds
+de rapport, empreinte et position de chaque seau dans le manifeste), puis
+une ligne JSON par seau. La comparaison de deux manifestes lit l'en-tête et
+les seuls seaux qui diffèrent: son coût suit le nombre de changements, pas
+la taille du rapport.
+"""
+
+import contextlib
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..models.order_summary import OrderSummary
+from ..services.report_queries import GrandTotals
+from .text_formatter import TextReportFormatter
+
+
+# Manifeste d'un rapport: <rapport><MANIFEST_SUFFIX>
+MANIFEST_SUFFIX = '.manifest'
+
+_FORMAT_VERSION = 1
+
+# Nombre moyen de clients par seau
+_BUCKET_TARGET_SIZE = 64
+
+# (id client, empreinte du résumé, empreinte de la section, position, longueur)
+Entry = Tuple[str, str, str, int, int]
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def summary_hash(summary: OrderSummary) -> str:
+    """Empreinte stable d'un résumé (repr du dataclass: flottants exacts, client compris)"""
+    return _digest(repr(summary).encode('utf-8'))
+
+
+def bucket_of(customer_id: str, bucket_count: int) -> int:
+    """Seau d'un client (répartition uniforme, stable d'un rapport à l'autre)"""
+    key = hashlib.blake2b(customer_id.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(key, 'big') % bucket_count
+
+
+class ManifestTextFormatter(TextReportFormatter):
+    """
+    TextReportFormatter qui relève l'empreinte et la position de chaque section.
+
+    Le texte produit est identique; le manifeste est disponible une fois le
+    rapport entièrement produit (voir write_manifest).
+    """
+
+    def __init__(self):
+        self.entries: List[Entry] = []
+        self.totals = GrandTotals()
+        self._offset = 0
+        self._recording = False
+
+    @property
+    def footer(self) -> List[str]:
+        """Lignes de totaux du rapport (même ordre d'addition que le formateur)"""
+        return self.totals.format().split('\n')
+
+    def iter_lines(self, summaries: Iterable[OrderSummary]) -> Iterator[str]:
+        self.entries, self.totals, self._offset = [], GrandTotals(), 0
+        self._recording = True
+        try:
+            yield from super().iter_lines(summaries)
+        finally:
+            self._recording = False
+
+    def _format_customer(self, summary: OrderSummary) -> List[str]:
+        lines = super()._format_customer(summary)
+        if not self._recording:
+            return lines  # format_section: hors rapport
+        section = '\n'.join(lines).encode('utf-8')
+        self.entries.append((
+            summary.customer.id, summary_hash(summary), _digest(section),
+            self._offset, len(section)
+        ))
+        self._offset += len(section) + 2  # Fin de la dernière ligne + ligne vide
+        self.totals.add(summary)
+        return lines
+
+    def write_manifest(self, path: Path | str) -> None:
+        """
+        Écrit le manifeste du dernier rapport produit (fichier temporaire puis rename).
+
+        Args:
+            path: Fichier du manifeste (par convention <rapport>.manifest)
+        """
+        bucket_count = 1
+        while bucket_count * _BUCKET_TARGET_SIZE < len(self.entries):
+            bucket_count *= 2
+        buckets: List[List[Entry]] = [[] for _ in range(bucket_count)]
+        for entry in self.entries:
+            buckets[bucket_of(entry[0], bucket_count)].append(entry)
+
+        lines, index = [], []
+        for entries in buckets:
+            entries.sort()
+            line = (json.dumps(entries, separators=(',', ':')) + '\n').encode('utf-8')
+            index.append([_bucket_hash(entries), len(line)])
+            lines.append(line)
+        header = {
+            'format_version': _FORMAT_VERSION,
+            'root': _digest(''.join(h for h, _ in index).encode('ascii')),
+            'customers': len(self.entries),
+            'footer': self.footer,
+            'buckets': index,
+        }
+
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write((json.dumps(header, separators=(',', ':')) + '\n').encode('utf-8'))
+            f.writelines(lines)
+        tmp_path.replace(path)
+
+
+def _bucket_hash(entries: List[Entry]) -> str:
+    """Empreinte d'un seau: IDs et empreintes, sans les positions"""
+    text = ''.join(f'{cid}\t{summary}\t{section}\n' for cid, summary, section, _, _ in entries)
+    return _digest(text.encode('utf-8'))
+
+
+class ReportManifest:
+    """
+    Manifeste ouvert en lecture: en-tête en mémoire, seaux lus à la demande.
+
+    Attributes:
+        path: Fichier du manifeste
+        root: Empreinte du rapport
+        footer: Lignes de totaux du rapport
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Raises:
+            FileNotFoundError: Si le manifeste n'existe pas
+            ValueError: Si le format n'est pas reconnu
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            first = f.readline()
+        header = json.loads(first)
+        if header.get('format_version') != _FORMAT_VERSION:
+            raise ValueError(f"Format de manifeste non reconnu: {self.path}")
+        self.root: str = header['root']
+        self.footer: List[str] = header['footer']
+        self.customers: int = header['customers']
+        self.bucket_hashes = [h for h, _ in header['buckets']]
+        self._offsets = []
+        offset = len(first)
+        for _, length in header['buckets']:
+            self._offsets.append((offset, length))
+            offset += length
+
+    def read_buckets(self, indexes: List[int]) -> Dict[str, Entry]:
+        """Entrées des seaux demandés, par ID client"""
+        entries: Dict[str, Entry] = {}
+        with open(self.path, 'rb') as f:
+            for i in indexes:
+                offset, length = self._offsets[i]
+                f.seek(offset)
+                for entry in json.loads(f.read(length)):
+                    entries[entry[0]] = tuple(entry)
+        return entries
+
+
+@dataclass(frozen=True)
+class ReportDiff:
+    """
+    Différences entre deux rapports.
+
+    Attributes:
+        changed: Clients présents des deux côtés dont le résumé ou la section diffère
+        added: Clients du nouveau rapport seulement
+        removed: Clients de l'ancien rapport seulement
+        old_entries: Entrées de l'ancien manifeste (clients modifiés ou supprimés)
+        new_entries: Entrées du nouveau manifeste (clients modifiés ou ajoutés)
+        old_footer: Totaux de l'ancien rapport
+        new_footer: Totaux du nouveau rapport
+        buckets_read: Seaux lus dans chaque manifeste
+    """
+    changed: Tuple[str, ...]
+    added: Tuple[str, ...]
+    removed: Tuple[str, ...]
+    old_entries: Dict[str, Entry]
+    new_entries: Dict[str, Entry]
+    old_footer: Tuple[str, ...]
+    new_footer: Tuple[str, ...]
+    buckets_read: int
+
+    @classmethod
+    def between(cls, old: ReportManifest, new: ReportManifest) -> 'ReportDiff':
+        """
+        Compare deux manifestes en ne lisant que les seaux qui diffèrent.
+
+        Si les nombres de seaux diffèrent (taille du rapport très différente),
+        tous les seaux sont lus.
+        """
+        if old.root == new.root:
+            indexes_old = indexes_new = []
+        elif len(old.bucket_hashes) == len(new.bucket_hashes):
+            indexes_old = indexes_new = [
+                i for i, (a, b) in enumerate(zip(old.bucket_hashes, new.bucket_hashes)) if a != b
+            ]
+        else:
+            indexes_old = list(range(len(old.bucket_hashes)))
+            indexes_new = list(range(len(new.bucket_hashes)))
+        old_entries = old.read_buckets(indexes_old)
+        new_entries = new.read_buckets(indexes_new)
+
+        changed = sorted(
+            cid for cid in old_entries.keys() & new_entries.keys()
+            if old_entries[cid][1:3] != new_entries[cid][1:3]
+        )
+        removed = sorted(old_entries.keys() - new_entries.keys())
+        added = sorted(new_entries.keys() - old_entries.keys())
+        keep_old = set(changed) | set(removed)
+        keep_new = set(changed) | set(added)
+        return cls(
+            tuple(changed), tuple(added), tuple(removed),
+            {cid: e for cid, e in old_entries.items() if cid in keep_old},
+            {cid: e for cid, e in new_entries.items() if cid in keep_new},
+            tuple(old.footer), tuple(new.footer),
+            max(len(indexes_old), len(indexes_new))
+        )
+
+    def is_empty(self) -> bool:
+        return not (self.changed or self.added or self.removed) and self.old_footer == self.new_footer
+
+    def format(self, old_report: Optional[Path] = None, new_report: Optional[Path] = None) -> str:
+        """
+        Sections modifiées, ajoutées et supprimées (lignes préfixées par - / +).
+
+        Args:
+            old_report: Ancien rapport (sections lues à leur position); None: IDs seuls
+            new_report: Nouveau rapport
+        """
+        lines = []
+        with _open_optional(old_report) as old_f, _open_optional(new_report) as new_f:
+            for status, ids in (
+                ('changed', self.changed), ('added', self.added), ('removed', self.removed)
+            ):
+                for cid in ids:
+                    lines.append(f'{status}: {cid}')
+                    if cid in self.old_entries:
+                        lines.extend(_section_lines(old_f, self.old_entries[cid], '- '))
+                    if cid in self.new_entries:
+                        lines.extend(_section_lines(new_f, self.new_entries[cid], '+ '))
+        if self.old_footer != self.new_footer:
+            lines.append('totals:')
+            lines.extend(f'- {line}' for line in self.old_footer)
+            lines.extend(f'+ {line}' for line in self.new_footer)
+        return '\n'.join(lines)
+
+
+def _open_optional(path: Optional[Path]):
+    return open(path, 'rb') if path is not None else contextlib.nullcontext(None)
+
+
+def _section_lines(f: Optional[BinaryIO], entry: Entry, prefix: str) -> List[str]:
+    """Lignes d'une section lue dans le rapport (rien si le rapport n'est pas fourni)"""
+    if f is None:
+        return []
+    _, _, _, offset, length = entry
+    f.seek(offset)
+    return [prefix + line for line in f.read(length).decode('utf-8').split('\n')]
@@ -4,7 +4,7 @@ Génère le rapport texte dans le format legacy.
 """
 
 import math
-from typing import List
+from typing import Iterable, Iterator, List
 from ..models.order_summary import OrderSummary
 
 
@@ -15,32 +15,56 @@ class TextReportFormatter:
     Fonction pure: pas de side effects.
     """
     
-    def format(self, summaries: List[OrderSummary]) -> str:
+    def format(self, summaries: Iterable[OrderSummary]) -> str:
         """
         Génère le rapport texte complet pour tous les clients.
         
         Args:
-            summaries: Liste des résumés de commandes
+            summaries: Résumés de commandes (liste ou générateur)
             
         Returns:
             Rapport texte formaté (compatible legacy)
         """
-        lines = []
+        return '\n'.join(self.iter_lines(summaries))
+    
+    def iter_lines(self, summaries: Iterable[OrderSummary]) -> Iterator[str]:
+        """
+        Produit le rapport ligne par ligne, au fil des résumés.
+        
+        Permet d'écrire le rapport sans le construire en mémoire
+        ('\n'.join des lignes == format()).
+        
+        Args:
+            summaries: Résumés de commandes (liste ou générateur)
+            
+        Yields:
+            Lignes du rapport, sans fin de ligne
+        """
         grand_total = 0.0
         total_tax_collected = 0.0
         
         for summary in summaries:
-            lines.extend(self._format_customer(summary))
-            lines.append('')  # Ligne vide entre clients
+            yield from self._format_customer(summary)
+            yield ''  # Ligne vide entre clients
             
             grand_total += summary.total
             total_tax_collected += summary.tax
         
         # Totaux globaux
-        lines.append(f'Grand Total: {grand_total:.2f} EUR')
-        lines.append(f'Total Tax Collected: {total_tax_collected:.2f} EUR')
+        yield f'Grand Total: {grand_total:.2f} EUR'
+        yield f'Total Tax Collected: {total_tax_collected:.2f} EUR'
+    
+    def format_section(self, summary: OrderSummary) -> str:
+        """
+        Formate la section d'un client seule (relevé individuel).
         
-        return '\n'.join(lines)
+        Args:
+            summary: Résumé de commande du client
+            
+        Returns:
+            Section texte, identique à celle du rapport complet
+        """
+        return '\n'.join(self._format_customer(summary))
     
     def _format_customer(self, summary: OrderSummary) -> List[str]:
         """
@@ -10,7 +10,12 @@ Architecture propre basée sur la séparation des responsabilités:
 Remplace la god function de 280+ lignes du legacy.
 """
 
+import argparse
+import random
+import time
+from datetime import datetime
 from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import sys
 
 # Ajouter le répertoire parent au path pour les imports
@@ -22,15 +27,547 @@ from src.repositories.product_repository import ProductRepository
 from src.repositories.order_repository import OrderRepository
 from src.repositories.promotion_repository import PromotionRepository
 from src.repositories.shipping_zone_repository import ShippingZoneRepository
+from src.repositories.columnar_store import ColumnarStore
+from src.repositories.csv_repository import ColumnFilter
+from src.repositories.order_date_index import DateRangeFilter
+
+# Models
+from src.models.order_summary import OrderSummary
 
 # Services (Business logic)
+from src.services.order_enricher import OrderEnricher
 from src.services.order_processor import OrderProcessor
+from src.services.calculation_trace import TracingOrderProcessor
+from src.services.run_metrics import MeteredOrderProcessor, RunMetrics
+from src.services.report_queries import RANKABLE_FIELDS, GrandTotals, format_top, top_n
+from src.services.sampling import DEFAULT_PILOT_SIZE, STRATIFICATIONS, SampledTotals, SamplingPlan
 
 # Formatters (Presentation)
 from src.formatters.text_formatter import TextReportFormatter
+from src.formatters.report_manifest import (
+    MANIFEST_SUFFIX, ManifestTextFormatter, ReportDiff, ReportManifest
+)
+
+# Pipeline (modes d'exécution)
+from src.pipeline.statements import StatementWriter
+from src.pipeline.batch import BatchRunner, Dataset
+from src.pipeline.staged import StagedPipeline
+from src.pipeline.rollups import DailyRollupStore
+from src.pipeline.loyalty_ledger import LedgerLoyaltyCalculator, LoyaltyLedger
+from src.pipeline.parallel_aggregate import ParallelAggregator
+from src.pipeline.watch import ReportWatcher
+
+
+def _iso_date(value: str) -> str:
+    """Valide une date YYYY-MM-DD passée en argument"""
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Date invalide (attendu YYYY-MM-DD): {value}")
+    return value
+
+
+def _confidence_level(value: str) -> float:
+    """Valide un niveau de confiance strictement compris entre 0 et 1"""
+    try:
+        level = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Niveau de confiance invalide: {value}")
+    if not 0 < level < 1:
+        raise argparse.ArgumentTypeError(
+            f"Niveau de confiance hors de ]0, 1[ (ex: 0.95): {value}"
+        )
+    return level
+
+
+def _positive_int(value: str) -> int:
+    """Valide un entier strictement positif"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Entier invalide: {value}")
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"Entier strictement positif attendu: {value}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit le parser des arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Génère le rapport de commandes")
+    parser.add_argument(
+        '--data-dir', type=Path, default=None,
+        help="Répertoire des fichiers CSV (défaut: legacy/data)"
+    )
+    parser.add_argument(
+        '--from', dest='start_date', type=_iso_date, default=None,
+        help="Date de début incluse (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        '--to', dest='end_date', type=_iso_date, default=None,
+        help="Date de fin incluse (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help="Processus de parsing pour orders.csv (défaut: 1)"
+    )
+    parser.add_argument(
+        '--rejects-dir', type=Path, default=None,
+        help="Répertoire où écrire les lignes rejetées (<fichier>.rejects.csv)"
+    )
+    parser.add_argument(
+        '--customers', default=None, metavar='IDS',
+        help="Limite le rapport à ces clients (IDs séparés par des virgules)"
+    )
+    parser.add_argument(
+        '--customers-file', type=Path, default=None, metavar='FICHIER',
+        help="Limite le rapport aux clients listés (un ID par ligne)"
+    )
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument(
+        '--totals', action='store_true',
+        help="Affiche uniquement Grand Total et Total Tax Collected"
+    )
+    query.add_argument(
+        '--top', type=_positive_int, default=None, metavar='N',
+        help="Affiche les N premiers clients selon --by"
+    )
+    query.add_argument(
+        '--split-dir', type=Path, default=None, metavar='DIR',
+        help="Écrit un relevé par client dans DIR (+ manifest.json) au lieu du rapport"
+    )
+    parser.add_argument(
+        '--by', choices=RANKABLE_FIELDS, default='total',
+        help="Champ de classement pour --top (défaut: total)"
+    )
+    parser.add_argument(
+        '--sorted-input', nargs='?', const='strict', choices=('strict', 'auto'), default=None,
+        help="orders.csv trié par client: traitement en flux, mémoire bornée au plus gros "
+             "client (strict: erreur si désordre; auto: vérifie d'abord le tri)"
+    )
+    parser.add_argument(
+        '--exact-sums', action='store_true',
+        help="Sommes exactes (math.fsum) au lieu des sommes séquentielles du legacy: "
+             "indépendantes de l'ordre des lignes, comme --rollups et --aggregate-jobs"
+    )
+    parser.add_argument(
+        '--explain', default=None, metavar='IDS',
+        help="Trace JSON de chaque étape de calcul de ces clients (IDs séparés par des virgules)"
+    )
+    parser.add_argument(
+        '--trace-file', type=Path, default=None, metavar='FICHIER',
+        help="Fichier de la trace --explain (défaut: sortie d'erreur)"
+    )
+    parser.add_argument(
+        '--metrics-file', type=Path, default=None, metavar='FICHIER',
+        help="Écrit les métriques d'exécution au format Prometheus (textfile collector); "
+             "réécrit à chaque rapport en mode --watch"
+    )
+    parser.add_argument(
+        '--buckets', type=int, default=None, metavar='N',
+        help="Avec --split-dir: regroupe les relevés dans N fichiers"
+    )
+    parser.add_argument(
+        '--writers', type=int, default=4,
+        help="Avec --split-dir: threads d'écriture (défaut: 4)"
+    )
+    parser.add_argument(
+        '--columnar', nargs='?', const='', default=None, type=str, metavar='FICHIER',
+        help="Lit les données depuis un fichier colonnaire (converti si absent ou périmé; "
+             "défaut: <data-dir>/orders.colbin)"
+    )
+    parser.add_argument(
+        '--rollups', type=Path, default=None, metavar='FICHIER',
+        help="Calcule le rapport depuis des agrégats par client et par jour (mis à jour "
+             "incrémentalement dans FICHIER); seules les lignes datées sont prises en compte"
+    )
+    parser.add_argument(
+        '--loyalty-ledger', type=Path, default=None, metavar='FICHIER',
+        help="Points de fidélité lus dans un registre persistant (tout l'historique); "
+             "les commandes jamais comptées y sont ajoutées en fin d'exécution"
+    )
+    parser.add_argument(
+        '--compact-ledger', action='store_true',
+        help="Avec --loyalty-ledger: réécrit le registre en un seul enregistrement"
+    )
+    parser.add_argument(
+        '--sample', type=int, default=None, metavar='N',
+        help="Estime Grand Total et Total Tax Collected sur N clients tirés au hasard "
+             "(avec intervalle de confiance)"
+    )
+    parser.add_argument(
+        '--target-error', type=float, default=None, metavar='E',
+        help="Estimation: complète l'échantillon jusqu'à une erreur relative E "
+             f"(ex: 0.02; échantillon initial --sample, défaut: {DEFAULT_PILOT_SIZE})"
+    )
+    parser.add_argument(
+        '--stratify', choices=tuple(STRATIFICATIONS), default='none',
+        help="Estimation: tirage stratifié par niveau client ou zone (défaut: none)"
+    )
+    parser.add_argument(
+        '--confidence', type=_confidence_level, default=0.95,
+        help="Estimation: niveau de confiance des intervalles (défaut: 0.95)"
+    )
+    parser.add_argument(
+        '--seed', type=int, default=None,
+        help="Estimation: graine du tirage (reproductible)"
+    )
+    parser.add_argument(
+        '--pipeline', action='store_true',
+        help="Lecture, calcul et écriture en étapes asyncio concurrentes (files bornées); "
+             "rapport écrit au fil de l'eau, identique au rapport complet"
+    )
+    parser.add_argument(
+        '--aggregate-jobs', type=int, default=None, metavar='N',
+        help="Agrégats de lignes calculés par N processus sur des plages de orders.csv, "
+             "fusionnés par client (un gros client est réparti entre les processus)"
+    )
+    parser.add_argument(
+        '--manifest', type=Path, default=None, metavar='FICHIER',
+        help="Écrit le manifeste du rapport (empreinte de chaque section client), "
+             f"par convention <rapport>{MANIFEST_SUFFIX}"
+    )
+    parser.add_argument(
+        '--diff', nargs=2, type=Path, default=None, metavar=('ANCIEN', 'NOUVEAU'),
+        help="Sections modifiées, ajoutées ou supprimées entre deux rapports "
+             f"(via leurs {MANIFEST_SUFFIX})"
+    )
+    parser.add_argument(
+        '--batch', nargs='+', type=Path, default=None, metavar='CHEMIN',
+        help="Un rapport par répertoire de données (ou fichier de commandes) dans --out-dir; "
+             "produits, promotions et zones de --data-dir chargés une seule fois"
+    )
+    parser.add_argument(
+        '--out-dir', type=Path, default=None, metavar='DIR',
+        help="Avec --batch: répertoire des rapports (<nom>.txt)"
+    )
+    parser.add_argument(
+        '--jobs', type=int, default=1,
+        help="Avec --batch: jeux de données traités en parallèle (défaut: 1)"
+    )
+    parser.add_argument(
+        '--watch', action='store_true',
+        help="Surveille le répertoire de données et réémet le rapport à chaque changement"
+    )
+    parser.add_argument(
+        '--interval', type=float, default=1.0, metavar='SECONDES',
+        help="Intervalle de vérification en mode --watch (défaut: 1.0)"
+    )
+    return parser
+
+
+# Option de mode -> (options incompatibles ou sans effet dans ce mode, raison)
+_SAMPLING_CONFLICTS = (
+    ('--top', '--split-dir', '--explain', '--watch', '--rollups', '--columnar', '--loyalty-ledger'),
+    "n'estime que les totaux globaux (lecture CSV)"
+)
+_MODE_CONFLICTS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    '--rollups': (('--explain',), "ne relit pas les lignes"),
+    '--loyalty-ledger': (('--rollups', '--watch'), "compte les commandes lues"),
+    '--sample': _SAMPLING_CONFLICTS,
+    '--target-error': _SAMPLING_CONFLICTS,
+    '--pipeline': (
+        ('--totals', '--top', '--split-dir', '--sample', '--target-error', '--batch', '--watch',
+         '--explain', '--rollups', '--columnar', '--loyalty-ledger', '--manifest',
+         '--metrics-file'),
+        "produit le rapport texte complet depuis les CSV"
+    ),
+    '--aggregate-jobs': (
+        ('--pipeline', '--sample', '--target-error', '--batch', '--watch', '--explain',
+         '--rollups', '--columnar', '--sorted-input', '--loyalty-ledger', '--metrics-file'),
+        "calcule le rapport depuis orders.csv par agrégats"
+    ),
+    '--manifest': (
+        ('--totals', '--top', '--split-dir', '--sample', '--target-error', '--batch', '--watch'),
+        "décrit le rapport complet"
+    ),
+    '--batch': (
+        ('--customers', '--customers-file', '--totals', '--top', '--split-dir', '--columnar',
+         '--workers', '--rejects-dir', '--sorted-input', '--exact-sums', '--explain',
+         '--rollups', '--loyalty-ledger', '--metrics-file', '--sample', '--target-error',
+         '--watch'),
+        "écrit le rapport complet de chaque jeu (seuls --from/--to s'appliquent)"
+    ),
+    '--watch': (
+        ('--from', '--to', '--customers', '--customers-file', '--totals', '--top', '--split-dir',
+         '--columnar', '--workers', '--rejects-dir', '--sorted-input', '--explain', '--rollups'),
+        "réémet le rapport complet de tout le répertoire"
+    ),
+}
+
+# Option -> options sans lesquelles elle n'aurait aucun effet
+_OPTION_REQUIRES: Dict[str, Tuple[str, ...]] = {
+    '--compact-ledger': ('--loyalty-ledger',),
+}
+
+
+def _given_options(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Set[str]:
+    """Options passées avec une valeur autre que leur défaut"""
+    return {
+        action.option_strings[-1] for action in parser._actions
+        if action.option_strings and getattr(args, action.dest, None) != action.default
+    }
+
+
+def _check_modes(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Erreur d'usage si une option est incompatible ou sans effet dans le mode demandé"""
+    given = _given_options(parser, args)
+    for mode, (conflicts, reason) in _MODE_CONFLICTS.items():
+        rejected = [option for option in conflicts if option in given]
+        if mode in given and rejected:
+            parser.error(f"{mode} {reason}: incompatible avec {', '.join(rejected)}")
+    for option, required in _OPTION_REQUIRES.items():
+        missing = [name for name in required if name not in given]
+        if option in given and missing:
+            parser.error(f"{option} n'a d'effet qu'avec {', '.join(missing)}")
+
+
+def _rejects(args: argparse.Namespace, file_name: str) -> Optional[Path]:
+    """Fichier de rejets d'un CSV (None si --rejects-dir absent)"""
+    if args.rejects_dir is None:
+        return None
+    args.rejects_dir.mkdir(parents=True, exist_ok=True)
+    return args.rejects_dir / f"{Path(file_name).stem}.rejects.csv"
+
+
+def _requested_customers(args: argparse.Namespace) -> Optional[Set[str]]:
+    """IDs clients demandés (--customers / --customers-file), None = tous"""
+    if args.customers is None and args.customers_file is None:
+        return None
+    ids: Set[str] = set()
+    if args.customers:
+        ids.update(c.strip() for c in args.customers.split(',') if c.strip())
+    if args.customers_file:
+        text = args.customers_file.read_text(encoding='utf-8')
+        ids.update(line.strip() for line in text.splitlines() if line.strip())
+    return ids
+
+
+def _sorted_stream(args: argparse.Namespace, base_path: Path) -> bool:
+    """Traitement en flux trié demandé (--sorted-input) ou détecté (auto)"""
+    if args.sorted_input == 'auto':
+        if args.columnar is not None:
+            return False  # Ordre du fichier colonnaire = ordre du CSV d'origine, non vérifié
+        return OrderRepository.is_sorted_by_customer(base_path / 'orders.csv')
+    return args.sorted_input == 'strict'
+
+
+def _timed_load(metrics: Optional[RunMetrics], name: str, repo, load: Callable, *args, **kwargs):
+    """Appelle load(*args, **kwargs) et enregistre le chargement dans metrics"""
+    if metrics is None:
+        return load(*args, **kwargs)
+    start = time.perf_counter()
+    result = load(*args, **kwargs)
+    metrics.record_load(name, repo.last_stats, time.perf_counter() - start)
+    return result
+
+
+def _load_csv(
+    args: argparse.Namespace,
+    base_path: Path,
+    customer_ids: Optional[Set[str]],
+    stream: bool = False,
+    metrics: Optional[RunMetrics] = None
+) -> Tuple[Dict, Iterable, Dict, Dict, Dict]:
+    """
+    Chargement depuis les CSV: (customers, orders, products, promotions, zones)
+
+    Avec stream, les commandes sont lues au fil de l'eau (itérateur) et
+    les références sont chargées en entier. Avec metrics, chaque chargement
+    complet est mesuré (lignes, rejets, débit).
+    """
+    # Avec --customers, semi-jointure: seules les lignes référencées sont mappées
+    customer_repo = CustomerRepository(_rejects(args, 'customers.csv'))
+    customers = _timed_load(
+        metrics, 'customers', customer_repo, customer_repo.load_all,
+        base_path / 'customers.csv', customer_ids
+    )
+    subset = customer_ids is not None
+    order_repo = OrderRepository(_rejects(args, 'orders.csv'))
+    if stream:
+        orders = order_repo.iter_all(
+            base_path / 'orders.csv', args.start_date, args.end_date,
+            customer_ids=customers.keys() if subset else None
+        )
+        subset = False  # Commandes non matérialisées: références complètes
+    else:
+        orders = _timed_load(
+            metrics, 'orders', order_repo, order_repo.load_all,
+            base_path / 'orders.csv', args.start_date, args.end_date,
+            workers=args.workers,
+            customer_ids=customers.keys() if subset else None
+        )
+    product_repo = ProductRepository(_rejects(args, 'products.csv'))
+    products = _timed_load(
+        metrics, 'products', product_repo, product_repo.load_all,
+        base_path / 'products.csv',
+        {o.product_id for o in orders} if subset else None
+    )
+    promotion_repo = PromotionRepository(_rejects(args, 'promotions.csv'))
+    promotions = _timed_load(
+        metrics, 'promotions', promotion_repo, promotion_repo.load_all,
+        base_path / 'promotions.csv',
+        {o.promo_code for o in orders if o.promo_code} if subset else None
+    )
+    zone_repo = ShippingZoneRepository(_rejects(args, 'shipping_zones.csv'))
+    shipping_zones = _timed_load(
+        metrics, 'shipping_zones', zone_repo, zone_repo.load_all,
+        base_path / 'shipping_zones.csv',
+        {c.shipping_zone for c in customers.values()} if subset else None
+    )
+    return customers, orders, products, promotions, shipping_zones
+
+
+def _load_columnar(
+    args: argparse.Namespace,
+    base_path: Path,
+    customer_ids: Optional[Set[str]]
+) -> Tuple[Dict, Iterable, Dict, Dict, Dict]:
+    """
+    Chargement depuis le fichier colonnaire (reconverti si un CSV a changé).
+
+    Les commandes sont construites à la demande, après filtrage sur les
+    colonnes encodées (dates, clients).
+    """
+    store = ColumnarStore.load_or_build(base_path, args.columnar or None)
+    customers, products, promotions, shipping_zones = store.load_references()
+    if customer_ids is not None:
+        customers = {cid: c for cid, c in customers.items() if cid in customer_ids}
+    orders = store.iter_orders(
+        args.start_date, args.end_date,
+        customers.keys() if customer_ids is not None else None
+    )
+    return customers, orders, products, promotions, shipping_zones
+
+
+def _rollup_summaries(
+    args: argparse.Namespace,
+    base_path: Path,
+    customer_ids: Optional[Set[str]]
+) -> Iterator[OrderSummary]:
+    """Résumés calculés depuis les agrégats journaliers (mis à jour d'abord)"""
+    store = DailyRollupStore(args.rollups, base_path)
+    store.update()
+    customers = CustomerRepository(_rejects(args, 'customers.csv')).load_all(
+        base_path / 'customers.csv', customer_ids
+    )
+    shipping_zones = ShippingZoneRepository(_rejects(args, 'shipping_zones.csv')).load_all(
+        base_path / 'shipping_zones.csv'
+    )
+    return store.iter_summaries(customers, shipping_zones, args.start_date, args.end_date)
+
+
+def _aggregated_summaries(
+    args: argparse.Namespace,
+    base_path: Path,
+    customer_ids: Optional[Set[str]]
+) -> Iterator[OrderSummary]:
+    """Résumés calculés depuis des agrégats partiels (plages de orders.csv) fusionnés"""
+    customers = CustomerRepository(_rejects(args, 'customers.csv')).load_all(
+        base_path / 'customers.csv', customer_ids
+    )
+    products = ProductRepository(_rejects(args, 'products.csv')).load_all(
+        base_path / 'products.csv'
+    )
+    promotions = PromotionRepository(_rejects(args, 'promotions.csv')).load_all(
+        base_path / 'promotions.csv'
+    )
+    shipping_zones = ShippingZoneRepository(_rejects(args, 'shipping_zones.csv')).load_all(
+        base_path / 'shipping_zones.csv'
+    )
+    row_filters = [] if customer_ids is None else [ColumnFilter.of('customer_id', customers.keys())]
+    if args.start_date is not None or args.end_date is not None:
+        row_filters.append(DateRangeFilter(args.start_date, args.end_date))
+    aggregator = ParallelAggregator(workers=args.aggregate_jobs)
+    aggregates = aggregator.aggregate(base_path / 'orders.csv', products, promotions, row_filters)
+    return aggregator.iter_summaries(customers, aggregates, shipping_zones)
 
 
-def main() -> str:
+def _run_pipeline(
+    args: argparse.Namespace,
+    base_path: Path,
+    customer_ids: Optional[Set[str]]
+) -> None:
+    """Rapport complet par le pipeline asyncio, écrit sur la sortie standard"""
+    def load_references():
+        customers = CustomerRepository(_rejects(args, 'customers.csv')).load_all(
+            base_path / 'customers.csv', customer_ids
+        )
+        products = ProductRepository(_rejects(args, 'products.csv')).load_all(
+            base_path / 'products.csv'
+        )
+        promotions = PromotionRepository(_rejects(args, 'promotions.csv')).load_all(
+            base_path / 'promotions.csv'
+        )
+        shipping_zones = ShippingZoneRepository(_rejects(args, 'shipping_zones.csv')).load_all(
+            base_path / 'shipping_zones.csv'
+        )
+        return customers, products, promotions, shipping_zones
+    
+    orders = OrderRepository(_rejects(args, 'orders.csv')).iter_all(
+        base_path / 'orders.csv', args.start_date, args.end_date, customer_ids=customer_ids
+    )
+    StagedPipeline(OrderProcessor(exact_sums=args.exact_sums)).run(
+        orders, load_references, sys.stdout, _sorted_stream(args, base_path)
+    )
+
+
+# Nombre maximal de passes sur orders.csv pour atteindre --target-error
+_MAX_SAMPLING_ROUNDS = 4
+
+
+def _sampled_totals(
+    args: argparse.Namespace,
+    base_path: Path,
+    customer_ids: Optional[Set[str]]
+) -> SampledTotals:
+    """
+    Totaux estimés sur un échantillon de clients.
+
+    Seules les commandes des clients tirés sont converties et traitées. Avec
+    --target-error, l'échantillon est complété d'après la variance observée
+    (une passe sur orders.csv par complément, pour les seuls nouveaux clients).
+    """
+    rng = random.Random(args.seed)
+    population = CustomerRepository(_rejects(args, 'customers.csv')).load_all(
+        base_path / 'customers.csv', customer_ids
+    )
+    size = args.sample if args.sample is not None else DEFAULT_PILOT_SIZE
+    plan = SamplingPlan.draw(population, size, args.stratify, rng)
+    processor = OrderProcessor(exact_sums=args.exact_sums)
+    totals_by_customer: Dict[str, float] = {}
+    summaries: List[OrderSummary] = []
+    loaded: Set[str] = set()
+    for _ in range(_MAX_SAMPLING_ROUNDS):
+        new_ids = plan.sample_ids() - loaded
+        if new_ids:
+            customers, orders, products, promotions, shipping_zones = _load_csv(args, base_path, new_ids)
+            lines = OrderEnricher().enrich(orders, products, promotions)
+            for summary in processor.iter_summaries(
+                customers, processor.group_by_customer(lines), shipping_zones
+            ):
+                summaries.append(summary)
+                totals_by_customer[summary.customer.id] = summary.total
+            loaded |= new_ids
+        sampled = SampledTotals.from_summaries(plan, summaries, args.confidence)
+        if args.target_error is None or sampled.estimates[0].relative_error <= args.target_error:
+            break
+        needed = plan.required_size(totals_by_customer, args.target_error, args.confidence)
+        if needed <= plan.size:
+            break
+        plan = plan.extend(needed, rng)
+    return sampled
+
+
+def _write_trace(processor: TracingOrderProcessor, trace_file: Optional[Path]) -> None:
+    """Écrit la trace --explain (fichier, ou sortie d'erreur)"""
+    trace = processor.to_json()
+    if trace_file is None:
+        print(trace, file=sys.stderr)
+    else:
+        trace_file.write_text(trace + '\n', encoding='utf-8')
+
+
+def main(argv: Optional[List[str]] = None) -> str:
     """
     Point d'entrée principal.
     Architecture claire en 5 étapes:
@@ -40,54 +577,210 @@ def main() -> str:
     4. Formatage (formatters)
     5. Output (I/O)
     
+    Avec une plage de dates (--from/--to), seules les commandes de la plage
+    sont parsées et traitées. Le rapport est alors identique à celui d'un
+    orders.csv pré-filtré: en particulier le bonus weekend porte sur la date
+    de la première ligne du client DANS la plage (ordre du fichier).
+    
+    Avec --customers/--customers-file, seuls ces clients, leurs commandes et
+    les produits, promotions et zones qu'ils référencent sont chargés. Leurs
+    sections sont identiques à celles du rapport complet; les totaux globaux
+    portent sur le sous-ensemble.
+    
+    Avec --columnar, les données sont lues depuis le fichier colonnaire
+    memory-mappé au lieu des CSV (même rapport).
+    
+    Avec --rollups, le rapport est calculé depuis les agrégats journaliers
+    (seuls les jours nouveaux ou complétés sont parsés): identique au
+    rapport --from/--to de la même plage.
+    
+    Avec --aggregate-jobs, les lignes sont agrégées par plusieurs processus
+    sur des plages de orders.csv, puis fusionnées par client: même rapport,
+    un gros client étant réparti entre les processus.
+    
+    Avec --pipeline, lecture, calcul et écriture tournent en étapes asyncio
+    concurrentes; le rapport est écrit au fil de l'eau et n'est pas retourné.
+    
+    Avec --manifest, un manifeste des sections du rapport est écrit à côté;
+    --diff compare deux rapports par leurs manifestes.
+    
+    Avec --batch, un rapport est écrit par jeu de données dans --out-dir
+    (références de --data-dir parsées une fois) et seule la synthèse du lot
+    est affichée.
+    
+    Avec --sample/--target-error, seuls Grand Total et Total Tax Collected
+    sont estimés, sur un échantillon de clients (intervalles de confiance).
+    
+    Avec --loyalty-ledger, les points de fidélité sont ceux du registre
+    (commandes des exécutions précédentes comprises); les commandes lues
+    jamais comptées y sont ajoutées une fois le rapport produit.
+    
+    Avec --sorted-input (orders.csv trié par client), les commandes sont
+    traitées en flux, un client à la fois; le rapport complet est alors
+    écrit ligne par ligne sur la sortie standard et n'est pas retourné.
+    
+    Args:
+        argv: Arguments de la ligne de commande (défaut: aucun)
+    
     Returns:
-        Le rapport texte généré
+        Le rapport texte généré (chaîne vide s'il a été écrit en flux)
     """
+    parser = build_parser()
+    args = parser.parse_args(argv or [])
+    _check_modes(parser, args)
+    sampling = args.sample is not None or args.target_error is not None
+    
     # 1. Configuration
-    base_path = Path(__file__).parent.parent / 'legacy' / 'data'
+    base_path = args.data_dir or Path(__file__).parent.parent / 'legacy' / 'data'
     
-    # 2. Chargement des données (séparation I/O)
-    customers = CustomerRepository().load_all(base_path / 'customers.csv')
-    products = ProductRepository().load_all(base_path / 'products.csv')
-    orders = OrderRepository().load_all(base_path / 'orders.csv')
-    promotions = PromotionRepository().load_all(base_path / 'promotions.csv')
-    shipping_zones = ShippingZoneRepository().load_all(base_path / 'shipping_zones.csv')
-    
-    # 3. Traitement métier (logique pure)
-    processor = OrderProcessor()
-    summaries = []
-    
-    # Grouper les commandes par client et traiter
-    # Tri par ID client pour ordre déterministe (comportement legacy)
-    for customer_id in sorted(customers.keys()):
-        customer = customers[customer_id]
-        
-        # Filtrer les commandes de ce client
-        customer_orders = [o for o in orders if o.customer_id == customer_id]
+    # Métriques collectées uniquement si un fichier de sortie est demandé
+    metrics = RunMetrics() if args.metrics_file is not None else None
+    run_start = time.perf_counter()
+    
+    # Comparaison de deux rapports: seuls les seaux modifiés des manifestes sont lus
+    if args.diff is not None:
+        old_report, new_report = args.diff
+        diff = ReportDiff.between(
+            ReportManifest(str(old_report) + MANIFEST_SUFFIX),
+            ReportManifest(str(new_report) + MANIFEST_SUFFIX)
+        )
+        report = diff.format(
+            old_report if old_report.exists() else None,
+            new_report if new_report.exists() else None
+        )
+        if report:
+            print(report)
+        return report
+    
+    # Pipeline asyncio: lecture, calcul et écriture se recouvrent
+    if args.pipeline:
+        _run_pipeline(args, base_path, _requested_customers(args))
+        return ''
+    
+    # Lot: références communes chargées une fois, un rapport par jeu de données
+    if args.batch is not None:
+        if args.out_dir is None:
+            parser.error("--batch nécessite --out-dir")
+        results = BatchRunner(
+            base_path, args.out_dir, args.jobs, args.start_date, args.end_date
+        ).run(Dataset.from_path(path) for path in args.batch)
+        report = '\n'.join(result.format() for result in results)
+        print(report)
+        return report
+    
+    # Estimation: seuls les clients tirés sont traités
+    if sampling:
+        report = _sampled_totals(args, base_path, _requested_customers(args)).format()
+        print(report)
+        return report
+    
+    # Mode watch: rapport complet, mis à jour incrémentalement (bloquant)
+    if args.watch:
+        if metrics is None:
+            return ReportWatcher(
+                base_path, OrderProcessor(exact_sums=args.exact_sums)
+            ).run(print, args.interval)
         
-        if not customer_orders:
-            continue  # Skip clients sans commandes
+        def on_report(report: str) -> None:
+            print(report)
+            metrics.record_run()
+            metrics.write_textfile(args.metrics_file)
         
-        # Traiter les commandes du client
-        summary = processor.process_customer_orders(
-            customer=customer,
-            orders=customer_orders,
-            products=products,
-            promotions=promotions,
-            shipping_zones=shipping_zones
-        )
+        processor = MeteredOrderProcessor(metrics, exact_sums=args.exact_sums)
+        return ReportWatcher(base_path, processor).run(on_report, args.interval)
+    
+    # 2. Chargement des données (séparation I/O)
+    customer_ids = _requested_customers(args)
+    if args.rollups is not None:
+        # Agrégats journaliers: les jours déjà agrégés ne sont ni parsés ni valorisés
+        stream = False
+        summaries = _rollup_summaries(args, base_path, customer_ids)
+    elif args.aggregate_jobs is not None:
+        # Agrégats partiels par plage de orders.csv, fusionnés par client
+        stream = False
+        summaries = _aggregated_summaries(args, base_path, customer_ids)
+    else:
+        stream = _sorted_stream(args, base_path)
+        if args.columnar is not None:
+            customers, orders, products, promotions, shipping_zones = _load_columnar(
+                args, base_path, customer_ids
+            )
+        else:
+            customers, orders, products, promotions, shipping_zones = _load_csv(
+                args, base_path, customer_ids, stream, metrics
+            )
         
-        summaries.append(summary)
+        # Registre de fidélité: les commandes lues sont mises en attente, les
+        # points viennent du registre (historique compris) sans le re-parcourir
+        calculators = {'exact_sums': args.exact_sums}
+        if args.loyalty_ledger is not None:
+            ledger = LoyaltyLedger(args.loyalty_ledger)
+            orders = ledger.stage(orders)
+            calculators['loyalty_calc'] = LedgerLoyaltyCalculator(ledger)
+    
+        # 3. Traitement métier (logique pure)
+        # Le traçage et la mesure n'existent que s'ils sont demandés: le calcul
+        # normal n'en paie rien
+        if args.explain:
+            processor = TracingOrderProcessor(
+                (c.strip() for c in args.explain.split(',') if c.strip()), **calculators
+            )
+        elif metrics is not None:
+            processor = MeteredOrderProcessor(metrics, **calculators)
+        else:
+            processor = OrderProcessor(**calculators)
+        if stream:
+            # Entrée triée par client: un seul client en mémoire à la fois
+            lines = OrderEnricher().iter_enrich(orders, products, promotions)
+            summaries = processor.iter_sorted_summaries(customers, lines, shipping_zones)
+        else:
+            # Jointure produits/promotions faite une seule fois, au chargement
+            lines = OrderEnricher().enrich(orders, products, promotions)
+            
+            # Grouper les lignes par client (une passe, ordre du fichier conservé)
+            summaries = processor.iter_summaries(
+                customers, processor.group_by_customer(lines), shipping_zones
+            )
     
     # 4. Formatage (présentation)
-    formatter = TextReportFormatter()
-    report = formatter.format(summaries)
+    # Avec --manifest, le formateur relève l'empreinte de chaque section
+    formatter = ManifestTextFormatter() if args.manifest is not None else TextReportFormatter()
+    # Les requêtes agrégées consomment le flux de résumés sans rendu complet
+    if args.totals:
+        report = GrandTotals.from_summaries(summaries).format()
+    elif args.top is not None:
+        report = format_top(top_n(summaries, args.top, args.by), args.by)
+    elif args.split_dir is not None:
+        # Relevés écrits au fil de l'eau: seuls les totaux sont affichés
+        writer = StatementWriter(args.split_dir, args.buckets, args.writers)
+        report = writer.write(summaries).totals.format()
+    elif stream:
+        # Rapport écrit au fil de l'eau, jamais construit en mémoire
+        for line in formatter.iter_lines(summaries):
+            sys.stdout.write(line + '\n')
+        report = ''
+    else:
+        report = formatter.format(summaries)
     
     # 5. Output (I/O isolé)
-    print(report)
+    if report:
+        print(report)
+    if args.manifest is not None:
+        formatter.write_manifest(args.manifest)
+    if args.explain:
+        _write_trace(processor, args.trace_file)
+    if args.loyalty_ledger is not None:
+        # Validé seulement une fois le rapport produit: une exécution
+        # interrompue n'ajoute rien au registre
+        ledger.commit()
+        if args.compact_ledger:
+            ledger.compact()
+    if metrics is not None:
+        metrics.record_run(time.perf_counter() - run_start)
+        metrics.write_textfile(args.metrics_file)
     
     return report
 
 
 if __name__ == '__main__':
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,40 @@
+"""
+EnrichedLine Model
+Ligne de commande jointe à son produit et à sa promotion.
+"""
+
+from dataclasses import dataclass
+from .order import Order
+
+
+@dataclass(frozen=True, slots=True)
+class EnrichedLine:
+    """
+    Ligne de commande pré-jointe, construite une seule fois au chargement.
+    
+    Contient tout ce dont les calculateurs ont besoin, sans nouvelle
+    recherche dans les dictionnaires produits/promotions.
+    
+    Attributes:
+        order: La commande d'origine
+        base_price: Prix du produit (fallback legacy: prix de la commande)
+        unit_weight: Poids unitaire (fallback legacy: 1.0 kg)
+        product_found: Si le produit existe dans le catalogue
+        taxable: Si la ligne est taxable (produit inconnu = taxable, legacy)
+        discount_rate: Taux de la promotion active (0 si aucune)
+        fixed_discount: Remise fixe unitaire de la promotion active (0 si aucune)
+        hour: Heure de la commande
+    """
+    order: Order
+    base_price: float
+    unit_weight: float
+    product_found: bool
+    taxable: bool
+    discount_rate: float
+    fixed_discount: float
+    hour: int
+    
+    @property
+    def customer_id(self) -> str:
+        """Identifiant du client de la ligne"""
+        return self.order.customer_id
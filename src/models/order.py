@@ -6,11 +6,14 @@ Encapsule les données d'une commande.
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Order:
     """
     Représente une ligne de commande.
     
+    Déclarée avec __slots__: pas de __dict__ par instance, ce qui compte
+    pour des fichiers de plusieurs millions de lignes.
+    
     Attributes:
         id: Identifiant unique de la commande
         customer_id: Identifiant du client
@@ -0,0 +1 @@
+"""Pipeline package - Modes d'exécution du rapport (watch, streaming, batch...)"""
@@ -0,0 +1,218 @@
+"""
+Batch Runner
+Produit un rapport par jeu de données (répertoire régional ou fichier de
+commandes) en une seule exécution.
+
+- Les données de référence communes (produits, promotions, zones) sont
+  parsées une seule fois pour tout le lot, via un ReferenceStore.
+- Les jeux de données sont traités en parallèle par un pool de processus:
+  chaque worker reçoit les références une fois, à son démarrage, puis
+  enchaîne les jeux de données qu'on lui confie.
+- Un fichier présent dans le répertoire d'un jeu de données (ex: un
+  promotions.csv régional) remplace la version commune pour ce jeu.
+
+Un jeu de données en erreur n'interrompt pas le lot: l'erreur figure dans
+son résultat.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from ..formatters.text_formatter import TextReportFormatter
+from ..repositories.compression import resolve_csv_path
+from ..repositories.customer_repository import CustomerRepository
+from ..repositories.order_repository import OrderRepository
+from ..repositories.reference_store import REFERENCE_FILES, REFERENCE_LOADERS, ReferenceStore
+from ..services.order_enricher import OrderEnricher
+from ..services.order_processor import OrderProcessor
+from ..services.report_queries import GrandTotals
+
+
+# Références communes reçues par un worker à son démarrage
+_worker_references: Dict[str, Mapping] = {}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """
+    Un jeu de données du lot.
+
+    Attributes:
+        name: Nom du rapport produit (<name>.txt)
+        orders_path: Fichier des commandes
+        data_dir: Répertoire des autres fichiers propres au jeu de données
+    """
+    name: str
+    orders_path: Path
+    data_dir: Path
+
+    @classmethod
+    def from_path(cls, path: Path | str) -> 'Dataset':
+        """
+        Jeu de données d'un répertoire (son orders.csv) ou d'un fichier de commandes.
+
+        Args:
+            path: Répertoire de données, ou fichier de commandes (nommé d'après
+                le fichier, autres fichiers cherchés dans son répertoire)
+        """
+        path = Path(path)
+        if path.is_dir():
+            return cls(path.name, path / 'orders.csv', path)
+        name = path.name.split('.')[0]
+        return cls(name, path, path.parent)
+
+
+@dataclass(frozen=True)
+class DatasetResult:
+    """
+    Résultat du traitement d'un jeu de données.
+
+    Attributes:
+        name: Nom du jeu de données
+        report_path: Rapport écrit (None en cas d'erreur)
+        totals: Totaux globaux du rapport
+        seconds: Durée du traitement
+        error: Message d'erreur (None si le rapport a été produit)
+    """
+    name: str
+    report_path: Optional[Path]
+    totals: GrandTotals
+    seconds: float
+    error: Optional[str] = None
+
+    def format(self) -> str:
+        """Ligne de synthèse du jeu de données"""
+        if self.error is not None:
+            return f'{self.name}: ERREUR {self.error}'
+        return (
+            f'{self.name}: {self.totals.customers} customers, '
+            f'Grand Total {self.totals.grand_total:.2f} EUR, '
+            f'Tax {self.totals.total_tax:.2f} EUR ({self.seconds:.2f}s)'
+        )
+
+
+class BatchRunner:
+    """
+    Exécute le rapport de plusieurs jeux de données avec des références communes.
+
+    Attributes:
+        shared_dir: Répertoire des références communes (et des fichiers
+            absents d'un jeu de données, ex: customers.csv)
+        out_dir: Répertoire des rapports
+        jobs: Nombre de processus (1: traitement séquentiel dans le processus)
+    """
+
+    def __init__(
+        self,
+        shared_dir: Path | str,
+        out_dir: Path | str,
+        jobs: int = 1,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ):
+        """
+        Args:
+            shared_dir: Répertoire contenant products.csv, promotions.csv et
+                shipping_zones.csv communs
+            out_dir: Répertoire où écrire <nom>.txt pour chaque jeu de données
+            jobs: Nombre de jeux de données traités en parallèle
+            start_date: Date de début incluse (YYYY-MM-DD), optionnelle
+            end_date: Date de fin incluse (YYYY-MM-DD), optionnelle
+        """
+        self.shared_dir = Path(shared_dir)
+        self.out_dir = Path(out_dir)
+        self.jobs = max(1, jobs)
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def run(self, datasets: Iterable[Dataset]) -> List[DatasetResult]:
+        """
+        Produit le rapport de chaque jeu de données.
+
+        Args:
+            datasets: Jeux de données (noms uniques)
+
+        Returns:
+            Un résultat par jeu de données, dans l'ordre donné
+
+        Raises:
+            ValueError: Si deux jeux de données ont le même nom
+        """
+        datasets = list(datasets)
+        names = [dataset.name for dataset in datasets]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Jeux de données de même nom: {', '.join(duplicates)}")
+
+        snapshot = ReferenceStore(self.shared_dir).snapshot
+        # Dicts simples: les instantanés (mappingproxy) ne passent pas entre processus
+        references = {
+            attr: dict(getattr(snapshot, attr)) for attr, _ in REFERENCE_LOADERS.values()
+        }
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        tasks = [
+            (dataset, self.shared_dir, self.out_dir, self.start_date, self.end_date)
+            for dataset in datasets
+        ]
+
+        if self.jobs == 1 or len(datasets) <= 1:
+            return [_run_dataset(references, *task) for task in tasks]
+        with ProcessPoolExecutor(
+            max_workers=min(self.jobs, len(datasets)),
+            initializer=_init_worker,
+            initargs=(references,)
+        ) as executor:
+            return list(executor.map(_run_in_worker, tasks))
+
+
+def _init_worker(references: Dict[str, Mapping]) -> None:
+    """Reçoit les références communes, une fois par worker"""
+    global _worker_references
+    _worker_references = references
+
+
+def _run_in_worker(task: Tuple) -> DatasetResult:
+    return _run_dataset(_worker_references, *task)
+
+
+def _run_dataset(
+    references: Mapping[str, Mapping],
+    dataset: Dataset,
+    shared_dir: Path,
+    out_dir: Path,
+    start_date: Optional[str],
+    end_date: Optional[str]
+) -> DatasetResult:
+    """Calcule et écrit le rapport d'un jeu de données"""
+    start = time.perf_counter()
+    try:
+        # Fichiers propres au jeu de données, sinon versions communes
+        local = {}
+        own_dir = dataset.data_dir.resolve() != shared_dir.resolve()
+        for name in REFERENCE_FILES:
+            path = resolve_csv_path(dataset.data_dir / name)
+            if own_dir and path.exists():
+                attr, repository = REFERENCE_LOADERS[name]
+                local[attr] = repository().load_all(path)
+        refs = {**references, **local}
+        customers_path = resolve_csv_path(dataset.data_dir / 'customers.csv')
+        if not customers_path.exists():
+            customers_path = shared_dir / 'customers.csv'
+
+        customers = CustomerRepository().load_all(customers_path)
+        orders = OrderRepository().load_all(dataset.orders_path, start_date, end_date)
+        processor = OrderProcessor()
+        lines = OrderEnricher().enrich(orders, refs['products'], refs['promotions'])
+        summaries = list(processor.iter_summaries(
+            customers, processor.group_by_customer(lines), refs['shipping_zones']
+        ))
+        report_path = out_dir / f'{dataset.name}.txt'
+        report_path.write_text(TextReportFormatter().format(summaries) + '\n', encoding='utf-8')
+    except (OSError, ValueError) as exc:
+        return DatasetResult(dataset.name, None, GrandTotals(), time.perf_counter() - start, str(exc))
+    return DatasetResult(
+        dataset.name, report_path, GrandTotals.from_summaries(summaries), time.perf_counter() - start
+    )
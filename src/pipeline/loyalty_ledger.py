@@ -0,0 +1,236 @@
+"""
+Loyalty Ledger
+Registre persistant des points de fidélité: pour chaque client, les
+commandes déjà comptées (ID et quantité × prix) et leur base cumulée
+(somme exacte). Les points d'un client se lisent dans le registre au
+lieu d'être recalculés sur tout son historique.
+
+Journal en ajout seul, une ligne JSON par exécution validée:
+- les commandes d'une exécution sont d'abord mises en attente (stage),
+  puis écrites en un seul enregistrement (commit): un enregistrement est
+  entièrement pris en compte ou pas du tout
+- chaque enregistrement porte un CRC; une fin de fichier incomplète ou
+  corrompue (arrêt pendant l'écriture) est ignorée puis tronquée
+- une commande déjà présente dans le registre n'est jamais recomptée,
+  même si d'autres commandes du même enregistrement sont nouvelles
+- commit et compact prennent un verrou exclusif (fichier `<journal>.lock`)
+  et relisent d'abord les enregistrements ajoutés par d'autres processus:
+  deux exécutions concurrentes ne comptent pas deux fois une commande
+
+compact() réécrit le journal en un seul enregistrement (fichier temporaire
+puis rename).
+"""
+
+import contextlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+try:
+    import fcntl
+except ImportError:  # Windows: pas de verrou inter-processus
+    fcntl = None
+
+from ..models.order import Order
+from ..services.line_aggregate import ExactSum
+from ..services.loyalty_calculator import LoyaltyCalculator
+
+
+class LoyaltyLedger:
+    """
+    Journal des points de fidélité.
+
+    Attributes:
+        path: Fichier du journal
+        lock_path: Fichier du verrou inter-processus
+    """
+
+    def __init__(self, path: Path | str, calculator: LoyaltyCalculator | None = None):
+        """
+        Args:
+            path: Fichier du journal (créé au premier commit)
+            calculator: Conversion base -> points
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+        self.calculator = calculator or LoyaltyCalculator()
+        self._bases: Dict[str, ExactSum] = {}
+        self._orders: Dict[str, Dict[str, float]] = {}
+        self._seen: Set[str] = set()
+        self._staged: Set[str] = set()
+        self._pending: Dict[str, List[Order]] = {}
+        self._valid_length = 0
+        self._inode: Optional[int] = None
+        self._replay()
+
+    # === Lecture ===
+
+    def _replay(self) -> None:
+        """
+        Rejoue les enregistrements intacts non encore lus.
+
+        Reprend après le dernier enregistrement lu; si le journal a été
+        remplacé entre-temps (compact d'un autre processus), il est relu
+        en entier.
+        """
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != self._inode:
+                self._bases, self._orders, self._seen = {}, {}, set()
+                self._valid_length = 0
+                self._inode = inode
+            f.seek(self._valid_length)
+            for raw in f:
+                record = _decode(raw)
+                if record is None:
+                    break  # Fin incomplète ou corrompue: ignorée, tronquée au prochain commit
+                self._apply(record)
+                self._valid_length += len(raw)
+
+    def _apply(self, record: dict) -> None:
+        """Ajoute les commandes d'un enregistrement, sauf celles déjà comptées"""
+        for cid, entry in record.items():
+            new = {oid: amount for oid, amount in entry['orders'].items() if oid not in self._seen}
+            if not new:
+                continue
+            self._seen.update(new)
+            self._orders.setdefault(cid, {}).update(new)
+            self._bases[cid] = self._bases.get(cid, ExactSum()) + ExactSum.of(new.values())
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Verrou exclusif inter-processus, puis lecture des ajouts des autres processus"""
+        with open(self.lock_path, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                self._replay()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def base(self, customer_id: str) -> ExactSum:
+        """Base cumulée (validée + en attente) d'un client"""
+        base = self._bases.get(customer_id, ExactSum())
+        pending = self._pending.get(customer_id)
+        if pending:
+            base = base + ExactSum.of(order.line_total() for order in pending)
+        return base
+
+    def points(self, customer_id: str) -> float:
+        """Points de fidélité d'un client (commandes validées et en attente)"""
+        return self.calculator.points_for_total(float(self.base(customer_id)))
+
+    def order_count(self, customer_id: str) -> int:
+        """Nombre de commandes validées d'un client"""
+        return len(self._orders.get(customer_id, ()))
+
+    # === Écriture ===
+
+    def stage(self, orders: Iterable[Order]) -> Iterator[Order]:
+        """
+        Laisse passer les commandes en mettant de côté celles jamais comptées.
+
+        Args:
+            orders: Commandes de l'exécution (liste ou flux)
+
+        Yields:
+            Les mêmes commandes, dans le même ordre
+        """
+        for order in orders:
+            if order.id not in self._seen and order.id not in self._staged:
+                self._staged.add(order.id)
+                self._pending.setdefault(order.customer_id, []).append(order)
+            yield order
+
+    def commit(self) -> int:
+        """
+        Écrit les commandes en attente en un seul enregistrement (fsync).
+
+        Les commandes validées entre-temps par un autre processus ne sont
+        pas réécrites.
+
+        Returns:
+            Nombre de commandes ajoutées
+        """
+        if not self._pending:
+            return 0
+        with self._locked():
+            record = {}
+            for cid, orders in self._pending.items():
+                new = {order.id: order.line_total() for order in orders if order.id not in self._seen}
+                if new:
+                    record[cid] = {'orders': new}
+            if record:
+                line = _encode(record)
+                with open(self.path, 'ab') as f:
+                    f.truncate(self._valid_length)  # Retire une éventuelle fin corrompue
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self._inode = os.fstat(f.fileno()).st_ino
+                self._valid_length += len(line)
+                self._apply(record)
+        self._pending, self._staged = {}, set()
+        return sum(len(entry['orders']) for entry in record.values())
+
+    def compact(self) -> None:
+        """Réécrit le journal validé en un seul enregistrement"""
+        with self._locked():
+            record = {cid: {'orders': self._orders[cid]} for cid in sorted(self._orders)}
+            line = _encode(record) if record else b''
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                inode = os.fstat(f.fileno()).st_ino
+            os.replace(tmp_path, self.path)
+            self._valid_length = len(line)
+            self._inode = inode
+
+
+class LedgerLoyaltyCalculator(LoyaltyCalculator):
+    """LoyaltyCalculator qui lit les points dans le registre"""
+
+    def __init__(self, ledger: LoyaltyLedger):
+        """
+        Args:
+            ledger: Registre (les commandes du calcul doivent y être validées ou en attente)
+        """
+        # Base cumulée exacte dans le registre: même sommation pour les autres calculs
+        super().__init__(exact_sums=True)
+        self.ledger = ledger
+
+    def calculate_points(self, orders: Iterable[Order]) -> float:
+        """Points du client des commandes, tout historique du registre compris"""
+        first = next(iter(orders), None)
+        if first is None:
+            return 0.0
+        return self.ledger.points(first.customer_id)
+
+
+def _encode(record: dict) -> bytes:
+    payload = json.dumps(record, separators=(',', ':'), sort_keys=True)
+    crc = zlib.crc32(payload.encode('utf-8'))
+    return f'{crc:08x} {payload}\n'.encode('utf-8')
+
+
+def _decode(raw: bytes) -> dict | None:
+    """Enregistrement d'une ligne du journal, None si incomplète ou corrompue"""
+    if not raw.endswith(b'\n'):
+        return None
+    crc, _, payload = raw.rstrip(b'\n').partition(b' ')
+    try:
+        if int(crc, 16) != zlib.crc32(payload):
+            return None
+        return json.loads(payload)
+    except ValueError:
+        return None
@@ -0,0 +1,284 @@
+"""
+Parallel Aggregate
+Agrégats de lignes (LineAggregate) calculés par plusieurs processus, sans
+découper par client.
+
+- orders.csv est réparti en plages d'octets (fins d'enregistrement
+  respectées, comme CSVRepository.load_parallel). Chaque processus parse,
+  enrichit et agrège par client les lignes de sa plage.
+- Les agrégats partiels d'un même client sont fusionnés, puis les règles
+  client (remises, plafond, taxe, port, devise) sont appliquées une fois
+  (OrderProcessor.process_customer_aggregate).
+- Un client aux millions de lignes est ainsi réparti entre tous les
+  processus au lieu d'en occuper un seul. Les sommes étant exactes
+  (ExactSum), le résultat est identique à celui du calcul en sommes
+  exactes (OrderProcessor(exact_sums=True), `main --exact-sums`), quel que
+  soit le découpage.
+
+Seuls les agrégats (quelques entiers par client et par plage) reviennent
+des processus, pas les commandes. Chaque plage est lue en flux, un
+enregistrement à la fois. Les lignes invalides sont ignorées comme au
+chargement normal, sans être comptées; si aucune ligne du fichier n'est
+valide, ValueError est levée comme par CSVRepository, avec les numéros de
+ligne du fichier. Un fichier compressé ne peut pas être découpé: il est
+agrégé dans le processus courant.
+"""
+
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from ..models.customer import Customer
+from ..models.enriched_line import EnrichedLine
+from ..models.order_summary import OrderSummary
+from ..models.product import Product
+from ..models.promotion import Promotion
+from ..models.shipping_zone import ShippingZone
+from ..repositories.compression import detect_compression, open_csv_text, resolve_csv_path
+from ..repositories.csv_records import find_record_boundaries, iter_records, row_to_dict
+from ..repositories.csv_repository import PARALLEL_MIN_CHUNK_BYTES, RowFilter
+from ..repositories.order_repository import OrderRepository
+from ..repositories.rejection_stats import RejectedRow
+from ..services.line_aggregate import LineAggregate
+from ..services.order_enricher import OrderEnricher
+from ..services.order_processor import OrderProcessor
+from ..services.tax_calculator import TaxCalculator
+
+
+# (calculateur de taxes, enrichisseur, produits, promotions, filtres de lignes)
+Context = Tuple[
+    TaxCalculator, OrderEnricher, Mapping[str, Product], Mapping[str, Promotion],
+    Tuple[RowFilter, ...]
+]
+
+# (agrégats de la plage par client, nombre d'enregistrements de la plage,
+#  rejets si aucune ligne de la plage n'est valide, numéros relatifs à la plage)
+Part = Tuple[Dict[str, LineAggregate], int, Tuple[RejectedRow, ...]]
+
+# Contexte reçu par un worker à son démarrage
+_worker_context: Optional[Context] = None
+
+
+class ParallelAggregator:
+    """
+    Calcule les résumés clients à partir d'agrégats partiels fusionnés.
+
+    Attributes:
+        processor: Processeur de commandes (taxes, enrichissement, règles client)
+        workers: Nombre de processus
+        min_chunk_bytes: Taille minimale d'une plage (sinon moins de processus)
+    """
+
+    def __init__(
+        self,
+        processor: OrderProcessor | None = None,
+        workers: int = 2,
+        min_chunk_bytes: int = PARALLEL_MIN_CHUNK_BYTES
+    ):
+        """
+        Args:
+            processor: Processeur de commandes (injection de dépendances); ses
+                calculateurs doivent être picklables
+            workers: Nombre de processus (1: tout dans le processus courant)
+            min_chunk_bytes: Taille minimale d'une plage d'octets
+        """
+        self.processor = processor or OrderProcessor(exact_sums=True)
+        self.workers = max(1, workers)
+        self.min_chunk_bytes = min_chunk_bytes
+
+    def aggregate(
+        self,
+        orders_path: Path | str,
+        products: Mapping[str, Product],
+        promotions: Mapping[str, Promotion],
+        row_filters: Iterable[RowFilter] = ()
+    ) -> Dict[str, LineAggregate]:
+        """
+        Agrège les lignes de orders.csv par client.
+
+        Args:
+            orders_path: Fichier des commandes (ou sa version compressée)
+            products: Dict des produits
+            promotions: Dict des promotions
+            row_filters: Prédicats picklables sur la ligne brute (ex:
+                DateRangeFilter, ColumnFilter), évalués avant conversion
+
+        Returns:
+            Agrégat de chaque client, rangs de ligne dans l'ordre du fichier
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas
+            ValueError: Si des lignes sont lues mais aucune n'est valide
+        """
+        orders_path = resolve_csv_path(orders_path)
+        if not orders_path.exists():
+            raise FileNotFoundError(f"Fichier CSV introuvable: {orders_path}")
+        context: Context = (
+            self.processor.tax_calc, self.processor.enricher,
+            dict(products), dict(promotions), tuple(row_filters)
+        )
+
+        if detect_compression(orders_path) is not None:
+            with open_csv_text(orders_path) as f:
+                # start=2 car ligne 1 = header
+                rows = enumerate(csv.DictReader(f), start=2)
+                aggregates, rejects = _aggregate_rows(context, rows, orders_path)
+                return _merge([(aggregates, 0, rejects)], orders_path)
+
+        ranges, fieldnames = self._split(orders_path)
+        if len(ranges) <= 1:
+            parts = [_aggregate_range(context, orders_path, r, fieldnames) for r in ranges]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=len(ranges), initializer=_init_worker, initargs=(context,)
+            ) as executor:
+                parts = list(executor.map(
+                    _aggregate_in_worker,
+                    [orders_path] * len(ranges), ranges, [fieldnames] * len(ranges)
+                ))
+        return _merge(parts, orders_path)
+
+    def iter_summaries(
+        self,
+        customers: Mapping[str, Customer],
+        aggregates: Mapping[str, LineAggregate],
+        shipping_zones: Dict[str, ShippingZone]
+    ) -> Iterator[OrderSummary]:
+        """
+        Résumés clients dans l'ordre des IDs (comme OrderProcessor.iter_summaries).
+
+        Args:
+            customers: Dict des clients (les autres sont ignorés)
+            aggregates: Agrégats par client (voir aggregate)
+            shipping_zones: Dict des zones de livraison
+
+        Yields:
+            OrderSummary dans l'ordre des IDs client
+        """
+        for cid in sorted(customers.keys() & aggregates.keys()):
+            yield self.processor.process_customer_aggregate(
+                customers[cid], aggregates[cid], shipping_zones
+            )
+
+    def _split(self, orders_path: Path) -> Tuple[List[Tuple[int, int]], List[str]]:
+        """Plages d'octets alignées sur des fins d'enregistrement, et en-tête"""
+        size = orders_path.stat().st_size
+        with open(orders_path, 'rb') as f:
+            header = next(iter_records(f), None)
+            if header is None:
+                return [], []
+            _, data_start, fieldnames = header
+            chunk_count = max(
+                1, min(self.workers, (size - data_start) // max(1, self.min_chunk_bytes))
+            )
+            boundaries = find_record_boundaries(f, data_start, size, chunk_count)
+        return list(zip(boundaries[:-1], boundaries[1:])), fieldnames
+
+
+def _init_worker(context: Context) -> None:
+    """Reçoit calculateurs et références, une fois par worker"""
+    global _worker_context
+    _worker_context = context
+
+
+def _aggregate_in_worker(
+    orders_path: Path,
+    byte_range: Tuple[int, int],
+    fieldnames: List[str]
+) -> Part:
+    return _aggregate_range(_worker_context, orders_path, byte_range, fieldnames)
+
+
+def _aggregate_range(
+    context: Context,
+    orders_path: Path,
+    byte_range: Tuple[int, int],
+    fieldnames: List[str]
+) -> Part:
+    """
+    Parse et agrège une plage d'octets, un enregistrement à la fois.
+
+    Les numéros de ligne sont relatifs à la plage (la première ligne de
+    données vaut 2, comme CSVRepository); _merge les décale.
+    """
+    start, end = byte_range
+    record_count = 0
+
+    def numbered_rows(f) -> Iterator[Tuple[int, Dict[str, str]]]:
+        nonlocal record_count
+        for offset, _, fields in iter_records(f, start):
+            if offset >= end:
+                break
+            if not fields:
+                continue  # Lignes vides ignorées (comme csv.DictReader)
+            record_count += 1
+            yield record_count + 1, row_to_dict(fieldnames, fields)
+
+    with open(orders_path, 'rb') as f:
+        f.seek(start)
+        aggregates, rejects = _aggregate_rows(context, numbered_rows(f), orders_path)
+    return aggregates, record_count, rejects
+
+
+def _aggregate_rows(
+    context: Context,
+    numbered_rows: Iterable[Tuple[int, Dict[str, str]]],
+    source: Path
+) -> Tuple[Dict[str, LineAggregate], Tuple[RejectedRow, ...]]:
+    """
+    Convertit, enrichit et agrège par client des lignes brutes numérotées.
+
+    Une plage sans ligne valide n'échoue pas seule (les autres plages peuvent
+    en avoir): ses rejets sont renvoyés et tranchés par _merge.
+    """
+    tax_calc, enricher, products, promotions, row_filters = context
+    if row_filters:
+        numbered_rows = (
+            (line_num, row) for line_num, row in numbered_rows
+            if all(f(row) for f in row_filters)
+        )
+    repository = OrderRepository()
+    try:
+        orders = repository.repo.load_numbered_rows(numbered_rows, source)
+    except ValueError:
+        return {}, repository.last_stats.samples
+    by_customer: Dict[str, List[Tuple[int, EnrichedLine]]] = {}
+    for line_num, order in orders:
+        # Rang dans la plage: numéro de ligne moins le header
+        by_customer.setdefault(order.customer_id, []).append(
+            (line_num - 2, enricher.enrich_one(order, products, promotions))
+        )
+    aggregates = {
+        cid: LineAggregate.of_lines(lines, tax_calc) for cid, lines in by_customer.items()
+    }
+    return aggregates, ()
+
+
+def _merge(parts: Sequence[Part], source: Path) -> Dict[str, LineAggregate]:
+    """
+    Fusionne les agrégats des plages, rangs et numéros de ligne décalés dans
+    l'ordre du fichier.
+
+    Raises:
+        ValueError: Si aucune plage n'a de ligne valide et qu'une plage a des rejets
+    """
+    by_customer: Dict[str, List[LineAggregate]] = {}
+    records_before = 0
+    rejects: List[RejectedRow] = []
+    for aggregates, record_count, part_rejects in parts:
+        for cid, aggregate in aggregates.items():
+            by_customer.setdefault(cid, []).append(
+                replace(aggregate, first_seq=aggregate.first_seq + records_before)
+            )
+        rejects.extend(
+            replace(sample, line_num=sample.line_num + records_before) for sample in part_rejects
+        )
+        records_before += record_count
+    if not by_customer and rejects:
+        # Même message que CSVRepository
+        raise ValueError(
+            f"Impossible de parser {source}:\n" + "\n".join(str(sample) for sample in rejects[:5])
+        )
+    return {cid: LineAggregate.merge_all(aggregates) for cid, aggregates in by_customer.items()}
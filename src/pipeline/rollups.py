@@ -0,0 +1,302 @@
+"""
+Daily Rollups
+Agrégats persistés par client et par jour (LineAggregate), pour calculer
+un rapport sur une longue période sans re-parser ni re-valoriser chaque
+ligne de commande.
+
+- Un rapport multi-jours fusionne les agrégats des jours de la plage puis
+  applique les règles client (remises, plafond, taxe, port, devise) via
+  OrderProcessor.process_customer_aggregate. Les agrégats gardent des
+  sommes exactes: même résultat que `main --exact-sums --from ... --to ...`
+  sur orders.csv (le rapport par défaut, en sommes séquentielles legacy,
+  peut différer d'un centime).
+- Mise à jour incrémentale: l'index de dates de orders.csv donne le nombre
+  d'enregistrements de chaque jour; seuls les jours nouveaux ou dont le
+  nombre a changé (lignes ajoutées) sont re-parsés.
+- Les agrégats dépendent des produits, des promotions et du taux de taxe:
+  si l'un d'eux change, tout est reconstruit.
+
+Seules les lignes datées (YYYY-MM-DD) sont agrégées, comme pour une plage
+--from/--to. Une ligne existante modifiée sans changement du nombre de
+lignes de son jour n'est pas détectée: utiliser rebuild().
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ..models.customer import Customer
+from ..models.enriched_line import EnrichedLine
+from ..models.order_summary import OrderSummary
+from ..models.product import Product
+from ..models.promotion import Promotion
+from ..models.shipping_zone import ShippingZone
+from ..repositories.compression import detect_compression, resolve_csv_path
+from ..repositories.order_date_index import OrderDateIndex
+from ..repositories.order_repository import OrderRepository
+from ..repositories.product_repository import ProductRepository
+from ..repositories.promotion_repository import PromotionRepository
+from ..repositories.reference_store import file_signature
+from ..services.line_aggregate import LineAggregate
+from ..services.order_processor import OrderProcessor
+
+
+_FORMAT_VERSION = 1
+
+# Fichiers dont dépend la valorisation des lignes
+_PRICING_FILES = ('products.csv', 'promotions.csv')
+
+
+class DailyRollupStore:
+    """
+    Agrégats (client, jour) de orders.csv, persistés (une ligne JSON par jour).
+
+    Les jours persistés ne sont décodés qu'à leur première lecture: une
+    requête sur une plage courte ne paie pas le décodage de tout l'historique.
+
+    Attributes:
+        path: Fichier des agrégats
+        data_dir: Répertoire des CSV
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        data_dir: Path | str,
+        processor: OrderProcessor | None = None
+    ):
+        """
+        Args:
+            path: Fichier des agrégats (créé à la première mise à jour)
+            data_dir: Répertoire contenant orders.csv, products.csv, promotions.csv
+            processor: Processeur de commandes (enrichissement, taxe, règles client)
+        """
+        self.path = Path(path)
+        self.data_dir = Path(data_dir)
+        self.processor = processor or OrderProcessor(exact_sums=True)
+        self._days: Dict[str, Dict[str, LineAggregate]] = {}
+        self._encoded: Dict[str, str] = {}  # JSON des jours persistés pas encore décodés
+        self._records: Dict[str, int] = {}
+        self._built_with: Optional[dict] = None  # Empreinte des agrégats en mémoire
+        self._load()
+
+    # === Persistance ===
+
+    def _fingerprint(self) -> dict:
+        """Ce dont dépendent les agrégats (hors orders.csv), sous forme JSON"""
+        return {
+            'tax_rate': self.processor.tax_calc.tax_rate,
+            'files': {
+                name: _as_list(file_signature(resolve_csv_path(self.data_dir / name)))
+                for name in _PRICING_FILES
+            },
+        }
+
+    def _load(self) -> None:
+        """
+        Lit les agrégats persistés s'ils sont toujours valides.
+
+        Format: une ligne d'en-tête JSON, puis une ligne par jour
+        `date<TAB>enregistrements<TAB>agrégats JSON`; le JSON d'un jour
+        n'est décodé qu'à sa première lecture.
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                header = json.loads(f.readline())
+                fingerprint = self._fingerprint()
+                if header.get('format_version') != _FORMAT_VERSION or header.get('fingerprint') != fingerprint:
+                    return
+                for line in f:
+                    date, records, encoded = line.rstrip('\n').split('\t', 2)
+                    self._records[date] = int(records)
+                    self._encoded[date] = encoded
+        except (FileNotFoundError, ValueError):
+            self._clear()
+            return
+        self._built_with = fingerprint
+
+    def dates(self) -> List[str]:
+        """Dates agrégées, triées"""
+        return sorted(self._records)
+
+    def day(self, date: str) -> Dict[str, LineAggregate]:
+        """Agrégats d'un jour, par client (vide si le jour est inconnu)"""
+        customers = self._days.get(date)
+        if customers is None:
+            encoded = json.loads(self._encoded.pop(date, '{}'))
+            customers = self._days[date] = {
+                cid: LineAggregate.from_json(aggregate) for cid, aggregate in encoded.items()
+            }
+        return customers
+
+    def save(self) -> None:
+        """Écrit les agrégats (fichier temporaire puis rename)"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'format_version': _FORMAT_VERSION, 'fingerprint': self._built_with}) + '\n')
+            for date in self.dates():
+                encoded = self._encoded.get(date)
+                if encoded is None:
+                    encoded = json.dumps(
+                        {cid: agg.to_json() for cid, agg in self._days[date].items()},
+                        separators=(',', ':')
+                    )
+                f.write(f"{date}\t{self._records[date]}\t{encoded}\n")
+        os.replace(tmp_path, self.path)
+
+    # === Construction ===
+
+    def update(self) -> List[str]:
+        """
+        Met à jour les agrégats puis les persiste.
+
+        Returns:
+            Dates re-parsées (nouvelles ou modifiées), triées
+
+        Raises:
+            ValueError: Si orders.csv est compressé (pas d'index de dates), ou
+                si des lignes sont lues mais aucune n'est valide (rien n'est
+                persisté)
+        """
+        orders_path = resolve_csv_path(self.data_dir / 'orders.csv')
+        if not orders_path.exists():
+            raise FileNotFoundError(f"Fichier CSV introuvable: {orders_path}")
+        if detect_compression(orders_path) is not None:
+            raise ValueError(f"Agrégats journaliers impossibles sur un fichier compressé: {orders_path}")
+
+        fingerprint = self._fingerprint()
+        if fingerprint != self._built_with:
+            self._clear()
+
+        index = OrderDateIndex.load_or_build(orders_path)
+        counts = index.date_counts()
+        removed = set(self._records) - set(counts)
+        for date in removed:
+            self._days.pop(date, None)
+            self._encoded.pop(date, None)
+            del self._records[date]
+        changed = sorted(date for date, count in counts.items() if self._records.get(date) != count)
+        if not changed and not removed and fingerprint == self._built_with:
+            return changed
+
+        if changed:
+            products = ProductRepository().load_all(self.data_dir / 'products.csv')
+            promotions = PromotionRepository().load_all(self.data_dir / 'promotions.csv')
+            order_repo = OrderRepository()
+            errors = []
+            for date in changed:
+                error = self._build_day(index, orders_path, order_repo, products, promotions, date)
+                if error is not None:
+                    errors.append(error)
+                self._records[date] = counts[date]
+            # Comme CSVRepository: échec si aucune ligne datée n'est valide
+            if errors and not any(self.day(date) for date in self.dates()):
+                self._clear()
+                raise ValueError(errors[0])
+
+        self._built_with = fingerprint
+        self.save()
+        return changed
+
+    def rebuild(self) -> List[str]:
+        """Reconstruit tous les agrégats"""
+        self._clear()
+        return self.update()
+
+    def _clear(self) -> None:
+        self._days, self._encoded, self._records = {}, {}, {}
+
+    def _build_day(
+        self,
+        index: OrderDateIndex,
+        orders_path: Path,
+        order_repo: OrderRepository,
+        products: Dict[str, Product],
+        promotions: Dict[str, Promotion],
+        date: str
+    ) -> Optional[str]:
+        """
+        Re-parse et agrège les lignes d'un jour.
+
+        Returns:
+            L'erreur de chargement si toutes les lignes du jour sont invalides
+            (le jour est alors vide; update décide s'il faut échouer), sinon None
+        """
+        error = None
+        try:
+            numbered = order_repo.repo.load_numbered_rows(
+                index.iter_rows(orders_path, date, date), orders_path
+            )
+        except ValueError as e:
+            numbered, error = [], str(e)
+        enrich_one = self.processor.enricher.enrich_one
+        by_customer: Dict[str, List[Tuple[int, EnrichedLine]]] = {}
+        for line_num, order in numbered:
+            by_customer.setdefault(order.customer_id, []).append(
+                (line_num, enrich_one(order, products, promotions))
+            )
+        tax_calc = self.processor.tax_calc
+        self._encoded.pop(date, None)
+        self._days[date] = {
+            cid: LineAggregate.of_lines(lines, tax_calc)
+            for cid, lines in by_customer.items()
+        }
+        return error
+
+    # === Requêtes ===
+
+    def aggregates(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        customer_ids: Optional[Set[str]] = None
+    ) -> Dict[str, LineAggregate]:
+        """
+        Fusionne les agrégats des jours de la plage, par client.
+
+        Args:
+            start_date: Date de début incluse (YYYY-MM-DD), optionnelle
+            end_date: Date de fin incluse (YYYY-MM-DD), optionnelle
+            customer_ids: Clients à garder (tous si None)
+
+        Returns:
+            Agrégat de chaque client ayant des lignes dans la plage
+        """
+        parts: Dict[str, List[LineAggregate]] = {}
+        for date in self.dates():
+            if (start_date is not None and date < start_date) or (end_date is not None and date > end_date):
+                continue
+            for cid, aggregate in self.day(date).items():
+                if customer_ids is None or cid in customer_ids:
+                    parts.setdefault(cid, []).append(aggregate)
+        return {cid: LineAggregate.merge_all(aggregates) for cid, aggregates in parts.items()}
+
+    def iter_summaries(
+        self,
+        customers: Dict[str, Customer],
+        shipping_zones: Dict[str, ShippingZone],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Iterator[OrderSummary]:
+        """
+        Résumés clients de la plage, dans l'ordre des IDs (comme iter_summaries).
+
+        Args:
+            customers: Dict des clients (les autres sont ignorés)
+            shipping_zones: Dict des zones de livraison
+            start_date: Date de début incluse (YYYY-MM-DD), optionnelle
+            end_date: Date de fin incluse (YYYY-MM-DD), optionnelle
+
+        Yields:
+            OrderSummary dans l'ordre des IDs client
+        """
+        merged = self.aggregates(start_date, end_date, set(customers))
+        for cid in sorted(merged):
+            yield self.processor.process_customer_aggregate(
+                customers[cid], merged[cid], shipping_zones
+            )
+
+
+def _as_list(signature) -> Optional[list]:
+    return None if signature is None else list(signature)
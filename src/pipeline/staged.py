@@ -0,0 +1,199 @@
+"""
+Staged Pipeline
+Mode pipeline: lecture des commandes, calcul par client et écriture du
+rapport tournent comme trois étapes asyncio concurrentes, reliées par des
+files bornées.
+
+- Lecture: orders.csv est parsé par lots dans un thread (asyncio.to_thread),
+  pendant que les références sont chargées dans un autre.
+- Calcul: chaque lot est enrichi dès son arrivée. Entrée quelconque: les
+  résumés sont produits dans l'ordre des IDs une fois la lecture finie
+  (comme iter_summaries); entrée triée par client: un résumé est produit
+  dès que le client change (comme iter_sorted_summaries).
+- Écriture: chaque section est formatée puis écrite (dans un thread) pendant
+  que le calcul continue.
+
+Les files bornées donnent la contre-pression: une étape rapide attend
+l'étape suivante au lieu d'accumuler. Le texte écrit est identique, octet
+pour octet, à TextReportFormatter.format suivi d'une fin de ligne.
+
+Le calcul reste soumis au GIL: le gain vient du recouvrement des lectures
+et écritures avec le calcul, pas d'un calcul parallèle.
+"""
+
+import asyncio
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from ..formatters.text_formatter import TextReportFormatter
+from ..models.customer import Customer
+from ..models.enriched_line import EnrichedLine
+from ..models.order import Order
+from ..models.product import Product
+from ..models.promotion import Promotion
+from ..models.shipping_zone import ShippingZone
+from ..services.order_processor import OrderProcessor, UnsortedInputError
+from ..services.report_queries import GrandTotals
+
+
+# (clients, produits, promotions, zones)
+References = Tuple[
+    Dict[str, Customer], Dict[str, Product], Dict[str, Promotion], Dict[str, ShippingZone]
+]
+
+# Fin de flux dans une file
+_DONE = None
+
+
+class StagedPipeline:
+    """
+    Pipeline asyncio lecture -> calcul -> écriture.
+
+    Attributes:
+        processor: Processeur de commandes
+        formatter: Formateur des sections
+        queue_size: Capacité de chaque file (lots de commandes, résumés)
+        batch_size: Commandes par lot lu
+        write_size: Sections regroupées par écriture
+    """
+
+    def __init__(
+        self,
+        processor: OrderProcessor | None = None,
+        formatter: TextReportFormatter | None = None,
+        queue_size: int = 16,
+        batch_size: int = 2048,
+        write_size: int = 256
+    ):
+        """
+        Args:
+            processor: Processeur de commandes (injection de dépendances)
+            formatter: Formateur du rapport
+            queue_size: Capacité des files entre étapes (contre-pression)
+            batch_size: Nombre de commandes par lot lu
+            write_size: Nombre de sections par écriture
+        """
+        self.processor = processor or OrderProcessor()
+        self.formatter = formatter or TextReportFormatter()
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.write_size = write_size
+
+    def run(
+        self,
+        orders: Iterable[Order],
+        load_references: Callable[[], References],
+        out: TextIO,
+        sorted_input: bool = False
+    ) -> GrandTotals:
+        """
+        Exécute le pipeline jusqu'au bout (boucle asyncio dédiée).
+
+        Args:
+            orders: Commandes au fil de la lecture (itérateur bloquant)
+            load_references: Chargement (bloquant) des clients et références
+            out: Sortie du rapport
+            sorted_input: Commandes groupées et triées par client
+
+        Returns:
+            Les totaux globaux du rapport écrit
+
+        Raises:
+            UnsortedInputError: Si sorted_input et qu'un client réapparaît hors ordre
+        """
+        return asyncio.run(self.run_async(orders, load_references, out, sorted_input))
+
+    async def run_async(
+        self,
+        orders: Iterable[Order],
+        load_references: Callable[[], References],
+        out: TextIO,
+        sorted_input: bool = False
+    ) -> GrandTotals:
+        """Comme run(), dans la boucle asyncio courante"""
+        batches: asyncio.Queue = asyncio.Queue(self.queue_size)
+        summaries: asyncio.Queue = asyncio.Queue(self.queue_size * self.write_size)
+        references = asyncio.ensure_future(asyncio.to_thread(load_references))
+        tasks = [
+            asyncio.ensure_future(self._read(orders, batches)),
+            asyncio.ensure_future(self._process(batches, references, summaries, sorted_input)),
+            asyncio.ensure_future(self._write(summaries, out)),
+        ]
+        try:
+            results = await asyncio.gather(references, *tasks)
+        except BaseException:
+            # Une étape a échoué: les autres attendraient indéfiniment sur leur file
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return results[-1]
+
+    # === Étapes ===
+
+    async def _read(self, orders: Iterable[Order], batches: asyncio.Queue) -> None:
+        """Lecture: lots de commandes parsés dans un thread"""
+        iterator = iter(orders)
+        while True:
+            batch = await asyncio.to_thread(_take, iterator, self.batch_size)
+            if not batch:
+                break
+            await batches.put(batch)
+        await batches.put(_DONE)
+
+    async def _process(
+        self,
+        batches: asyncio.Queue,
+        references: 'asyncio.Future[References]',
+        summaries: asyncio.Queue,
+        sorted_input: bool
+    ) -> None:
+        """Calcul: enrichissement au fil des lots, résumés dans l'ordre des IDs"""
+        customers, products, promotions, shipping_zones = await references
+        enrich_one = self.processor.enricher.enrich_one
+        process = self.processor.process_customer_lines
+        lines_by_customer: Dict[str, List[EnrichedLine]] = {}
+        current_id: Optional[str] = None
+
+        while (batch := await batches.get()) is not _DONE:
+            for order in batch:
+                customer_id = order.customer_id
+                if customer_id not in customers:
+                    continue  # Clients inconnus ignorés (comme iter_summaries)
+                if sorted_input and customer_id != current_id:
+                    # Même règle qu'iter_sorted_summaries: client suivant, ou erreur
+                    if current_id is not None:
+                        if customer_id < current_id:
+                            raise UnsortedInputError(customer_id, current_id)
+                        await summaries.put(process(
+                            customers[current_id], lines_by_customer.pop(current_id), shipping_zones
+                        ))
+                    current_id = customer_id
+                lines_by_customer.setdefault(customer_id, []).append(
+                    enrich_one(order, products, promotions)
+                )
+
+        for customer_id in sorted(lines_by_customer):
+            await summaries.put(
+                process(customers[customer_id], lines_by_customer[customer_id], shipping_zones)
+            )
+        await summaries.put(_DONE)
+
+    async def _write(self, summaries: asyncio.Queue, out: TextIO) -> GrandTotals:
+        """Écriture: sections formatées, écrites par paquets dans un thread"""
+        totals = GrandTotals()
+        chunk: List[str] = []
+        while (summary := await summaries.get()) is not _DONE:
+            chunk.append(self.formatter.format_section(summary) + '\n\n')
+            totals.add(summary)
+            if len(chunk) >= self.write_size:
+                await asyncio.to_thread(out.write, ''.join(chunk))
+                chunk = []
+        # Totaux: même ordre d'addition que TextReportFormatter.iter_lines
+        chunk.append(totals.format() + '\n')
+        await asyncio.to_thread(out.write, ''.join(chunk))
+        return totals
+
+
+def _take(iterator: Iterator[Order], count: int) -> List[Order]:
+    return list(islice(iterator, count))
@@ -0,0 +1,210 @@
+"""
+Statement Writer
+Écrit un relevé par client (ou N fichiers regroupant les relevés) au lieu
+du rapport monolithique, avec un manifeste des fichiers et des totaux.
+
+Les résumés sont consommés en flux: chaque section est formatée puis
+confiée à un pool d'écrivains (threads, écritures bufferisées). Le nombre
+d'écritures en attente est borné, le rapport complet n'existe jamais en
+mémoire.
+"""
+
+import json
+import re
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO, Deque, Dict, Iterable, List, Optional, Tuple
+
+from ..formatters.text_formatter import TextReportFormatter
+from ..models.order_summary import OrderSummary
+from ..services.report_queries import GrandTotals
+
+
+MANIFEST_NAME = 'manifest.json'
+
+# Taille du buffer d'écriture de chaque fichier
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Écritures en attente par écrivain avant de bloquer le producteur
+_MAX_PENDING_PER_WRITER = 64
+
+_UNSAFE_CHARS = re.compile(r'[^A-Za-z0-9_.-]')
+
+
+def statement_file_name(customer_id: str) -> str:
+    """
+    Nom du relevé d'un client.
+
+    Les caractères hors [A-Za-z0-9_.-] sont remplacés par '_'; l'ID est
+    alors suivi d'une empreinte courte de l'ID brut, pour que "A/B" et
+    "A_B" n'écrivent pas dans le même fichier.
+    """
+    safe = _UNSAFE_CHARS.sub('_', customer_id)
+    if safe == customer_id:
+        return f"{safe}.txt"
+    return f"{safe}-{zlib.crc32(customer_id.encode('utf-8')):08x}.txt"
+
+
+def bucket_of(customer_id: str, buckets: int) -> int:
+    """Fichier de regroupement d'un client (stable d'une exécution à l'autre)"""
+    return zlib.crc32(customer_id.encode('utf-8')) % buckets
+
+
+@dataclass(frozen=True)
+class StatementEntry:
+    """
+    Relevé d'un client dans le manifeste.
+
+    Attributes:
+        customer_id: Identifiant du client
+        file: Fichier contenant le relevé (relatif au répertoire de sortie)
+        offset: Position du relevé dans le fichier (octets)
+        length: Taille du relevé (octets)
+        total: Total du client (devise du client)
+        currency: Devise du client
+    """
+    customer_id: str
+    file: str
+    offset: int
+    length: int
+    total: float
+    currency: str
+
+
+@dataclass(frozen=True)
+class StatementManifest:
+    """
+    Manifeste d'une génération de relevés.
+
+    Attributes:
+        entries: Relevés, dans l'ordre des clients
+        totals: Totaux globaux (identiques au pied du rapport complet)
+        buckets: Nombre de fichiers de regroupement (None = un fichier par client)
+    """
+    entries: Tuple[StatementEntry, ...]
+    totals: GrandTotals
+    buckets: Optional[int] = None
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'customers': self.totals.customers,
+            'grand_total': self.totals.grand_total,
+            'total_tax': self.totals.total_tax,
+            'buckets': self.buckets,
+            'statements': [asdict(entry) for entry in self.entries],
+        }, ensure_ascii=False, indent=2)
+
+
+class StatementWriter:
+    """
+    Écrit les relevés clients dans un répertoire.
+
+    Chaque fichier est toujours écrit par le même écrivain (thread), ce qui
+    garde l'ordre des relevés dans un fichier de regroupement sans verrou.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        buckets: Optional[int] = None,
+        writers: int = 4,
+        formatter: TextReportFormatter | None = None
+    ):
+        """
+        Args:
+            output_dir: Répertoire de sortie (créé si besoin)
+            buckets: Regrouper les relevés dans N fichiers (None = un par client)
+            writers: Nombre de threads d'écriture
+            formatter: Formateur des sections
+        """
+        if buckets is not None and buckets < 1:
+            raise ValueError(f"Nombre de fichiers invalide: {buckets}")
+        self.output_dir = Path(output_dir)
+        self.buckets = buckets
+        self.writers = max(1, writers)
+        self.formatter = formatter or TextReportFormatter()
+
+    def write(self, summaries: Iterable[OrderSummary]) -> StatementManifest:
+        """
+        Écrit un relevé par résumé, puis le manifeste.
+
+        Args:
+            summaries: Résumés clients (liste ou générateur)
+
+        Returns:
+            Le manifeste (aussi écrit dans MANIFEST_NAME)
+
+        Raises:
+            ValueError: Si deux clients ont le même nom de relevé (casse
+                ignorée, pour les systèmes de fichiers insensibles à la casse)
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        totals = GrandTotals()
+        entries: List[StatementEntry] = []
+        bucket_ends: Dict[str, int] = {}  # Octets écrits par fichier de regroupement
+        pools = [ThreadPoolExecutor(max_workers=1) for _ in range(self.writers)]
+        pending: Deque[Future] = deque()
+        bucket_files: Dict[str, BinaryIO] = {}
+        owners: Dict[str, str] = {}  # Nom de relevé (casse ignorée) -> client
+
+        try:
+            for summary in summaries:
+                customer = summary.customer
+                section = self.formatter.format_section(summary).encode('utf-8')
+                if self.buckets is None:
+                    name = statement_file_name(customer.id)
+                    owner = owners.setdefault(name.casefold(), customer.id)
+                    if owner != customer.id:
+                        raise ValueError(
+                            f"Relevés de {owner!r} et {customer.id!r} dans le même fichier: {name}"
+                        )
+                    writer = len(entries) % self.writers
+                    offset = 0
+                    job = (_write_file, self.output_dir / name, section)
+                else:
+                    bucket = bucket_of(customer.id, self.buckets)
+                    name = f"bucket-{bucket:04d}.txt"
+                    writer = bucket % self.writers
+                    # Sections séparées par une ligne vide, comme dans le rapport
+                    end = bucket_ends.get(name)
+                    separator = b'' if end is None else b'\n\n'
+                    offset = 0 if end is None else end + len(separator)
+                    job = (_append_bucket, bucket_files, self.output_dir / name, separator + section)
+                    bucket_ends[name] = offset + len(section)
+
+                pending.append(pools[writer].submit(*job))
+                if len(pending) > _MAX_PENDING_PER_WRITER * self.writers:
+                    pending.popleft().result()
+
+                entries.append(StatementEntry(
+                    customer.id, name, offset, len(section), summary.total, customer.currency
+                ))
+                totals.add(summary)
+
+            while pending:
+                pending.popleft().result()
+        finally:
+            for pool in pools:
+                pool.shutdown(wait=True)
+            for f in bucket_files.values():
+                f.close()
+
+        manifest = StatementManifest(tuple(entries), totals, self.buckets)
+        (self.output_dir / MANIFEST_NAME).write_text(manifest.to_json() + '\n', encoding='utf-8')
+        return manifest
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    with open(path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(data)
+
+
+def _append_bucket(files: Dict[str, BinaryIO], path: Path, data: bytes) -> None:
+    # Appelé uniquement depuis l'écrivain propriétaire du fichier
+    f = files.get(path.name)
+    if f is None:
+        f = files[path.name] = open(path, 'wb', buffering=WRITE_BUFFER_SIZE)
+    f.write(data)
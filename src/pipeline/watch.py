@@ -0,0 +1,388 @@
+"""
+Report Watcher
+Mode watch: régénère le rapport quand les CSV du répertoire de données changent.
+
+Surveillance par polling (os.stat, aucune dépendance externe): tant que rien
+ne change, un cycle coûte 5 appels stat. Quand un fichier change, seuls les
+clients concernés sont retraités:
+- orders.csv complété en fin de fichier: seules les nouvelles lignes sont
+  parsées (en flux), seuls leurs clients sont recalculés
+- orders.csv réécrit (tronqué, modifié avant la fin): rechargement complet
+- orders.csv compressé (orders.csv.gz, .bz2, .xz, voir resolve_csv_path):
+  pas d'ajout incrémental possible, rechargement complet en flux à chaque
+  changement
+- fichier de référence réécrit: rechargement de ce fichier, puis recalcul
+  des clients qui référencent un élément modifié
+
+Produits, promotions et zones viennent d'un ReferenceStore (instantanés
+immuables), qui peut être partagé avec d'autres consommateurs du processus.
+"""
+
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from ..formatters.text_formatter import TextReportFormatter
+from ..models.enriched_line import EnrichedLine
+from ..models.order_summary import OrderSummary
+from ..repositories.compression import detect_compression, resolve_csv_path
+from ..repositories.csv_records import iter_records, row_to_dict
+from ..repositories.customer_repository import CustomerRepository
+from ..repositories.order_repository import OrderRepository
+from ..repositories.reference_store import (
+    FileSignature,
+    ReferenceSnapshot,
+    ReferenceStore,
+    file_signature
+)
+from ..services.order_processor import OrderProcessor
+
+
+# Octets de fin de la dernière lecture, relus pour détecter une réécriture
+_TAIL_CHECK_BYTES = 64
+
+# Taille des blocs lus pour repérer la fin du dernier enregistrement complet
+_SCAN_BLOCK_BYTES = 1 << 20
+
+
+def _changed_keys(old: Mapping[str, object], new: Mapping[str, object]) -> Set[str]:
+    """Clés ajoutées, supprimées ou dont la valeur a changé"""
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+class ReportWatcher:
+    """
+    Maintient le rapport à jour de manière incrémentale.
+
+    Attributes:
+        base_path: Répertoire des CSV
+        report: Dernier rapport généré
+    """
+
+    def __init__(
+        self,
+        base_path: Path | str,
+        processor: OrderProcessor | None = None,
+        formatter: TextReportFormatter | None = None,
+        references: ReferenceStore | None = None
+    ):
+        """
+        Args:
+            base_path: Répertoire des CSV surveillés
+            processor: Processeur de commandes (injection de dépendances)
+            formatter: Formateur du rapport
+            references: Données de référence partagées (créées au démarrage si None)
+        """
+        self.base_path = Path(base_path)
+        self.processor = processor or OrderProcessor()
+        self.formatter = formatter or TextReportFormatter()
+        self.order_repo = OrderRepository()
+        self.references = references
+        self.report = ''
+
+        self._signatures: Dict[str, FileSignature] = {}
+        self._customers = {}
+        self._refs = ReferenceSnapshot()
+        self._lines: Dict[str, List[EnrichedLine]] = {}
+        self._summaries: Dict[str, OrderSummary] = {}
+        self._orders_path: Optional[Path] = None
+        self._orders_fieldnames: List[str] = []
+        self._orders_offset = 0
+        self._orders_records = 0
+        self._orders_tail = b''
+
+    def _path(self, name: str) -> Path:
+        return self.base_path / name
+
+    def _orders_file(self) -> Path:
+        """orders.csv, ou sa version compressée s'il n'existe pas"""
+        return resolve_csv_path(self._path('orders.csv'))
+
+    # === Cycle de surveillance ===
+
+    def start(self) -> str:
+        """Chargement complet initial, retourne le rapport"""
+        if self.references is None:
+            self.references = ReferenceStore(self.base_path)
+        self._refs = self.references.snapshot
+        self._reload_customers()
+        self._reload_orders()
+        self._recompute(set(self._lines) | set(self._customers))
+        return self.report
+
+    def poll_once(self) -> bool:
+        """
+        Vérifie les fichiers et met à jour le rapport si nécessaire.
+
+        Returns:
+            True si le rapport a été régénéré
+        """
+        paths = {'customers.csv': self._path('customers.csv'), 'orders.csv': self._orders_file()}
+        changed = [
+            name for name, path in paths.items()
+            if file_signature(path) != self._signatures.get(name)
+        ]
+        refs = self.references.refresh()
+        if not changed and refs is self._refs:
+            return False
+
+        affected: Set[str] = set()
+        if refs is not self._refs:
+            affected |= self._apply_references(refs)
+        for name in changed:
+            if name == 'orders.csv':
+                affected |= self._refresh_orders()
+            else:
+                affected |= self._reload_customers()
+
+        if affected:
+            self._recompute(affected)
+        return bool(affected)
+
+    def run(
+        self,
+        on_report: Callable[[str], None],
+        interval: float = 1.0,
+        max_cycles: Optional[int] = None
+    ) -> str:
+        """
+        Boucle de surveillance (bloquante).
+
+        Args:
+            on_report: Appelé avec chaque nouveau rapport (et le rapport initial)
+            interval: Secondes entre deux vérifications
+            max_cycles: Nombre de vérifications avant arrêt (None = infini)
+
+        Returns:
+            Le dernier rapport
+        """
+        on_report(self.start())
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            time.sleep(interval)
+            cycles += 1
+            if self.poll_once():
+                on_report(self.report)
+        return self.report
+
+    # === Fichiers de référence ===
+
+    def _reload_customers(self) -> Set[str]:
+        """Recharge customers.csv, retourne les clients impactés"""
+        path = self._path('customers.csv')
+        self._signatures['customers.csv'] = file_signature(path)
+        new = CustomerRepository().load_all(path)
+        affected = _changed_keys(self._customers, new)
+        self._customers = new
+        return affected
+
+    def _apply_references(self, refs: ReferenceSnapshot) -> Set[str]:
+        """
+        Passe à un nouvel instantané de référence, retourne les clients impactés.
+
+        Seuls les fichiers rechargés depuis l'instantané courant sont comparés.
+        """
+        old, self._refs = self._refs, refs
+        reloaded = {
+            name for name, version in refs.file_versions.items()
+            if old.file_versions.get(name) != version
+        }
+        affected: Set[str] = set()
+        if 'shipping_zones.csv' in reloaded:
+            zones = _changed_keys(old.shipping_zones, refs.shipping_zones)
+            affected |= {cid for cid, c in self._customers.items() if c.shipping_zone in zones}
+        changed_products = (
+            _changed_keys(old.products, refs.products) if 'products.csv' in reloaded else set()
+        )
+        changed_promotions = (
+            _changed_keys(old.promotions, refs.promotions) if 'promotions.csv' in reloaded else set()
+        )
+        if changed_products or changed_promotions:
+            affected |= self._reenrich(
+                lambda line: line.order.product_id in changed_products
+                or line.order.promo_code in changed_promotions
+            )
+        return affected
+
+    def _reenrich(self, predicate: Callable[[EnrichedLine], bool]) -> Set[str]:
+        """Ré-enrichit les clients dont une ligne vérifie le prédicat"""
+        affected = {
+            cid for cid, lines in self._lines.items()
+            if any(predicate(line) for line in lines)
+        }
+        enricher = self.processor.enricher
+        for cid in affected:
+            self._lines[cid] = enricher.enrich(
+                (line.order for line in self._lines[cid]), self._refs.products, self._refs.promotions
+            )
+        return affected
+
+    # === orders.csv ===
+
+    def _reload_orders(self) -> Set[str]:
+        """Rechargement complet de orders.csv"""
+        path = self._orders_file()
+        previous = set(self._lines)
+        self._lines = {}
+        self._orders_path = path
+        self._orders_offset = 0
+        self._orders_records = 0
+        self._orders_tail = b''
+        self._orders_fieldnames = []
+        self._signatures['orders.csv'] = None
+        if path.exists() and detect_compression(path) is not None:
+            return previous | self._read_compressed(path)
+        return previous | self._read_appended(path)
+
+    def _refresh_orders(self) -> Set[str]:
+        """Lecture incrémentale si orders.csv (non compressé) a seulement grandi"""
+        path = self._orders_file()
+        signature = file_signature(path)
+        if (
+            path != self._orders_path
+            or signature is None
+            or detect_compression(path) is not None
+            or signature[0] < self._orders_offset
+            or not self._tail_intact(path)
+        ):
+            return self._reload_orders()
+        return self._read_appended(path)
+
+    def _tail_intact(self, path: Path) -> bool:
+        """Vérifie que les derniers octets déjà lus n'ont pas changé"""
+        if not self._orders_tail:
+            return self._orders_offset == 0
+        with open(path, 'rb') as f:
+            f.seek(self._orders_offset - len(self._orders_tail))
+            return f.read(len(self._orders_tail)) == self._orders_tail
+
+    def _read_appended(self, path: Path) -> Set[str]:
+        """
+        Parse en flux les enregistrements complets ajoutés depuis la dernière lecture.
+
+        Un enregistrement en cours d'écriture (sans fin de ligne) est laissé
+        pour le cycle suivant.
+        """
+        signature = file_signature(path)
+        self._signatures['orders.csv'] = signature
+        if signature is None:
+            return set()
+
+        with open(path, 'rb') as f:
+            end = _complete_end(f, self._orders_offset, signature[0])
+            if end == self._orders_offset:
+                return set()
+
+            f.seek(self._orders_offset)
+            records = iter_records(f, self._orders_offset)
+            if not self._orders_fieldnames:
+                header = next(records, None)
+                self._orders_fieldnames = header[2] if header else []
+            try:
+                orders = self.order_repo.repo.load_rows(self._numbered_rows(records, end), path)
+            except ValueError:
+                orders = []  # Toutes les nouvelles lignes sont invalides
+
+            f.seek(max(0, end - _TAIL_CHECK_BYTES))
+            self._orders_tail = f.read(end - f.tell())
+        self._orders_offset = end
+
+        return self._add_lines(
+            self.processor.enricher.enrich(orders, self._refs.products, self._refs.promotions)
+        )
+
+    def _numbered_rows(
+        self,
+        records: Iterator[Tuple[int, int, List[str]]],
+        end: int
+    ) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """Lignes numérotées des enregistrements situés avant `end`"""
+        for offset, _, fields in records:
+            if offset >= end:
+                break
+            if not fields:
+                continue
+            self._orders_records += 1
+            yield self._orders_records + 1, row_to_dict(self._orders_fieldnames, fields)
+
+    def _read_compressed(self, path: Path) -> Set[str]:
+        """orders.csv compressé: lecture complète en flux (OrderRepository.iter_all)"""
+        self._signatures['orders.csv'] = file_signature(path)
+        try:
+            lines = self.processor.enricher.enrich(
+                self.order_repo.iter_all(path), self._refs.products, self._refs.promotions
+            )
+        except ValueError:
+            lines = []  # Aucune ligne valide
+        return self._add_lines(lines)
+
+    def _add_lines(self, lines: Iterable[EnrichedLine]) -> Set[str]:
+        """Ajoute des lignes enrichies, retourne leurs clients"""
+        affected = set()
+        for line in lines:
+            self._lines.setdefault(line.order.customer_id, []).append(line)
+            affected.add(line.order.customer_id)
+        return affected
+
+    # === Recalcul ===
+
+    def _recompute(self, customer_ids: Iterable[str]) -> None:
+        """Recalcule les résumés des clients impactés puis le rapport"""
+        for cid in customer_ids:
+            customer = self._customers.get(cid)
+            lines = self._lines.get(cid)
+            if customer is None or not lines:
+                self._summaries.pop(cid, None)
+                continue
+            self._summaries[cid] = self.processor.process_customer_lines(
+                customer, lines, self._refs.shipping_zones
+            )
+
+        self.report = self.formatter.format(
+            self._summaries[cid] for cid in sorted(self._summaries)
+        )
+
+
+def _complete_end(f: BinaryIO, start: int, size: int) -> int:
+    """
+    Fin (octets) du dernier enregistrement complet de [start, size), lue par blocs.
+
+    Returns:
+        La position suivant sa fin de ligne, ou `start` si aucun n'est complet
+    """
+    f.seek(start)
+    end = position = start
+    quotes = 0  # Guillemets rencontrés depuis start
+    while position < size:
+        block = f.read(min(_SCAN_BLOCK_BYTES, size - position))
+        if not block:
+            break
+        complete = _complete_length(block, quotes)
+        if complete:
+            end = position + complete
+        quotes += block.count(b'"')
+        position += len(block)
+    return end
+
+
+def _complete_length(block: bytes, quotes_before: int = 0) -> int:
+    """
+    Longueur du préfixe de `block` formé d'enregistrements complets.
+
+    Coupe après la dernière fin de ligne située hors guillemets.
+
+    Args:
+        block: Octets lus à partir d'un début d'enregistrement (ou à la suite
+            de blocs précédents)
+        quotes_before: Guillemets des blocs précédents
+    """
+    quotes = quotes_before + block.count(b'"')
+    end = len(block)
+    while True:
+        newline = block.rfind(b'\n', 0, end)
+        if newline == -1:
+            return 0
+        quotes -= block.count(b'"', newline + 1, end)
+        if quotes % 2 == 0:
+            return newline + 1
+        end = newline
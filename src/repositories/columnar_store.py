@@ -0,0 +1,392 @@
+"""
+Columnar Store
+Format binaire colonnaire des données du rapport, lu par memory-mapping.
+
+Évite de reparser le texte CSV à chaque exécution:
+- colonnes numériques à largeur fixe: qty, unit_price (float64), clé de
+  date (YYYYMMDD, pour filtrer une plage sans décoder les dates); les
+  entiers sur la plus petite largeur suffisante
+- identifiants client/produit, codes promo, dates et heures encodés par
+  dictionnaire (codes entiers, valeurs distinctes dans l'en-tête)
+- identifiants de commande: offsets int64 + blob UTF-8
+- CSV de référence (quelques lignes) embarqués tels quels et reparsés par
+  leurs repositories (même validation)
+
+Seules les commandes valides sont converties (mêmes règles que
+OrderRepository). Le fichier est reconstruit si un CSV source change
+(taille ou mtime), comme l'index de dates.
+
+Structure du fichier:
+    MAGIC | longueur de l'en-tête (int64) | en-tête JSON | colonnes alignées sur 8 octets
+"""
+
+import csv
+import io
+import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .compression import open_csv_text, resolve_csv_path
+from .customer_repository import CustomerRepository
+from .order_repository import OrderRepository
+from .product_repository import ProductRepository
+from .promotion_repository import PromotionRepository
+from .shipping_zone_repository import ShippingZoneRepository
+from ..models.order import Order
+
+
+COLUMNAR_SUFFIX = '.colbin'
+_MAGIC = b'ORDCOL1\n'
+_VERSION = 2
+_ALIGN = 8
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Colonnes encodées par dictionnaire (attribut de Order)
+DICTIONARY_COLUMNS = ('customer_id', 'product_id', 'date', 'promo_code', 'time')
+
+# Colonnes numériques (entiers stockés sur la plus petite largeur suffisante)
+NUMERIC_COLUMNS = (
+    'qty',
+    'unit_price',  # float64
+    'date_key',    # YYYYMMDD, -1 si date absente ou hors format YYYY-MM-DD
+)
+
+# Largeurs entières candidates, de la plus étroite à la plus large
+_INT_TYPECODES = ('b', 'h', 'i', 'q')
+
+# CSV de référence embarqués: table -> fichier source
+REFERENCE_FILES = {
+    'customers': 'customers.csv',
+    'products': 'products.csv',
+    'promotions': 'promotions.csv',
+    'shipping_zones': 'shipping_zones.csv',
+}
+
+
+def _date_key(value: str) -> int:
+    """
+    Clé entière YYYYMMDD d'une date YYYY-MM-DD, -1 si absente ou hors format.
+
+    Même ordre que la comparaison des chaînes faite par l'index de dates
+    (une date au bon format mais inexistante garde sa place).
+    """
+    if not value or not _ISO_DATE.match(value):
+        return -1
+    return int(value.replace('-', ''))
+
+
+def _narrowest(values: List[int]) -> array:
+    """Tableau d'entiers sur la plus petite largeur signée qui les contient"""
+    low, high = (min(values), max(values)) if values else (0, 0)
+    for typecode in _INT_TYPECODES:
+        bits = array(typecode).itemsize * 8 - 1
+        if -(1 << bits) <= low and high < (1 << bits):
+            return array(typecode, values)
+    raise OverflowError(f"Entiers hors de la plage int64: {low}..{high}")
+
+
+def _source_stats(data_dir: Path) -> Dict[str, List[int]]:
+    """(taille, mtime) des CSV sources présents, par nom de fichier résolu"""
+    stats = {}
+    for name in ('orders.csv',) + tuple(REFERENCE_FILES.values()):
+        path = resolve_csv_path(data_dir / name)
+        if path.exists():
+            stat = path.stat()
+            stats[path.name] = [stat.st_size, stat.st_mtime_ns]
+    return stats
+
+
+def _pad(out: io.BufferedWriter) -> None:
+    out.write(b'\0' * (-out.tell() % _ALIGN))
+
+
+class ColumnarStore:
+    """
+    Lecteur d'un fichier colonnaire (memory-mappé, lecture seule).
+
+    Les colonnes sont exposées sans copie (memoryview sur le mapping);
+    les objets Order ne sont construits qu'à la demande.
+
+    Attributes:
+        path: Fichier colonnaire
+        sources: (taille, mtime) des CSV au moment de la conversion
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Args:
+            path: Fichier colonnaire à ouvrir
+
+        Raises:
+            ValueError: Si le fichier n'est pas au format attendu
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: Dict[str, memoryview] = {}
+
+        if self._mmap[:len(_MAGIC)] != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Fichier colonnaire invalide: {self.path}")
+        header_start = len(_MAGIC) + 8
+        header_length = int.from_bytes(self._mmap[len(_MAGIC):header_start], 'little')
+        header = json.loads(self._mmap[header_start:header_start + header_length])
+        if header['version'] != _VERSION or header['byteorder'] != sys.byteorder:
+            self._mmap.close()
+            raise ValueError(f"Fichier colonnaire incompatible: {self.path}")
+
+        self._data_start = header_start + header_length + (-(header_start + header_length) % _ALIGN)
+        self._rows: int = header['rows']
+        self._columns: Dict[str, List] = header['columns']
+        self._dictionaries = {name: tuple(values) for name, values in header['dictionaries'].items()}
+        self._references: Dict[str, List[int]] = header['references']
+        self.sources: Dict[str, List[int]] = header['sources']
+
+        self._ids = self.column('id_offsets')
+        self._id_blob = self.column('id_blob')
+
+    # === Conversion ===
+
+    @staticmethod
+    def path_for(data_dir: Path | str) -> Path:
+        """Fichier colonnaire par défaut d'un répertoire de données"""
+        return Path(data_dir) / f"orders{COLUMNAR_SUFFIX}"
+
+    @classmethod
+    def write(cls, data_dir: Path | str, target: Path | str | None = None) -> Path:
+        """
+        Convertit les CSV d'un répertoire (compressés ou non) en fichier colonnaire.
+
+        Args:
+            data_dir: Répertoire des CSV
+            target: Fichier à écrire (défaut: path_for(data_dir))
+
+        Returns:
+            Le fichier écrit
+        """
+        data_dir = Path(data_dir)
+        target = Path(target) if target else cls.path_for(data_dir)
+        sources = _source_stats(data_dir)
+        orders = OrderRepository().load_all(data_dir / 'orders.csv')
+
+        codes: Dict[str, Dict[str, int]] = {name: {} for name in DICTIONARY_COLUMNS}
+        values: Dict[str, list] = {name: [] for name in DICTIONARY_COLUMNS + NUMERIC_COLUMNS}
+        id_offsets = array('q', [0])
+        id_blob = bytearray()
+        for order in orders:
+            for name in DICTIONARY_COLUMNS:
+                value = getattr(order, name)
+                values[name].append(codes[name].setdefault(value, len(codes[name])))
+            values['qty'].append(order.qty)
+            values['unit_price'].append(order.unit_price)
+            values['date_key'].append(_date_key(order.date))
+            id_blob += order.id.encode('utf-8')
+            id_offsets.append(len(id_blob))
+
+        columns = {
+            name: array('d', column) if name == 'unit_price' else _narrowest(column)
+            for name, column in values.items()
+        }
+        del values
+        columns['id_offsets'] = id_offsets
+        columns['id_blob'] = array('B', id_blob)
+
+        references = {}
+        for table, file_name in REFERENCE_FILES.items():
+            path = resolve_csv_path(data_dir / file_name)
+            if path.exists():
+                with open_csv_text(path) as f:
+                    references[table] = f.read().encode('utf-8')
+
+        # Offsets relatifs au début des données (aligné sur 8 octets)
+        layout, position = {}, 0
+        for name, column in columns.items():
+            layout[name] = [position, column.typecode, len(column)]
+            position += len(column) * column.itemsize
+            position += -position % _ALIGN
+        reference_layout = {}
+        for table, blob in references.items():
+            reference_layout[table] = [position, len(blob)]
+            position += len(blob) + (-len(blob) % _ALIGN)
+
+        header = json.dumps({
+            'version': _VERSION,
+            'byteorder': sys.byteorder,
+            'rows': len(orders),
+            'sources': sources,
+            'dictionaries': {name: list(mapping) for name, mapping in codes.items()},
+            'columns': layout,
+            'references': reference_layout,
+        }, ensure_ascii=False).encode('utf-8')
+
+        tmp_path = target.with_name(target.name + '.tmp')
+        with open(tmp_path, 'wb') as out:
+            out.write(_MAGIC)
+            out.write(len(header).to_bytes(8, 'little'))
+            out.write(header)
+            _pad(out)
+            for column in columns.values():
+                column.tofile(out)
+                _pad(out)
+            for blob in references.values():
+                out.write(blob)
+                _pad(out)
+        os.replace(tmp_path, target)
+        return target
+
+    @classmethod
+    def load_or_build(
+        cls,
+        data_dir: Path | str,
+        target: Path | str | None = None
+    ) -> 'ColumnarStore':
+        """
+        Ouvre le fichier colonnaire, en le (re)convertissant si nécessaire.
+
+        Args:
+            data_dir: Répertoire des CSV sources
+            target: Fichier colonnaire (défaut: path_for(data_dir))
+        """
+        data_dir = Path(data_dir)
+        target = Path(target) if target else cls.path_for(data_dir)
+        if target.exists():
+            try:
+                store = cls(target)
+            except (ValueError, KeyError, json.JSONDecodeError):
+                store = None
+            if store is not None and store.sources == _source_stats(data_dir):
+                return store
+            if store is not None:
+                store.close()
+        return cls(cls.write(data_dir, target))
+
+    # === Accès colonnes ===
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def column(self, name: str) -> memoryview:
+        """
+        Colonne brute, sans copie.
+
+        Args:
+            name: Colonne numérique (NUMERIC_COLUMNS), codes d'une colonne
+                dictionnaire (DICTIONARY_COLUMNS), 'id_offsets' ou 'id_blob'
+
+        Returns:
+            memoryview typée sur le fichier mappé
+        """
+        view = self._views.get(name)
+        if view is None:
+            offset, typecode, count = self._columns[name]
+            start = self._data_start + offset
+            size = count * array(typecode).itemsize
+            view = self._views[name] = memoryview(self._mmap)[start:start + size].cast(typecode)
+        return view
+
+    def dictionary(self, name: str) -> Tuple[str, ...]:
+        """Valeurs distinctes d'une colonne dictionnaire (indexées par code)"""
+        return self._dictionaries[name]
+
+    # === Matérialisation ===
+
+    def order(self, index: int) -> Order:
+        """Construit la commande d'indice `index`"""
+        return next(self._iter_orders(range(index, index + 1)))
+
+    def iter_orders(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        customer_ids: Optional[Iterable[str]] = None
+    ) -> Iterator[Order]:
+        """
+        Construit les commandes à la demande, dans l'ordre du fichier source.
+
+        Les filtres portent sur les colonnes (clé de date, codes client):
+        les commandes écartées ne sont jamais matérialisées. Même sélection
+        de dates que l'index de dates (YYYY-MM-DD uniquement, bornes incluses).
+
+        Args:
+            start_date: Date de début incluse (YYYY-MM-DD), optionnelle
+            end_date: Date de fin incluse (YYYY-MM-DD), optionnelle
+            customer_ids: Clients à garder (tous si None)
+
+        Raises:
+            ValueError: Si une borne n'est pas au format YYYY-MM-DD
+        """
+        selected: Iterable[int] = range(self._rows)
+        if start_date is not None or end_date is not None:
+            # Clé -1 (date absente ou hors format) toujours écartée: low >= 0
+            low = 0 if start_date is None else _date_key(start_date)
+            high = sys.maxsize if end_date is None else _date_key(end_date)
+            if low < 0 or high < 0:
+                raise ValueError(
+                    f"Date invalide (attendu YYYY-MM-DD): {start_date if low < 0 else end_date}"
+                )
+            keys = self.column('date_key')
+            selected = (i for i in selected if low <= keys[i] <= high)
+        if customer_ids is not None:
+            wanted = set(customer_ids)
+            allowed = {code for code, value in enumerate(self.dictionary('customer_id')) if value in wanted}
+            codes = self.column('customer_id')
+            selected = (i for i in selected if codes[i] in allowed)
+        return self._iter_orders(selected)
+
+    def _iter_orders(self, indexes: Iterable[int]) -> Iterator[Order]:
+        ids, blob = self._ids, self._id_blob
+        qty, price = self.column('qty'), self.column('unit_price')
+        coded = [(name, self.column(name), self.dictionary(name)) for name in DICTIONARY_COLUMNS]
+        for i in indexes:
+            values = {name: values[codes[i]] for name, codes, values in coded}
+            yield Order(
+                id=bytes(blob[ids[i]:ids[i + 1]]).decode('utf-8'),
+                qty=qty[i],
+                unit_price=price[i],
+                **values
+            )
+
+    def load_references(self) -> Tuple[Dict, Dict, Dict, Dict]:
+        """
+        Reparse les CSV de référence embarqués (mêmes repositories, même validation).
+
+        Returns:
+            Tuple (customers, products, promotions, shipping_zones)
+        """
+        tables = []
+        for table, repository, key in (
+            ('customers', CustomerRepository(), 'id'),
+            ('products', ProductRepository(), 'id'),
+            ('promotions', PromotionRepository(), 'code'),
+            ('shipping_zones', ShippingZoneRepository(), 'zone'),
+        ):
+            if table not in self._references:
+                tables.append({})  # Fichier absent à la conversion (promotions)
+                continue
+            offset, length = self._references[table]
+            start = self._data_start + offset
+            text = self._mmap[start:start + length].decode('utf-8')
+            rows = enumerate(csv.DictReader(io.StringIO(text, newline='')), start=2)
+            items = repository.repo.load_rows(rows, f"{self.path}:{REFERENCE_FILES[table]}")
+            tables.append({getattr(item, key): item for item in items})
+        return tuple(tables)
+
+    # === Cycle de vie ===
+
+    def close(self) -> None:
+        """Libère les vues puis le mapping"""
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        self._mmap.close()
+
+    def __enter__(self) -> 'ColumnarStore':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,105 @@
+"""
+Compression
+Lecture transparente des CSV compressés (gzip, bz2, xz).
+
+Le fichier est décompressé au fil du parsing, jamais écrit sur disque.
+Les lectures sur le fichier compressé se font par gros blocs: moins
+d'appels système sur un stockage lent.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+from pathlib import Path
+from typing import Optional, TextIO
+
+
+# Taille des lectures dans le fichier compressé et dans le flux décompressé
+READ_BUFFER_SIZE = 1 << 20
+
+# Signatures (magic bytes) par format
+_MAGIC = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+)
+
+_SUFFIXES = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}
+
+_OPENERS = {'gzip': gzip.open, 'bz2': bz2.open, 'xz': lzma.open}
+
+
+def detect_compression(path: Path | str) -> Optional[str]:
+    """
+    Détecte le format de compression d'un fichier.
+
+    Les magic bytes priment; l'extension sert pour un fichier trop court
+    pour porter une signature.
+
+    Returns:
+        'gzip', 'bz2', 'xz', ou None pour un fichier non compressé
+    """
+    path = Path(path)
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    for magic, name in _MAGIC:
+        if head.startswith(magic):
+            return name
+    if len(head) < 6:
+        return _SUFFIXES.get(path.suffix.lower())
+    return None
+
+
+def resolve_csv_path(path: Path | str) -> Path:
+    """
+    Retourne le fichier à lire pour `path`.
+
+    Si `path` n'existe pas mais une version compressée existe à côté
+    (orders.csv.gz, .bz2, .xz), c'est elle qui est retournée. Sinon `path`
+    est retourné tel quel (l'appelant signale l'absence du fichier).
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+    for suffix in _SUFFIXES:
+        candidate = path.with_name(path.name + suffix)
+        if candidate.exists():
+            return candidate
+    return path
+
+
+def open_csv_text(path: Path | str) -> TextIO:
+    """
+    Ouvre un CSV (compressé ou non) en texte UTF-8, prêt pour le module csv.
+
+    Returns:
+        Flux texte à fermer par l'appelant (utilisable avec `with`)
+    """
+    compression = detect_compression(path)
+    if compression is None:
+        return open(path, 'r', encoding='utf-8', newline='')
+
+    raw = open(path, 'rb', buffering=READ_BUFFER_SIZE)
+    try:
+        decompressed = _OPENERS[compression](raw, 'rb')
+        buffered = io.BufferedReader(decompressed, buffer_size=READ_BUFFER_SIZE)
+    except Exception:
+        raw.close()
+        raise
+    # Fermer le flux texte ferme toute la chaîne, y compris `raw`
+    return _ClosingTextWrapper(buffered, raw)
+
+
+class _ClosingTextWrapper(io.TextIOWrapper):
+    """TextIOWrapper qui ferme aussi le fichier compressé sous-jacent"""
+
+    def __init__(self, buffer: io.BufferedReader, raw: io.BufferedReader):
+        super().__init__(buffer, encoding='utf-8', newline='')
+        self._raw_file = raw
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._raw_file.close()
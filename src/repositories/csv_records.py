@@ -0,0 +1,128 @@
+"""
+CSV Records
+Lecture bas niveau d'un CSV avec les positions (octets) de chaque enregistrement.
+
+Sert aux accès indexés (index par date) : on réutilise le parseur csv de la
+stdlib pour respecter exactement ses règles (champs entre guillemets,
+retours à la ligne dans un champ), tout en mesurant les lignes consommées.
+"""
+
+import csv
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def iter_records(
+    f: BinaryIO,
+    start: int = 0
+) -> Iterator[Tuple[int, int, List[str]]]:
+    """
+    Parcourt les enregistrements CSV d'un fichier binaire à partir de `start`.
+
+    Args:
+        f: Fichier ouvert en mode binaire, positionné sur `start`
+        start: Position (octets) du premier enregistrement à lire
+
+    Yields:
+        Tuple (offset, longueur en octets, champs) pour chaque enregistrement
+    """
+    position = start
+
+    def lines() -> Iterator[str]:
+        nonlocal position
+        for raw in f:
+            position += len(raw)
+            yield raw.decode('utf-8')
+
+    record_start = start
+    for fields in csv.reader(lines()):
+        yield record_start, position - record_start, fields
+        record_start = position
+
+
+def row_to_dict(
+    fieldnames: Sequence[str],
+    fields: List[str]
+) -> Dict[Optional[str], object]:
+    """
+    Construit un dict de ligne avec la même sémantique que csv.DictReader.
+
+    - Colonnes manquantes -> None
+    - Champs en trop -> liste sous la clé None
+    """
+    row: Dict[Optional[str], object] = dict(zip(fieldnames, fields))
+    if len(fields) > len(fieldnames):
+        row[None] = fields[len(fieldnames):]
+    elif len(fields) < len(fieldnames):
+        for key in fieldnames[len(fields):]:
+            row[key] = None
+    return row
+
+
+def find_record_boundaries(
+    f: BinaryIO,
+    data_start: int,
+    size: int,
+    chunk_count: int,
+    block_size: int = 1 << 22
+) -> List[int]:
+    """
+    Découpe [data_start, size) en plages alignées sur des fins d'enregistrement.
+
+    Une fin de ligne n'est une fin d'enregistrement que si le nombre de
+    guillemets depuis data_start est pair (champs entre guillemets RFC 4180:
+    un retour à la ligne dans un champ quoté ne coupe pas l'enregistrement).
+
+    Args:
+        f: Fichier ouvert en mode binaire
+        data_start: Offset du premier enregistrement de données
+        size: Taille du fichier
+        chunk_count: Nombre de plages souhaité
+        block_size: Taille des lectures
+
+    Returns:
+        Offsets croissants [data_start, ..., size] délimitant les plages
+    """
+    targets = [
+        data_start + (size - data_start) * k // chunk_count
+        for k in range(1, chunk_count)
+    ]
+    boundaries = [data_start]
+    quotes = 0  # Guillemets rencontrés depuis data_start
+    position = data_start
+    f.seek(data_start)
+
+    ti = 0
+    while ti < len(targets):
+        block = f.read(block_size)
+        if not block:
+            break
+
+        while ti < len(targets):
+            search_from = max(targets[ti], boundaries[-1], position) - position
+            if search_from >= len(block):
+                break
+
+            # Chercher la première fin de ligne hors guillemets après la cible
+            parity = quotes + block.count(b'"', 0, search_from)
+            scanned = search_from
+            newline = block.find(b'\n', search_from)
+            while newline != -1:
+                parity += block.count(b'"', scanned, newline)
+                scanned = newline
+                if parity % 2 == 0:
+                    break
+                newline = block.find(b'\n', newline + 1)
+
+            if newline == -1:
+                # Pas de frontière dans ce bloc: reprendre au bloc suivant
+                targets[ti] = position + len(block)
+                break
+
+            boundaries.append(position + newline + 1)
+            ti += 1
+
+        quotes += block.count(b'"')
+        position += len(block)
+
+    boundaries = [b for b in boundaries if b < size] + [size]
+    return sorted(set(boundaries))
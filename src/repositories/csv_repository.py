@@ -3,13 +3,72 @@ Generic CSV Repository
 Résout le problème des 4 méthodes différentes de parsing dans le legacy.
 """
 
+import contextlib
 import csv
+import io
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TypeVar, Generic, Callable, List, Dict
+from typing import (
+    TypeVar, Generic, Callable, Iterable, Iterator, List, Dict, FrozenSet, Hashable, Optional,
+    Tuple
+)
+
+from .compression import detect_compression, open_csv_text, resolve_csv_path
+from .csv_records import find_record_boundaries, iter_records, row_to_dict
+from .parse_cache import PARSE_CACHE, ParseCache, estimate_bytes
+from .rejection_stats import (
+    DEFAULT_MAX_SAMPLES,
+    REJECT_FILE_HEADER,
+    LoadStats,
+    RejectionCollector
+)
 
 
 T = TypeVar('T')
 
+# En dessous de cette taille par worker, le coût des processus dépasse le gain
+PARALLEL_MIN_CHUNK_BYTES = 1 << 20
+
+RowFilter = Callable[[Dict[str, str]], bool]
+
+
+@dataclass(frozen=True)
+class ColumnFilter:
+    """
+    Filtre de lignes brutes: garde celles dont la colonne vaut une des valeurs.
+    
+    Appliqué avant le mapper (semi-jointure): les lignes écartées ne sont
+    ni converties ni comptées comme rejetées. Picklable, donc utilisable
+    par le chargement parallèle.
+    
+    Attributes:
+        column: Colonne testée
+        values: Valeurs acceptées
+    """
+    column: str
+    values: FrozenSet[str]
+    
+    def __call__(self, row: Dict[str, str]) -> bool:
+        return row.get(self.column) in self.values
+    
+    @classmethod
+    def of(cls, column: str, values: Optional[Iterable[str]]) -> Optional['ColumnFilter']:
+        """Construit le filtre, ou None si aucune restriction demandée"""
+        if values is None:
+            return None
+        return cls(column, frozenset(values))
+
+
+def _filtered(
+    numbered_rows: Iterable[Tuple[int, Dict[str, str]]],
+    row_filter: Optional[RowFilter]
+) -> Iterable[Tuple[int, Dict[str, str]]]:
+    """Applique un éventuel filtre aux lignes numérotées"""
+    if row_filter is None:
+        return numbered_rows
+    return ((line_num, row) for line_num, row in numbered_rows if row_filter(row))
+
 
 class CSVRepository(Generic[T]):
     """
@@ -23,23 +82,73 @@ class CSVRepository(Generic[T]):
     
     Utilise maintenant une seule méthode: csv.DictReader
     
+    Les chargements complets (load, load_parallel, load_as_dict) passent
+    par le cache du processus (voir parse_cache): un fichier inchangé
+    n'est parsé qu'une fois. Le mapper ne doit dépendre que de la ligne
+    et de sa configuration, déclarée par cache_variant.
+    Pas de cache avec un fichier de rejets (il doit être réécrit) ni avec
+    un filtre autre que ColumnFilter (pas de clé stable).
+    
     Attributes:
         mapper: Fonction qui transforme un dict (ligne CSV) en objet typé
+        reject_path: Fichier annexe recevant toutes les lignes rejetées (optionnel)
+        max_samples: Nombre de rejets détaillés conservés en mémoire
+        cache: Cache des fichiers parsés (None: désactivé)
+        cache_variant: Configuration du mapper qui change ses résultats (clé du cache)
+        adopt_chunk: Reprise, dans ce processus, des objets d'une plage parsée par un worker
+        last_stats: Statistiques du dernier chargement (None avant le premier)
     """
     
-    def __init__(self, mapper: Callable[[Dict[str, str]], T]):
+    def __init__(
+        self,
+        mapper: Callable[[Dict[str, str]], T],
+        reject_path: Path | str | None = None,
+        max_samples: int = DEFAULT_MAX_SAMPLES,
+        cache: Optional[ParseCache] = PARSE_CACHE,
+        cache_variant: Hashable = None,
+        adopt_chunk: Optional[Callable[[List[T]], List[T]]] = None
+    ):
         """
         Args:
             mapper: Fonction qui prend un dict et retourne une instance de T
+            reject_path: Fichier CSV où écrire tous les rejets (réécrit à chaque chargement)
+            max_samples: Taille de l'échantillon de rejets conservé
+            cache: Cache des fichiers parsés (par défaut celui du processus)
+            cache_variant: Options du mapper (deux mappers de même variante
+                produisent des objets égaux pour une même ligne)
+            adopt_chunk: Appliquée par load_parallel aux objets de chaque plage,
+                dans le processus principal, avant réassemblage (ex: re-partager
+                des valeurs que chaque worker a dédupliquées de son côté)
         """
         self.mapper = mapper
+        self.reject_path = Path(reject_path) if reject_path else None
+        self.max_samples = max_samples
+        self.cache = cache
+        self.cache_variant = cache_variant
+        self.adopt_chunk = adopt_chunk
+        self.last_stats: Optional[LoadStats] = None
+    
+    def __getstate__(self) -> dict:
+        # Envoyé aux workers de load_parallel: le cache (et son verrou) reste ici
+        state = self.__dict__.copy()
+        state['cache'] = None
+        return state
     
-    def load(self, file_path: Path | str) -> List[T]:
+    def load(
+        self,
+        file_path: Path | str,
+        row_filter: Optional[RowFilter] = None
+    ) -> List[T]:
         """
         Charge un fichier CSV et le transforme en liste d'objets typés.
         
+        Les fichiers compressés (gzip, bz2, xz) sont décompressés au fil de
+        la lecture; si `file_path` n'existe pas, sa version compressée
+        (ex: orders.csv.gz) est utilisée (voir resolve_csv_path).
+        
         Args:
             file_path: Chemin vers le fichier CSV
+            row_filter: Prédicat sur la ligne brute, évalué avant le mapper (optionnel)
             
         Returns:
             Liste d'objets typés
@@ -48,44 +157,360 @@ class CSVRepository(Generic[T]):
             FileNotFoundError: Si le fichier n'existe pas
             ValueError: Si le parsing échoue
         """
-        file_path = Path(file_path)
+        file_path = resolve_csv_path(file_path)
         
         if not file_path.exists():
             raise FileNotFoundError(f"Fichier CSV introuvable: {file_path}")
         
+        return self._cached(file_path, row_filter, self._parse_file)
+    
+    def _parse_file(self, file_path: Path, row_filter: Optional[RowFilter]) -> List[T]:
+        with open_csv_text(file_path) as f:
+            reader = csv.DictReader(f)
+            # start=2 car ligne 1 = header
+            return self.load_rows(
+                _filtered(enumerate(reader, start=2), row_filter), file_path
+            )
+    
+    def _cached(
+        self,
+        file_path: Path,
+        row_filter: Optional[RowFilter],
+        parse: Callable[[Path, Optional[RowFilter]], List[T]]
+    ) -> List[T]:
+        """Résultat en cache si le fichier n'a pas changé, sinon parse() mis en cache"""
+        key = self._cache_key(file_path, row_filter)
+        if key is None:
+            return parse(file_path, row_filter)
+        cached = self.cache.get(key)
+        if cached is not None:
+            items, self.last_stats = cached
+            return list(items)  # Liste propre à l'appelant, objets partagés
+        results = parse(file_path, row_filter)
+        self.cache.put(key, (tuple(results), self.last_stats), estimate_bytes(results))
+        return results
+    
+    def _cache_key(self, file_path: Path, row_filter: Optional[RowFilter]) -> Optional[tuple]:
+        """Clé du chargement (None: chargement à ne pas mettre en cache)"""
+        if self.cache is None or self.reject_path is not None:
+            return None
+        if row_filter is not None and not isinstance(row_filter, ColumnFilter):
+            return None
+        stat = file_path.stat()
+        return (
+            str(file_path.resolve()), stat.st_size, stat.st_mtime_ns, stat.st_ino,
+            getattr(self.mapper, '__func__', self.mapper), self.cache_variant,
+            self.max_samples, row_filter
+        )
+    
+    def load_rows(
+        self,
+        numbered_rows: Iterable[Tuple[int, Dict[str, str]]],
+        source: Path | str
+    ) -> List[T]:
+        """
+        Transforme des lignes CSV déjà découpées en objets typés.
+        
+        Point d'entrée commun aux lectures complètes et aux lectures
+        partielles (index par date): même validation, même gestion d'erreurs.
+        
+        Args:
+            numbered_rows: Tuples (numéro de ligne, dict de la ligne)
+            source: Fichier d'origine (pour les messages d'erreur)
+            
+        Returns:
+            Liste d'objets typés
+            
+        Raises:
+            ValueError: Si aucune ligne n'est valide
+        """
+        with self._open_reject_file() as reject_file:
+            collector = RejectionCollector(self.max_samples, reject_file)
+            results = self._map_rows(numbered_rows, collector)
+        self._finish(len(results), collector, source)
+        return results
+    
+    def load_numbered_rows(
+        self,
+        numbered_rows: Iterable[Tuple[int, Dict[str, str]]],
+        source: Path | str
+    ) -> List[Tuple[int, T]]:
+        """
+        Comme load_rows, en gardant le numéro de ligne de chaque objet.
+        
+        Args:
+            numbered_rows: Tuples (numéro de ligne, dict de la ligne)
+            source: Fichier d'origine (pour les messages d'erreur)
+            
+        Returns:
+            Liste de tuples (numéro de ligne, objet typé)
+            
+        Raises:
+            ValueError: Si aucune ligne n'est valide
+        """
         results = []
-        errors = []
+        with self._open_reject_file() as reject_file:
+            collector = RejectionCollector(self.max_samples, reject_file)
+            for line_num, row in numbered_rows:
+                try:
+                    results.append((line_num, self.mapper(row)))
+                except Exception as e:
+                    collector.reject(line_num, e, row)
+        self._finish(len(results), collector, source)
+        return results
+    
+    def iter_load(
+        self,
+        file_path: Path | str,
+        row_filter: Optional[RowFilter] = None
+    ) -> Iterator[T]:
+        """
+        Comme load(), mais produit les objets au fil de la lecture.
         
-        with open(file_path, 'r', encoding='utf-8', newline='') as f:
-            reader = csv.DictReader(f)
+        Rien n'est accumulé: la mémoire ne dépend pas de la taille du
+        fichier. last_stats et le contrôle "aucune ligne valide" sont
+        appliqués à la fin du parcours.
+        
+        Args:
+            file_path: Chemin vers le fichier CSV
+            row_filter: Prédicat sur la ligne brute, évalué avant le mapper (optionnel)
+            
+        Returns:
+            Itérateur d'objets typés, dans l'ordre du fichier
             
-            for line_num, row in enumerate(reader, start=2):  # start=2 car ligne 1 = header
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas (immédiatement)
+        """
+        file_path = resolve_csv_path(file_path)
+        
+        if not file_path.exists():
+            raise FileNotFoundError(f"Fichier CSV introuvable: {file_path}")
+        
+        return self._iter_mapped(file_path, row_filter)
+    
+    def _iter_mapped(self, file_path: Path, row_filter: Optional[RowFilter]) -> Iterator[T]:
+        loaded = 0
+        with open_csv_text(file_path) as f, self._open_reject_file() as reject_file:
+            collector = RejectionCollector(self.max_samples, reject_file)
+            numbered_rows = _filtered(enumerate(csv.DictReader(f), start=2), row_filter)
+            for line_num, row in numbered_rows:
                 try:
                     obj = self.mapper(row)
-                    results.append(obj)
                 except Exception as e:
-                    # Contrairement au legacy qui ignore silencieusement,
-                    # on collecte les erreurs pour debugging
-                    errors.append(f"Line {line_num}: {e}")
+                    collector.reject(line_num, e, row)
+                    continue
+                loaded += 1
+                yield obj
+        self._finish(loaded, collector, file_path)
+    
+    def load_parallel(
+        self,
+        file_path: Path | str,
+        workers: int,
+        min_chunk_bytes: int = PARALLEL_MIN_CHUNK_BYTES,
+        row_filter: Optional[RowFilter] = None
+    ) -> List[T]:
+        """
+        Charge un gros fichier CSV en parallèle (un processus par plage d'octets).
         
-        # Pour compatibilité legacy, on n'échoue pas si des lignes sont invalides
-        # mais on pourrait logger les erreurs en production
-        if errors and len(results) == 0:
-            # Si AUCUNE ligne n'est valide, c'est probablement un vrai problème
-            raise ValueError(f"Impossible de parser {file_path}:\n" + "\n".join(errors[:5]))
+        Le fichier est découpé sur des fins d'enregistrement (retours à la
+        ligne dans un champ quoté respectés), chaque plage est parsée par le
+        même mapper dans un processus séparé, puis les résultats sont
+        réassemblés dans l'ordre du fichier (après adopt_chunk, si
+        fournie). Les lignes invalides sont
+        ignorées comme dans load(), et le contrôle "aucune ligne valide"
+        porte sur le fichier entier.
+        
+        Note: le mapper doit être picklable (fonction de module ou méthode
+        d'un objet picklable). Un fichier compressé ne peut pas être découpé
+        par plages d'octets: il est chargé en séquentiel.
+        
+        Args:
+            file_path: Chemin vers le fichier CSV
+            workers: Nombre de processus
+            min_chunk_bytes: Taille minimale d'une plage (sinon moins de workers)
+            row_filter: Prédicat picklable sur la ligne brute (voir ColumnFilter)
+            
+        Returns:
+            Liste d'objets typés, dans l'ordre du fichier
+        """
+        file_path = resolve_csv_path(file_path)
+        
+        if not file_path.exists():
+            raise FileNotFoundError(f"Fichier CSV introuvable: {file_path}")
+        if detect_compression(file_path) is not None:
+            return self.load(file_path, row_filter)
         
+        return self._cached(
+            file_path, row_filter,
+            lambda path, row_filter: self._parse_parallel(path, row_filter, workers, min_chunk_bytes)
+        )
+    
+    def _parse_parallel(
+        self,
+        file_path: Path,
+        row_filter: Optional[RowFilter],
+        workers: int,
+        min_chunk_bytes: int
+    ) -> List[T]:
+        size = file_path.stat().st_size
+        with open(file_path, 'rb') as f:
+            header = next(iter_records(f), None)
+            if header is None:
+                return []
+            _, data_start, fieldnames = header
+            chunk_count = max(1, min(workers, (size - data_start) // max(1, min_chunk_bytes)))
+            if chunk_count == 1:
+                return self._parse_file(file_path, row_filter)
+            boundaries = find_record_boundaries(f, data_start, size, chunk_count)
+        
+        ranges = list(zip(boundaries[:-1], boundaries[1:]))
+        part_paths: List[Optional[Path]] = [
+            self.reject_path.with_name(f"{self.reject_path.name}.part{i}")
+            if self.reject_path else None
+            for i in range(len(ranges))
+        ]
+        with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+            chunks = list(executor.map(
+                _parse_chunk,
+                [self] * len(ranges),
+                [file_path] * len(ranges),
+                ranges,
+                [fieldnames] * len(ranges),
+                part_paths,
+                [row_filter] * len(ranges)
+            ))
+        
+        # Réassemblage dans l'ordre du fichier, numéros de ligne globaux
+        results: List[T] = []
+        collector = RejectionCollector(self.max_samples)
+        records_before = 0
+        with self._open_reject_file() as reject_file:
+            reject_writer = None
+            if reject_file is not None:
+                reject_writer = csv.writer(reject_file)
+                reject_writer.writerow(REJECT_FILE_HEADER)
+            for (chunk_results, chunk_collector, record_count), part_path in zip(chunks, part_paths):
+                if self.adopt_chunk is not None:
+                    chunk_results = self.adopt_chunk(chunk_results)
+                results.extend(chunk_results)
+                collector.merge(chunk_collector, line_offset=records_before)
+                if part_path is not None:
+                    _append_reject_part(reject_writer, part_path, records_before)
+                records_before += record_count
+        
+        self._finish(len(results), collector, file_path)
         return results
     
-    def load_as_dict(self, file_path: Path | str, key_attr: str) -> Dict[str, T]:
+    def _map_rows(
+        self,
+        numbered_rows: Iterable[Tuple[int, Dict[str, str]]],
+        collector: RejectionCollector
+    ) -> List[T]:
+        """Applique le mapper ligne par ligne en collectant les rejets"""
+        results = []
+        
+        for line_num, row in numbered_rows:
+            try:
+                obj = self.mapper(row)
+                results.append(obj)
+            except Exception as e:
+                # Contrairement au legacy qui ignore silencieusement,
+                # on collecte les rejets pour debugging (mémoire bornée)
+                collector.reject(line_num, e, row)
+        
+        return results
+    
+    def _finish(
+        self,
+        loaded: int,
+        collector: RejectionCollector,
+        source: Path | str
+    ) -> None:
+        """Publie les statistiques et échoue si aucune ligne n'est valide"""
+        self.last_stats = collector.stats(source, loaded)
+        
+        # Pour compatibilité legacy, on n'échoue pas si des lignes sont invalides
+        # (voir last_stats et le fichier de rejets)
+        if collector.rejected and loaded == 0:
+            # Si AUCUNE ligne n'est valide, c'est probablement un vrai problème
+            raise ValueError(
+                f"Impossible de parser {source}:\n"
+                + "\n".join(str(sample) for sample in collector.samples[:5])
+            )
+    
+    def _open_reject_file(self):
+        """Ouvre le fichier de rejets (ou un contexte vide s'il n'y en a pas)"""
+        if self.reject_path is None:
+            return contextlib.nullcontext(None)
+        return open(self.reject_path, 'w', encoding='utf-8', newline='')
+    
+    def load_as_dict(
+        self,
+        file_path: Path | str,
+        key_attr: str,
+        row_filter: Optional[RowFilter] = None
+    ) -> Dict[str, T]:
         """
         Charge un fichier CSV et retourne un dictionnaire indexé par une clé.
         
         Args:
             file_path: Chemin vers le fichier CSV
             key_attr: Nom de l'attribut à utiliser comme clé
+            row_filter: Prédicat sur la ligne brute, évalué avant le mapper (optionnel)
             
         Returns:
             Dictionnaire {clé: objet}
         """
-        items = self.load(file_path)
+        items = self.load(file_path, row_filter)
         return {getattr(item, key_attr): item for item in items}
+
+
+def _parse_chunk(
+    repo: CSVRepository,
+    file_path: Path,
+    byte_range: Tuple[int, int],
+    fieldnames: List[str],
+    part_path: Optional[Path],
+    row_filter: Optional[RowFilter]
+) -> Tuple[list, RejectionCollector, int]:
+    """
+    Parse une plage d'octets dans un processus worker.
+    
+    Les numéros de ligne sont relatifs à la plage (la première ligne de
+    données vaut 2); le processus principal les décale au réassemblage.
+    
+    Returns:
+        Tuple (objets, rejets, nb d'enregistrements)
+    """
+    start, end = byte_range
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+    
+    # Lignes vides ignorées (comme csv.DictReader)
+    records = [fields for fields in csv.reader(io.StringIO(text, newline='')) if fields]
+    numbered_rows = (
+        (line_num, row_to_dict(fieldnames, fields))
+        for line_num, fields in enumerate(records, start=2)
+    )
+    
+    with contextlib.ExitStack() as stack:
+        reject_file = None
+        if part_path is not None:
+            reject_file = stack.enter_context(open(part_path, 'w', encoding='utf-8', newline=''))
+        collector = RejectionCollector(repo.max_samples, reject_file)
+        results = repo._map_rows(_filtered(numbered_rows, row_filter), collector)
+    
+    return results, collector, len(records)
+
+
+def _append_reject_part(writer, part_path: Path, line_offset: int) -> None:
+    """Recopie les rejets d'un worker dans le fichier final (lignes recalées)"""
+    with open(part_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # header du fichier partiel
+        for row in reader:
+            row[0] = str(int(row[0]) + line_offset)
+            writer.writerow(row)
+    part_path.unlink()
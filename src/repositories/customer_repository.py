@@ -4,16 +4,26 @@ Gère le chargement des données clients depuis CSV.
 """
 
 from pathlib import Path
-from typing import Dict
-from .csv_repository import CSVRepository
+from typing import Dict, Iterable, Optional
+from .csv_repository import ColumnFilter, CSVRepository
+from .rejection_stats import LoadStats
 from ..models.customer import Customer
 
 
 class CustomerRepository:
     """Repository pour charger les clients depuis customers.csv"""
     
-    def __init__(self):
-        self.repo = CSVRepository(self._map_customer)
+    def __init__(self, reject_path: Path | str | None = None):
+        """
+        Args:
+            reject_path: Fichier CSV recevant les lignes rejetées (optionnel)
+        """
+        self.repo = CSVRepository(self._map_customer, reject_path=reject_path)
+    
+    @property
+    def last_stats(self) -> LoadStats | None:
+        """Statistiques (lignes lues, rejets) du dernier chargement"""
+        return self.repo.last_stats
     
     def _map_customer(self, row: Dict[str, str]) -> Customer:
         """
@@ -31,14 +41,21 @@ class CustomerRepository:
             currency=row.get('currency', 'EUR')
         )
     
-    def load_all(self, file_path: Path | str) -> Dict[str, Customer]:
+    def load_all(
+        self,
+        file_path: Path | str,
+        ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, Customer]:
         """
         Charge tous les clients et retourne un dict indexé par ID.
         
         Args:
             file_path: Chemin vers customers.csv
+            ids: Identifiants à charger (tous si None)
             
         Returns:
             Dict[customer_id, Customer]
         """
-        return self.repo.load_as_dict(file_path, 'id')
+        return self.repo.load_as_dict(
+            file_path, 'id', ColumnFilter.of('id', ids)
+        )
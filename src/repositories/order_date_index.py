@@ -0,0 +1,303 @@
+"""
+Order Date Index
+Index trié par date des enregistrements de orders.csv, persisté à côté du CSV.
+
+Permet de ne parser que les lignes d'une plage de dates ("last week",
+"March") au lieu de relire tout le fichier.
+
+Format du fichier d'index (<orders.csv>.dateidx):
+- ligne magique `ORDIDX1`
+- ligne JSON de métadonnées (taille/mtime du CSV source, header, dates)
+- tableaux binaires (array 'q'): début de chaque date, offsets, longueurs,
+  index d'enregistrement — triés par (date, offset)
+"""
+
+import io
+import json
+import re
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .csv_records import iter_records, row_to_dict
+
+
+INDEX_SUFFIX = '.dateidx'
+_MAGIC = b'ORDIDX1\n'
+_VERSION = 1
+_ISO_DATE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+@dataclass(frozen=True)
+class DateRangeFilter:
+    """
+    Filtre de lignes brutes sur une plage de dates, sans index.
+
+    Même sélection que OrderDateIndex.lookup (dates YYYY-MM-DD uniquement,
+    bornes incluses), pour les fichiers qui ne peuvent pas être indexés
+    (CSV compressés).
+
+    Attributes:
+        start_date: Date de début incluse, optionnelle
+        end_date: Date de fin incluse, optionnelle
+    """
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+    def __call__(self, row: Dict) -> bool:
+        date = row.get('date')
+        if not date or not _ISO_DATE.match(date):
+            return False
+        if self.start_date is not None and date < self.start_date:
+            return False
+        return self.end_date is None or date <= self.end_date
+
+
+@dataclass(frozen=True)
+class OrderDateIndex:
+    """
+    Index (date -> enregistrements) d'un fichier orders.csv.
+
+    Seules les dates au format YYYY-MM-DD sont indexées: une ligne sans
+    date (ou avec une date invalide) n'appartient à aucune plage.
+
+    Attributes:
+        fieldnames: Colonnes du header CSV
+        header_length: Taille du header en octets
+        source_size: Taille du CSV au moment de l'indexation
+        source_mtime_ns: mtime du CSV au moment de l'indexation
+        dates: Dates distinctes triées
+        date_starts: Position de la première entrée de chaque date (+ fin)
+        offsets: Offset (octets) de chaque enregistrement
+        lengths: Longueur (octets) de chaque enregistrement
+        record_indexes: Rang de l'enregistrement dans le fichier (0 = 1re ligne de données)
+    """
+    fieldnames: Tuple[str, ...]
+    header_length: int
+    source_size: int
+    source_mtime_ns: int
+    dates: Tuple[str, ...]
+    date_starts: array
+    offsets: array
+    lengths: array
+    record_indexes: array
+
+    @staticmethod
+    def index_path_for(csv_path: Path | str) -> Path:
+        """Chemin du fichier d'index associé à un CSV"""
+        csv_path = Path(csv_path)
+        return csv_path.with_name(csv_path.name + INDEX_SUFFIX)
+
+    @classmethod
+    def build(cls, csv_path: Path | str) -> 'OrderDateIndex':
+        """
+        Construit l'index en une passe sur le CSV.
+
+        Args:
+            csv_path: Chemin vers orders.csv
+
+        Returns:
+            L'index construit (non persisté)
+        """
+        csv_path = Path(csv_path)
+        stat = csv_path.stat()
+        entries: Dict[str, List[Tuple[int, int, int]]] = {}
+
+        with open(csv_path, 'rb') as f:
+            records = iter_records(f)
+            header = next(records, None)
+            if header is None:
+                raise ValueError(f"Fichier CSV vide: {csv_path}")
+            _, header_length, fieldnames = header
+            date_col = fieldnames.index('date') if 'date' in fieldnames else None
+
+            record_index = 0
+            for offset, length, fields in records:
+                if not fields:
+                    continue  # Lignes vides ignorées (comme csv.DictReader)
+                if date_col is not None and date_col < len(fields):
+                    date = fields[date_col]
+                    if _ISO_DATE.match(date):
+                        entries.setdefault(date, []).append(
+                            (offset, length, record_index)
+                        )
+                record_index += 1
+
+        dates = tuple(sorted(entries))
+        date_starts = array('q', [0])
+        offsets, lengths, record_indexes = array('q'), array('q'), array('q')
+        for date in dates:
+            for offset, length, rec in entries[date]:
+                offsets.append(offset)
+                lengths.append(length)
+                record_indexes.append(rec)
+            date_starts.append(len(offsets))
+
+        return cls(
+            fieldnames=tuple(fieldnames),
+            header_length=header_length,
+            source_size=stat.st_size,
+            source_mtime_ns=stat.st_mtime_ns,
+            dates=dates,
+            date_starts=date_starts,
+            offsets=offsets,
+            lengths=lengths,
+            record_indexes=record_indexes
+        )
+
+    @classmethod
+    def load(cls, index_path: Path | str) -> 'OrderDateIndex':
+        """
+        Relit un index persisté.
+
+        Raises:
+            ValueError: Si le fichier n'est pas un index valide
+        """
+        with open(index_path, 'rb') as f:
+            if f.readline() != _MAGIC:
+                raise ValueError(f"Index de dates invalide: {index_path}")
+            meta = json.loads(f.readline())
+            if meta.get('version') != _VERSION or meta.get('byteorder') != sys.byteorder:
+                raise ValueError(f"Index de dates incompatible: {index_path}")
+
+            arrays = []
+            for size in (len(meta['dates']) + 1, meta['count'], meta['count'], meta['count']):
+                values = array('q')
+                values.fromfile(f, size)
+                arrays.append(values)
+
+        return cls(
+            fieldnames=tuple(meta['fieldnames']),
+            header_length=meta['header_length'],
+            source_size=meta['source_size'],
+            source_mtime_ns=meta['source_mtime_ns'],
+            dates=tuple(meta['dates']),
+            date_starts=arrays[0],
+            offsets=arrays[1],
+            lengths=arrays[2],
+            record_indexes=arrays[3]
+        )
+
+    @classmethod
+    def load_or_build(cls, csv_path: Path | str) -> 'OrderDateIndex':
+        """
+        Retourne l'index à jour du CSV, en le reconstruisant si nécessaire.
+
+        L'index persisté est réutilisé tant que la taille et le mtime du CSV
+        n'ont pas changé. Si le répertoire n'est pas accessible en écriture,
+        l'index reste en mémoire.
+        """
+        csv_path = Path(csv_path)
+        index_path = cls.index_path_for(csv_path)
+        stat = csv_path.stat()
+
+        try:
+            index = cls.load(index_path)
+            if (index.source_size == stat.st_size
+                    and index.source_mtime_ns == stat.st_mtime_ns):
+                return index
+        except (OSError, ValueError, KeyError, EOFError):
+            pass  # Index absent, corrompu ou obsolète: on reconstruit
+
+        index = cls.build(csv_path)
+        try:
+            index.save(index_path)
+        except OSError:
+            pass
+        return index
+
+    def save(self, index_path: Path | str) -> None:
+        """Persiste l'index (écriture dans un fichier temporaire puis rename)"""
+        index_path = Path(index_path)
+        meta = {
+            'version': _VERSION,
+            'byteorder': sys.byteorder,
+            'fieldnames': list(self.fieldnames),
+            'header_length': self.header_length,
+            'source_size': self.source_size,
+            'source_mtime_ns': self.source_mtime_ns,
+            'dates': list(self.dates),
+            'count': len(self.offsets),
+        }
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(_MAGIC)
+            f.write(json.dumps(meta).encode('utf-8') + b'\n')
+            for values in (self.date_starts, self.offsets, self.lengths, self.record_indexes):
+                values.tofile(f)
+        tmp_path.replace(index_path)
+
+    def lookup(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> List[Tuple[int, int, int]]:
+        """
+        Retourne les enregistrements dont la date est dans [start_date, end_date].
+
+        Bornes incluses, optionnelles (plage ouverte si None).
+
+        Returns:
+            Liste de (offset, longueur, rang) triée dans l'ordre du fichier
+        """
+        lo = 0 if start_date is None else bisect_left(self.dates, start_date)
+        hi = len(self.dates) if end_date is None else bisect_right(self.dates, end_date)
+        if lo >= hi:
+            return []
+
+        first, last = self.date_starts[lo], self.date_starts[hi]
+        matches = list(zip(
+            self.offsets[first:last],
+            self.lengths[first:last],
+            self.record_indexes[first:last]
+        ))
+        matches.sort()
+        return matches
+
+    def date_counts(self) -> Dict[str, int]:
+        """Nombre d'enregistrements par date indexée"""
+        return {
+            date: self.date_starts[i + 1] - self.date_starts[i]
+            for i, date in enumerate(self.dates)
+        }
+
+    def iter_rows(
+        self,
+        csv_path: Path | str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> Iterator[Tuple[int, Dict]]:
+        """
+        Lit uniquement les lignes de la plage, dans l'ordre du fichier.
+
+        Les enregistrements contigus sont lus en un seul bloc.
+
+        Yields:
+            Tuples (numéro de ligne, dict de la ligne) comme csv.DictReader
+        """
+        matches = self.lookup(start_date, end_date)
+        if not matches:
+            return
+
+        with open(csv_path, 'rb') as f:
+            i = 0
+            while i < len(matches):
+                # Regrouper les enregistrements contigus
+                run_start, length, _ = matches[i]
+                j = i + 1
+                run_end = run_start + length
+                while j < len(matches) and matches[j][0] == run_end:
+                    run_end += matches[j][1]
+                    j += 1
+
+                f.seek(run_start)
+                block = f.read(run_end - run_start)
+                records = (fields for _, _, fields in iter_records(io.BytesIO(block)))
+                for (_, _, rec), fields in zip(matches[i:j], records):
+                    # +2: la ligne 1 est le header (numérotation de CSVRepository)
+                    yield rec + 2, row_to_dict(self.fieldnames, fields)
+                i = j
+
@@ -3,17 +3,61 @@ Order Repository
 Gère le chargement des commandes depuis CSV.
 """
 
+import csv
 from pathlib import Path
-from typing import List
-from .csv_repository import CSVRepository
+from typing import Dict, Iterable, Iterator, List, Optional
+from .compression import detect_compression, open_csv_text, resolve_csv_path
+from .csv_repository import ColumnFilter, CSVRepository, RowFilter
+from .rejection_stats import FieldError, LoadStats, finite_float, parse_field
+from .order_date_index import DateRangeFilter, OrderDateIndex
 from ..models.order import Order
 
 
+# Valeurs distinctes conservées au plus dans le dictionnaire de partage
+# (chargements successifs d'un processus de longue durée, ex: --watch)
+POOL_MAX_ENTRIES = 1 << 18
+
+# Champs encodés par dictionnaire
+_SHARED_FIELDS = ('customer_id', 'product_id', 'date', 'promo_code', 'time')
+
+
 class OrderRepository:
-    """Repository pour charger les commandes depuis orders.csv"""
+    """
+    Repository pour charger les commandes depuis orders.csv
     
-    def __init__(self):
-        self.repo = CSVRepository(self._map_order)
+    Les colonnes très répétitives (customer_id, product_id, date, promo_code,
+    time) sont encodées par dictionnaire: chaque valeur distincte n'existe
+    qu'une fois en mémoire et toutes les commandes la partagent.
+    
+    Le dictionnaire de partage repart de zéro à chaque load_all/iter_all.
+    Plein (POOL_MAX_ENTRIES valeurs, ex: lignes ajoutées au fil de l'eau),
+    il n'accueille plus de nouvelles valeurs mais continue de partager
+    celles qu'il contient. Avec load_parallel, chaque worker déduplique sa
+    plage; les valeurs sont re-partagées entre plages dans le processus
+    principal (_share_strings).
+    """
+    
+    def __init__(
+        self,
+        reject_path: Path | str | None = None,
+        intern_strings: bool = True
+    ):
+        """
+        Args:
+            reject_path: Fichier CSV recevant les lignes rejetées (optionnel)
+            intern_strings: Partager les valeurs répétées entre commandes
+        """
+        self.repo = CSVRepository(
+            self._map_order, reject_path=reject_path, cache_variant=intern_strings,
+            adopt_chunk=self._share_strings if intern_strings else None
+        )
+        self.intern_strings = intern_strings
+        self._pool: Dict[str, str] = {}
+    
+    @property
+    def last_stats(self) -> LoadStats | None:
+        """Statistiques (lignes lues, rejets) du dernier chargement"""
+        return self.repo.last_stats
     
     def _map_order(self, row: dict) -> Order:
         """
@@ -24,32 +68,185 @@ class OrderRepository:
         - Valeurs par défaut pour champs optionnels
         - Skip silencieux si validation échoue (ValueError propagée au CSVRepository)
         """
-        qty = int(row['qty'])
-        unit_price = float(row['unit_price'])
+        qty = parse_field(row, 'qty', int)
+        unit_price = parse_field(row, 'unit_price', finite_float)
         
         # Validation legacy: skip si invalide (exception propagée)
         if qty <= 0 or unit_price < 0:
-            raise ValueError(f"Invalid order: qty={qty}, price={unit_price}")
+            raise FieldError(
+                'qty' if qty <= 0 else 'unit_price',
+                f"Invalid order: qty={qty}, price={unit_price}"
+            )
+        
+        customer_id = row['customer_id']
+        product_id = row['product_id']
+        date = row.get('date', '')
+        promo_code = row.get('promo_code', '')
+        time = row.get('time', '12:00')
+        
+        if self.intern_strings:
+            pool = self._pool
+            # Dictionnaire plein: seules les valeurs déjà présentes sont partagées
+            intern = pool.setdefault if len(pool) < POOL_MAX_ENTRIES else pool.get
+            customer_id = intern(customer_id, customer_id)
+            product_id = intern(product_id, product_id)
+            date = intern(date, date)
+            promo_code = intern(promo_code, promo_code)
+            time = intern(time, time)
         
         return Order(
             id=row['id'],
-            customer_id=row['customer_id'],
-            product_id=row['product_id'],
+            customer_id=customer_id,
+            product_id=product_id,
             qty=qty,
             unit_price=unit_price,
-            date=row.get('date', ''),
-            promo_code=row.get('promo_code', ''),
-            time=row.get('time', '12:00')
+            date=date,
+            promo_code=promo_code,
+            time=time
         )
     
-    def load_all(self, file_path: Path | str) -> List[Order]:
+    def _share_strings(self, orders: List[Order]) -> List[Order]:
+        """
+        Re-partage les valeurs de commandes parsées par un worker de load_parallel.
+        
+        Chaque worker a son propre dictionnaire: sans cette étape, une même
+        valeur existerait une fois par plage. Les commandes, pas encore
+        publiées, sont modifiées sur place (champs remplacés par l'exemplaire
+        partagé) au lieu d'être reconstruites.
+        """
+        pool = self._pool
+        for order in orders:
+            intern = pool.setdefault if len(pool) < POOL_MAX_ENTRIES else pool.get
+            for name in _SHARED_FIELDS:
+                value = getattr(order, name)
+                shared = intern(value, value)
+                if shared is not value:
+                    object.__setattr__(order, name, shared)
+        return orders
+    
+    def load_all(
+        self,
+        file_path: Path | str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        workers: int = 1,
+        customer_ids: Optional[Iterable[str]] = None
+    ) -> List[Order]:
         """
-        Charge toutes les commandes.
+        Charge toutes les commandes, ou seulement celles d'une plage de dates.
+        
+        Avec une plage, seules les lignes concernées sont parsées grâce à
+        l'index de dates persisté (OrderDateIndex), dans l'ordre du fichier.
+        Les lignes sans date valide sont exclues des plages.
+        
+        Avec workers > 1 (et sans plage), le fichier est parsé en parallèle
+        par plages d'octets, avec la même validation (_map_order).
+        
+        Avec customer_ids, les lignes des autres clients sont écartées avant
+        conversion (semi-jointure): ni mappées, ni comptées comme rejets.
+        
+        Un orders.csv compressé (ou orders.csv.gz/.bz2/.xz à la place de
+        orders.csv) est lu en flux: ni index de dates ni découpage
+        parallèle, la plage est alors filtrée pendant la lecture.
         
         Args:
             file_path: Chemin vers orders.csv
+            start_date: Date de début incluse (YYYY-MM-DD), optionnelle
+            end_date: Date de fin incluse (YYYY-MM-DD), optionnelle
+            workers: Nombre de processus de parsing (1 = séquentiel)
+            customer_ids: Clients à charger (tous si None)
             
         Returns:
             List[Order]
         """
-        return self.repo.load(file_path)
+        row_filter = ColumnFilter.of('customer_id', customer_ids)
+        self._pool = {}
+        
+        if start_date is None and end_date is None:
+            if workers > 1:
+                return self.repo.load_parallel(file_path, workers, row_filter=row_filter)
+            return self.repo.load(file_path, row_filter)
+        
+        file_path = resolve_csv_path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Fichier CSV introuvable: {file_path}")
+        
+        if detect_compression(file_path) is not None:
+            return self.repo.load(file_path, _scan_filter(start_date, end_date, row_filter))
+        
+        index = OrderDateIndex.load_or_build(file_path)
+        rows = index.iter_rows(file_path, start_date, end_date)
+        if row_filter is not None:
+            rows = ((line_num, row) for line_num, row in rows if row_filter(row))
+        return self.repo.load_rows(rows, file_path)
+    
+    def iter_all(
+        self,
+        file_path: Path | str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        customer_ids: Optional[Iterable[str]] = None
+    ) -> Iterator[Order]:
+        """
+        Produit les commandes au fil de la lecture, sans les accumuler.
+        
+        Mêmes filtres et même sélection que load_all; la plage de dates
+        est filtrée pendant la lecture (pas d'index).
+        
+        Args:
+            file_path: Chemin vers orders.csv
+            start_date: Date de début incluse (YYYY-MM-DD), optionnelle
+            end_date: Date de fin incluse (YYYY-MM-DD), optionnelle
+            customer_ids: Clients à charger (tous si None)
+            
+        Returns:
+            Itérateur de Order, dans l'ordre du fichier
+        """
+        row_filter = ColumnFilter.of('customer_id', customer_ids)
+        self._pool = {}
+        return self.repo.iter_load(file_path, _scan_filter(start_date, end_date, row_filter))
+    
+    @staticmethod
+    def is_sorted_by_customer(file_path: Path | str) -> bool:
+        """
+        Vérifie que orders.csv est trié par customer_id (ordre croissant).
+        
+        Parcours rapide de la seule colonne customer_id, sans conversion
+        des lignes.
+        
+        Args:
+            file_path: Chemin vers orders.csv
+            
+        Returns:
+            True si les customer_id ne décroissent jamais
+        """
+        file_path = resolve_csv_path(file_path)
+        with open_csv_text(file_path) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if 'customer_id' not in header:
+                return False
+            column = header.index('customer_id')
+            previous = ''
+            for fields in reader:
+                if len(fields) <= column:
+                    continue  # Ligne vide ou incomplète (rejetée au chargement)
+                customer_id = fields[column]
+                if customer_id < previous:
+                    return False
+                previous = customer_id
+        return True
+
+
+def _scan_filter(
+    start_date: Optional[str],
+    end_date: Optional[str],
+    row_filter: Optional[RowFilter]
+) -> Optional[RowFilter]:
+    """Filtre de lecture séquentielle: plage de dates et filtre client combinés"""
+    if start_date is None and end_date is None:
+        return row_filter
+    in_range = DateRangeFilter(start_date, end_date)
+    if row_filter is None:
+        return in_range
+    return lambda row: in_range(row) and row_filter(row)
@@ -0,0 +1,192 @@
+"""
+Parse Cache
+Cache, à l'échelle du processus, des fichiers CSV déjà parsés.
+
+Les utilisateurs de la bibliothèque (API, notebooks) rechargent souvent les
+mêmes fichiers inchangés: ProductRepository().load_all(...) ne doit pas
+reparser products.csv à chaque appel.
+
+- Clé: chemin résolu, taille, date de modification (ns) et inode du
+  fichier, plus le mapper et le filtre de lignes. Un fichier modifié ou
+  remplacé change de clé: l'ancienne entrée n'est plus jamais servie et
+  finit évincée.
+- Valeur: tuple des objets parsés (modèles frozen, donc partageables) et
+  statistiques du chargement.
+- Éviction LRU bornée par le nombre d'entrées et par une estimation de la
+  mémoire occupée. Un résultat plus gros que la borne n'est pas conservé.
+"""
+
+import dataclasses
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Hashable, List, Optional, Sequence, Tuple
+
+from .rejection_stats import LoadStats
+
+
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 256 << 20
+
+# (objets parsés, statistiques du chargement)
+CachedLoad = Tuple[Tuple[Any, ...], Optional[LoadStats]]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    État du cache.
+
+    Attributes:
+        hits: Chargements servis depuis le cache
+        misses: Chargements parsés (absents du cache)
+        evictions: Entrées évincées pour respecter les bornes
+        entries: Entrées présentes
+        bytes: Mémoire estimée des entrées présentes
+    """
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def estimate_bytes(items: Sequence[Any]) -> int:
+    """
+    Mémoire approximative d'une liste d'objets parsés.
+
+    Mesure le premier objet (instance, __dict__ éventuel et valeurs des
+    champs) et l'extrapole: les lignes d'un même fichier ont des tailles
+    voisines, et la mesure reste en O(1) quelle que soit la taille du
+    fichier. Les champs sont ceux du dataclass, sinon __slots__, sinon
+    __dict__: un modèle déclaré avec slots=True (ex: Order) n'a pas de
+    __dict__ mais ses valeurs comptent autant.
+    """
+    if not items:
+        return sys.getsizeof(items)
+    sample = items[0]
+    size = sys.getsizeof(sample) + sum(sys.getsizeof(v) for v in _field_values(sample))
+    fields = getattr(sample, '__dict__', None)
+    if fields is not None:
+        size += sys.getsizeof(fields)
+    return sys.getsizeof(items) + size * len(items)
+
+
+def _field_values(obj: Any) -> List[Any]:
+    """Valeurs des champs d'un objet parsé (tuple, dataclass, __slots__ ou __dict__)"""
+    if isinstance(obj, tuple):
+        return list(obj)
+    if dataclasses.is_dataclass(obj):
+        return [getattr(obj, f.name) for f in dataclasses.fields(obj)]
+    slots = [
+        name for cls in type(obj).__mro__ for name in getattr(cls, '__slots__', ())
+        if hasattr(obj, name)
+    ]
+    if slots:
+        return [getattr(obj, name) for name in slots]
+    return list(getattr(obj, '__dict__', {}).values())
+
+
+class ParseCache:
+    """
+    Cache LRU des chargements CSV, partagé par tous les CSVRepository du processus.
+
+    Thread-safe: les accès sont protégés par un verrou (le parsing, lui, se
+    fait hors verrou; deux chargements simultanés du même fichier le
+    parsent chacun une fois).
+
+    Attributes:
+        max_entries: Nombre maximal d'entrées
+        max_bytes: Mémoire estimée maximale des entrées
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_entries: Nombre maximal d'entrées (0: cache désactivé)
+            max_bytes: Mémoire estimée maximale des entrées
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, Tuple[CachedLoad, int]]' = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedLoad]:
+        """Chargement en cache pour cette clé (None si absent)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: CachedLoad, size: int) -> None:
+        """
+        Ajoute un chargement, puis évince les moins récemment utilisés.
+
+        Args:
+            key: Clé (voir CSVRepository)
+            value: Objets parsés et statistiques
+            size: Mémoire estimée (voir estimate_bytes)
+        """
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+
+    def invalidate(self, path: Path | str | None = None) -> int:
+        """
+        Retire les entrées d'un fichier, ou toutes les entrées.
+
+        Utile quand un fichier est réécrit sans que sa taille ni sa date de
+        modification ne changent (résolution grossière du système de fichiers).
+
+        Args:
+            path: Fichier dont les chargements sont oubliés (None: tout le cache)
+
+        Returns:
+            Le nombre d'entrées retirées
+        """
+        resolved = None if path is None else str(Path(path).resolve())
+        with self._lock:
+            keys = [key for key in self._entries if resolved is None or key[0] == resolved]
+            for key in keys:
+                self._bytes -= self._entries.pop(key)[1]
+            return len(keys)
+
+    def stats(self) -> CacheStats:
+        """Compteurs et occupation du cache"""
+        with self._lock:
+            return CacheStats(
+                self._hits, self._misses, self._evictions, len(self._entries), self._bytes
+            )
+
+    def reset_stats(self) -> None:
+        """Remet les compteurs à zéro (les entrées sont conservées)"""
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+
+# Cache partagé par défaut par tous les CSVRepository du processus
+PARSE_CACHE = ParseCache()
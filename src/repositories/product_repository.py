@@ -4,16 +4,26 @@ Gère le chargement des données produits depuis CSV.
 """
 
 from pathlib import Path
-from typing import Dict
-from .csv_repository import CSVRepository
+from typing import Dict, Iterable, Optional
+from .csv_repository import ColumnFilter, CSVRepository
+from .rejection_stats import LoadStats, finite_float, parse_field
 from ..models.product import Product
 
 
 class ProductRepository:
     """Repository pour charger les produits depuis products.csv"""
     
-    def __init__(self):
-        self.repo = CSVRepository(self._map_product)
+    def __init__(self, reject_path: Path | str | None = None):
+        """
+        Args:
+            reject_path: Fichier CSV recevant les lignes rejetées (optionnel)
+        """
+        self.repo = CSVRepository(self._map_product, reject_path=reject_path)
+    
+    @property
+    def last_stats(self) -> LoadStats | None:
+        """Statistiques (lignes lues, rejets) du dernier chargement"""
+        return self.repo.last_stats
     
     def _map_product(self, row: Dict[str, str]) -> Product:
         """
@@ -28,19 +38,26 @@ class ProductRepository:
             id=row['id'],
             name=row['name'],
             category=row['category'],
-            price=float(row['price']),
-            weight=float(row.get('weight', '1.0')),
+            price=parse_field(row, 'price', finite_float),
+            weight=parse_field(row, 'weight', finite_float, default='1.0'),
             taxable=row.get('taxable', 'true').lower() == 'true'
         )
     
-    def load_all(self, file_path: Path | str) -> Dict[str, Product]:
+    def load_all(
+        self,
+        file_path: Path | str,
+        ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, Product]:
         """
         Charge tous les produits et retourne un dict indexé par ID.
         
         Args:
             file_path: Chemin vers products.csv
+            ids: Identifiants à charger (tous si None)
             
         Returns:
             Dict[product_id, Product]
         """
-        return self.repo.load_as_dict(file_path, 'id')
+        return self.repo.load_as_dict(
+            file_path, 'id', ColumnFilter.of('id', ids)
+        )
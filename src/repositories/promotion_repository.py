@@ -4,16 +4,26 @@ Gère le chargement des promotions depuis CSV.
 """
 
 from pathlib import Path
-from typing import Dict
-from .csv_repository import CSVRepository
+from typing import Dict, Iterable, Optional
+from .csv_repository import ColumnFilter, CSVRepository
+from .rejection_stats import LoadStats, finite_float, parse_field
 from ..models.promotion import Promotion
 
 
 class PromotionRepository:
     """Repository pour charger les promotions depuis promotions.csv"""
     
-    def __init__(self):
-        self.repo = CSVRepository(self._map_promotion)
+    def __init__(self, reject_path: Path | str | None = None):
+        """
+        Args:
+            reject_path: Fichier CSV recevant les lignes rejetées (optionnel)
+        """
+        self.repo = CSVRepository(self._map_promotion, reject_path=reject_path)
+    
+    @property
+    def last_stats(self) -> LoadStats | None:
+        """Statistiques (lignes lues, rejets) du dernier chargement"""
+        return self.repo.last_stats
     
     def _map_promotion(self, row: dict) -> Promotion:
         """
@@ -26,16 +36,21 @@ class PromotionRepository:
         return Promotion(
             code=row['code'],
             type=row['type'],
-            value=float(row['value']),
+            value=parse_field(row, 'value', finite_float),
             active=row.get('active', 'true').lower() != 'false'
         )
     
-    def load_all(self, file_path: Path | str) -> Dict[str, Promotion]:
+    def load_all(
+        self,
+        file_path: Path | str,
+        codes: Optional[Iterable[str]] = None
+    ) -> Dict[str, Promotion]:
         """
         Charge toutes les promotions et retourne un dict indexé par code.
         
         Args:
             file_path: Chemin vers promotions.csv
+            codes: Codes à charger (tous si None)
             
         Returns:
             Dict[promo_code, Promotion]
@@ -45,7 +60,9 @@ class PromotionRepository:
             On préserve ce comportement.
         """
         try:
-            return self.repo.load_as_dict(file_path, 'code')
+            return self.repo.load_as_dict(
+                file_path, 'code', ColumnFilter.of('code', codes)
+            )
         except FileNotFoundError:
             # Comportement legacy: retourne dict vide si fichier manquant
             return {}
@@ -0,0 +1,173 @@
+"""
+Reference Store
+Données de référence (produits, promotions, zones de livraison) rechargeables
+à chaud, sous forme d'instantanés immuables et versionnés.
+
+- Chaque fichier est rechargé indépendamment: seul le fichier modifié est
+  re-parsé, les autres dictionnaires sont repris tels quels de l'instantané
+  précédent (aucune copie).
+- Le nouvel instantané remplace l'ancien par une seule affectation: un
+  lecteur obtient toujours un instantané complet, jamais un mélange.
+- Un calcul en cours garde l'instantané qu'il a lu au départ, même si un
+  rechargement a lieu pendant ce temps.
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+from .compression import resolve_csv_path
+from .parse_cache import PARSE_CACHE
+from .product_repository import ProductRepository
+from .promotion_repository import PromotionRepository
+from .shipping_zone_repository import ShippingZoneRepository
+from ..models.product import Product
+from ..models.promotion import Promotion
+from ..models.shipping_zone import ShippingZone
+
+
+FileSignature = Optional[Tuple[int, int]]
+
+
+def file_signature(path: Path | str) -> FileSignature:
+    """(taille, mtime) d'un fichier, None s'il n'existe pas"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+# Fichier -> (champ de l'instantané, repository)
+REFERENCE_LOADERS: Dict[str, Tuple[str, type]] = {
+    'products.csv': ('products', ProductRepository),
+    'promotions.csv': ('promotions', PromotionRepository),
+    'shipping_zones.csv': ('shipping_zones', ShippingZoneRepository),
+}
+
+REFERENCE_FILES = tuple(REFERENCE_LOADERS)
+
+
+def _empty() -> Mapping:
+    return MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """
+    Instantané immuable des données de référence.
+
+    Attributes:
+        version: Numéro d'instantané (croît à chaque rechargement effectif)
+        products: Produits par ID (lecture seule)
+        promotions: Promotions par code (lecture seule)
+        shipping_zones: Zones par nom (lecture seule)
+        signatures: (taille, mtime) de chaque fichier au moment de son chargement
+        file_versions: Version de l'instantané où chaque fichier a été chargé
+    """
+    version: int = 0
+    products: Mapping[str, Product] = field(default_factory=_empty)
+    promotions: Mapping[str, Promotion] = field(default_factory=_empty)
+    shipping_zones: Mapping[str, ShippingZone] = field(default_factory=_empty)
+    signatures: Mapping[str, FileSignature] = field(default_factory=_empty)
+    file_versions: Mapping[str, int] = field(default_factory=_empty)
+
+
+class ReferenceStore:
+    """
+    Fournit l'instantané courant des données de référence et le recharge.
+
+    Les rechargements sont sérialisés par un verrou; la lecture de
+    `snapshot` ne prend aucun verrou.
+
+    Attributes:
+        base_path: Répertoire des CSV
+        snapshot: Instantané courant
+    """
+
+    def __init__(self, base_path: Path | str):
+        """
+        Chargement initial des trois fichiers.
+
+        Args:
+            base_path: Répertoire contenant products.csv, promotions.csv
+                et shipping_zones.csv (ou leurs versions compressées)
+        """
+        self.base_path = Path(base_path)
+        self._lock = threading.Lock()
+        self.snapshot = ReferenceSnapshot()
+        with self._lock:
+            self.snapshot = self._build(REFERENCE_FILES)
+
+    def _path(self, name: str) -> Path:
+        return resolve_csv_path(self.base_path / name)
+
+    def changed_files(self) -> Tuple[str, ...]:
+        """Fichiers dont la signature diffère de celle de l'instantané courant"""
+        signatures = self.snapshot.signatures
+        return tuple(
+            name for name in REFERENCE_FILES
+            if file_signature(self._path(name)) != signatures.get(name)
+        )
+
+    def refresh(self) -> ReferenceSnapshot:
+        """
+        Recharge les seuls fichiers modifiés depuis l'instantané courant.
+
+        Returns:
+            Le nouvel instantané, ou l'instantané courant si rien n'a changé
+        """
+        with self._lock:
+            changed = self.changed_files()
+            if changed:
+                self.snapshot = self._build(changed)
+            return self.snapshot
+
+    def reload(self, name: str) -> ReferenceSnapshot:
+        """
+        Recharge un fichier, qu'il ait changé ou non.
+
+        Le fichier est re-parsé même si sa taille et sa date de modification
+        n'ont pas changé: ses entrées du cache de parsing sont d'abord oubliées.
+
+        Args:
+            name: products.csv, promotions.csv ou shipping_zones.csv
+
+        Returns:
+            Le nouvel instantané
+
+        Raises:
+            ValueError: Si le fichier n'est pas un fichier de référence
+        """
+        if name not in REFERENCE_LOADERS:
+            raise ValueError(f"Fichier de référence inconnu: {name}")
+        with self._lock:
+            PARSE_CACHE.invalidate(self._path(name))
+            self.snapshot = self._build((name,))
+            return self.snapshot
+
+    def _build(self, names: Tuple[str, ...]) -> ReferenceSnapshot:
+        """Nouvel instantané: fichiers `names` re-parsés, les autres partagés"""
+        current = self.snapshot
+        version = current.version + 1
+        changes = {}
+        signatures = dict(current.signatures)
+        file_versions = dict(current.file_versions)
+        for name in names:
+            attr, repository = REFERENCE_LOADERS[name]
+            path = self._path(name)
+            # Signature prise avant la lecture: une écriture concurrente sera
+            # vue comme un changement au prochain refresh
+            signatures[name] = file_signature(path)
+            changes[attr] = MappingProxyType(repository().load_all(path))
+            file_versions[name] = version
+        return replace(
+            current,
+            version=version,
+            signatures=MappingProxyType(signatures),
+            file_versions=MappingProxyType(file_versions),
+            **changes
+        )
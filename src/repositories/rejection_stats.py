@@ -0,0 +1,232 @@
+"""
+Rejection Stats
+Collecte bornée des lignes CSV rejetées lors d'un chargement.
+
+Remplace la liste de messages qui grossissait avec chaque ligne invalide:
+on garde des compteurs (par type d'erreur et par colonne) et un échantillon
+plafonné. Optionnellement, tous les rejets sont écrits au fil de l'eau dans
+un fichier annexe, sans être gardés en mémoire.
+"""
+
+import csv
+import json
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TextIO, Tuple, TypeVar
+
+
+# Colonne inconnue (erreur portant sur la ligne entière)
+ROW_LEVEL = '<row>'
+
+DEFAULT_MAX_SAMPLES = 20
+
+REJECT_FILE_HEADER = ['line', 'error', 'column', 'message', 'row']
+
+
+class FieldError(ValueError):
+    """
+    Erreur de conversion d'une colonne précise.
+
+    Attributes:
+        column: Nom de la colonne fautive
+    """
+
+    def __init__(self, column: str, message: str):
+        super().__init__(message)
+        self.column = column
+
+
+V = TypeVar('V')
+
+
+def finite_float(value: str) -> float:
+    """
+    float() qui refuse nan et ±inf.
+
+    Pour les montants et poids: une valeur non finie ne peut pas être
+    sommée exactement (ExactSum) et n'a pas de sens dans le rapport.
+
+    Raises:
+        ValueError: Si la valeur n'est pas un flottant fini
+    """
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"non-finite value: {value!r}")
+    return number
+
+
+def parse_field(
+    row: Dict[str, str],
+    column: str,
+    cast: Callable[[str], V],
+    default: Optional[str] = None
+) -> V:
+    """
+    Convertit une colonne en attribuant l'éventuelle erreur à cette colonne.
+
+    Args:
+        row: Ligne CSV
+        column: Colonne à convertir
+        cast: Conversion (int, float...)
+        default: Valeur si la colonne est absente du header (sinon KeyError)
+
+    Raises:
+        KeyError: Si la colonne est absente et sans défaut
+        FieldError: Si la conversion échoue
+    """
+    value = row[column] if default is None else row.get(column, default)
+    try:
+        return cast(value)
+    except (TypeError, ValueError) as e:
+        raise FieldError(column, f"{column}: {e}") from e
+
+
+def error_column(error: Exception) -> str:
+    """Détermine la colonne concernée par une erreur de mapping"""
+    column = getattr(error, 'column', None)
+    if column:
+        return column
+    if isinstance(error, KeyError) and error.args:
+        return str(error.args[0])
+    return ROW_LEVEL
+
+
+@dataclass(frozen=True)
+class RejectedRow:
+    """
+    Ligne rejetée (échantillon).
+
+    Attributes:
+        line_num: Numéro de ligne dans le fichier (1 = header)
+        error: Type d'erreur (nom de la classe d'exception)
+        column: Colonne concernée (ROW_LEVEL si inconnue)
+        message: Message d'erreur
+    """
+    line_num: int
+    error: str
+    column: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"Line {self.line_num}: {self.message}"
+
+
+@dataclass(frozen=True)
+class LoadStats:
+    """
+    Statistiques d'un chargement CSV.
+
+    Attributes:
+        source: Fichier chargé
+        rows_read: Lignes de données lues
+        rows_loaded: Lignes transformées en objets
+        rows_rejected: Lignes rejetées
+        by_error: Rejets par type d'erreur
+        by_column: Rejets par colonne
+        samples: Premiers rejets (plafonné)
+    """
+    source: str
+    rows_read: int
+    rows_loaded: int
+    rows_rejected: int
+    by_error: Dict[str, int] = field(default_factory=dict)
+    by_column: Dict[str, int] = field(default_factory=dict)
+    samples: Tuple[RejectedRow, ...] = ()
+
+
+class RejectionCollector:
+    """
+    Collecteur de rejets à mémoire constante.
+
+    Attributes:
+        max_samples: Nombre maximum de rejets détaillés conservés
+        rejected: Nombre total de rejets
+    """
+
+    def __init__(
+        self,
+        max_samples: int = DEFAULT_MAX_SAMPLES,
+        reject_file: Optional[TextIO] = None
+    ):
+        """
+        Args:
+            max_samples: Taille de l'échantillon conservé
+            reject_file: Fichier texte où écrire tous les rejets (CSV), optionnel
+        """
+        self.max_samples = max_samples
+        self.rejected = 0
+        self.by_error: Dict[str, int] = {}
+        self.by_column: Dict[str, int] = {}
+        self.samples: List[RejectedRow] = []
+        self._writer = None
+        if reject_file is not None:
+            self._writer = csv.writer(reject_file)
+            self._writer.writerow(REJECT_FILE_HEADER)
+
+    def reject(self, line_num: int, error: Exception, row: Optional[dict] = None) -> None:
+        """
+        Enregistre une ligne rejetée.
+
+        Args:
+            line_num: Numéro de ligne
+            error: Exception levée par le mapper
+            row: Contenu de la ligne (écrit dans le fichier annexe uniquement)
+        """
+        rejected = RejectedRow(
+            line_num=line_num,
+            error=type(error).__name__,
+            column=error_column(error),
+            message=str(error)
+        )
+        self._count(rejected)
+        if self._writer is not None:
+            self._writer.writerow([
+                rejected.line_num, rejected.error, rejected.column, rejected.message,
+                json.dumps(row, ensure_ascii=False, default=str) if row is not None else ''
+            ])
+
+    def merge(self, other: 'RejectionCollector', line_offset: int = 0) -> None:
+        """
+        Ajoute les rejets d'un autre collecteur (ex: chunk parsé par un worker).
+
+        Args:
+            other: Collecteur à fusionner (ses échantillons sont dans l'ordre)
+            line_offset: Décalage à appliquer aux numéros de ligne de `other`
+        """
+        self.rejected += other.rejected
+        for key, count in other.by_error.items():
+            self.by_error[key] = self.by_error.get(key, 0) + count
+        for key, count in other.by_column.items():
+            self.by_column[key] = self.by_column.get(key, 0) + count
+        for sample in other.samples:
+            if len(self.samples) >= self.max_samples:
+                break
+            self.samples.append(RejectedRow(
+                sample.line_num + line_offset, sample.error, sample.column, sample.message
+            ))
+
+    def stats(self, source: Path | str, rows_loaded: int) -> LoadStats:
+        """Fige les statistiques du chargement"""
+        return LoadStats(
+            source=str(source),
+            rows_read=rows_loaded + self.rejected,
+            rows_loaded=rows_loaded,
+            rows_rejected=self.rejected,
+            by_error=dict(self.by_error),
+            by_column=dict(self.by_column),
+            samples=tuple(self.samples)
+        )
+
+    def __getstate__(self) -> dict:
+        # Le writer (fichier ouvert) ne traverse pas les processus
+        state = self.__dict__.copy()
+        state['_writer'] = None
+        return state
+
+    def _count(self, rejected: RejectedRow) -> None:
+        self.rejected += 1
+        self.by_error[rejected.error] = self.by_error.get(rejected.error, 0) + 1
+        self.by_column[rejected.column] = self.by_column.get(rejected.column, 0) + 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append(rejected)
@@ -4,16 +4,26 @@ Gère le chargement des zones de livraison depuis CSV.
 """
 
 from pathlib import Path
-from typing import Dict
-from .csv_repository import CSVRepository
+from typing import Dict, Iterable, Optional
+from .csv_repository import ColumnFilter, CSVRepository
+from .rejection_stats import LoadStats, parse_field
 from ..models.shipping_zone import ShippingZone
 
 
 class ShippingZoneRepository:
     """Repository pour charger les zones de livraison depuis shipping_zones.csv"""
     
-    def __init__(self):
-        self.repo = CSVRepository(self._map_shipping_zone)
+    def __init__(self, reject_path: Path | str | None = None):
+        """
+        Args:
+            reject_path: Fichier CSV recevant les lignes rejetées (optionnel)
+        """
+        self.repo = CSVRepository(self._map_shipping_zone, reject_path=reject_path)
+    
+    @property
+    def last_stats(self) -> LoadStats | None:
+        """Statistiques (lignes lues, rejets) du dernier chargement"""
+        return self.repo.last_stats
     
     def _map_shipping_zone(self, row: dict) -> ShippingZone:
         """
@@ -24,18 +34,25 @@ class ShippingZoneRepository:
         """
         return ShippingZone(
             zone=row['zone'],
-            base=float(row['base']),
-            per_kg=float(row.get('per_kg', '0.5'))
+            base=parse_field(row, 'base', float),
+            per_kg=parse_field(row, 'per_kg', float, default='0.5')
         )
     
-    def load_all(self, file_path: Path | str) -> Dict[str, ShippingZone]:
+    def load_all(
+        self,
+        file_path: Path | str,
+        zones: Optional[Iterable[str]] = None
+    ) -> Dict[str, ShippingZone]:
         """
         Charge toutes les zones et retourne un dict indexé par nom de zone.
         
         Args:
             file_path: Chemin vers shipping_zones.csv
+            zones: Zones à charger (toutes si None)
             
         Returns:
             Dict[zone_name, ShippingZone]
         """
-        return self.repo.load_as_dict(file_path, 'zone')
+        return self.repo.load_as_dict(
+            file_path, 'zone', ColumnFilter.of('zone', zones)
+        )
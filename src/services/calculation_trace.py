@@ -0,0 +1,192 @@
+"""
+Calculation Trace
+Mode "explain": trace structurée (JSON) de chaque valeur intermédiaire du
+calcul d'un client, pour justifier un total contesté.
+
+Coût nul quand il est désactivé: le calcul normal utilise OrderProcessor,
+qui ne contient aucun test de traçage. TracingOrderProcessor n'est
+instancié que sur demande et ne trace que les clients sélectionnés; pour
+les autres il délègue directement au calcul normal.
+"""
+
+import json
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..config.constants import CURRENCY_RATES
+from ..models.customer import Customer
+from ..models.enriched_line import EnrichedLine
+from ..models.order import Order
+from ..models.order_summary import OrderSummary
+from ..models.shipping_zone import ShippingZone
+from .order_processor import OrderProcessor
+
+
+def _jsonable(value: Any) -> Any:
+    """Représentation JSON d'un argument ou résultat de calculateur"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, EnrichedLine):
+        return value.order.id
+    if isinstance(value, Order):
+        return value.id
+    if is_dataclass(value):
+        return {f.name: _jsonable(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return repr(value)
+
+
+def _materialized(arg: Any) -> Any:
+    """Argument itérateur converti en liste (pour être passé puis enregistré)"""
+    if isinstance(arg, (list, tuple, str, bytes, dict)) or not isinstance(arg, Iterable):
+        return arg
+    return list(arg)
+
+
+class _RecordingCalculator:
+    """
+    Proxy d'un calculateur: enregistre chaque appel (méthode, arguments, résultat).
+
+    Les itérateurs passés en argument sont matérialisés avant l'appel pour
+    pouvoir être enregistrés. Les arguments bruts du dernier appel de chaque
+    méthode restent disponibles (last_call).
+    """
+
+    def __init__(self, name: str, target: Any, steps: List[Dict[str, Any]]):
+        self._name = name
+        self._target = target
+        self._steps = steps
+        self._last_calls: Dict[str, Tuple[tuple, Dict[str, Any]]] = {}
+
+    def last_call(self, attr: str) -> Optional[Tuple[tuple, Dict[str, Any]]]:
+        """(args, kwargs) du dernier appel de la méthode, None si jamais appelée"""
+        return self._last_calls.get(attr)
+
+    def __getattr__(self, attr: str) -> Any:
+        method = getattr(self._target, attr)
+        if not callable(method):
+            return method
+
+        def recorded(*args, **kwargs):
+            args = tuple(_materialized(arg) for arg in args)
+            kwargs = {key: _materialized(value) for key, value in kwargs.items()}
+            result = method(*args, **kwargs)
+            self._last_calls[attr] = (args, kwargs)
+            step = {
+                'step': f'{self._name}.{attr}',
+                'args': [_jsonable(arg) for arg in args],
+                'result': _jsonable(result),
+            }
+            if kwargs:
+                step['kwargs'] = {key: _jsonable(value) for key, value in kwargs.items()}
+            self._steps.append(step)
+            return result
+
+        return recorded
+
+
+class _RecordingOrderProcessor(OrderProcessor):
+    """OrderProcessor qui garde les montants par ligne dont il a tiré le résumé"""
+
+    line_amounts: List[Tuple[float, float, float]]
+
+    def _line_amounts(self, lines: List[EnrichedLine]) -> List[Tuple[float, float, float]]:
+        self.line_amounts = list(super()._line_amounts(lines))
+        return self.line_amounts
+
+
+class TracingOrderProcessor(OrderProcessor):
+    """
+    OrderProcessor qui trace le calcul des clients sélectionnés.
+
+    Les calculateurs injectés sont les mêmes que ceux du calcul normal:
+    les montants tracés sont ceux du rapport.
+
+    Attributes:
+        customer_ids: Clients à tracer
+        traces: Traces produites, par ID client
+    """
+
+    def __init__(self, customer_ids: Iterable[str], **calculators):
+        """
+        Args:
+            customer_ids: Clients à tracer
+            **calculators: Calculateurs (voir OrderProcessor)
+        """
+        super().__init__(**calculators)
+        self.customer_ids = frozenset(customer_ids)
+        self.traces: Dict[str, Dict[str, Any]] = {}
+
+    def process_customer_lines(
+        self,
+        customer: Customer,
+        lines: List[EnrichedLine],
+        shipping_zones: Dict[str, ShippingZone]
+    ) -> OrderSummary:
+        if customer.id not in self.customer_ids:
+            return super().process_customer_lines(customer, lines, shipping_zones)
+
+        steps: List[Dict[str, Any]] = []
+        shipping = _RecordingCalculator('shipping', self.shipping_calc, steps)
+        recording = _RecordingOrderProcessor(
+            discount_calc=_RecordingCalculator('discount', self.discount_calc, steps),
+            tax_calc=_RecordingCalculator('tax', self.tax_calc, steps),
+            shipping_calc=shipping,
+            loyalty_calc=_RecordingCalculator('loyalty', self.loyalty_calc, steps),
+            enricher=self.enricher,
+            exact_sums=self.exact_sums
+        )
+        summary = recording.process_customer_lines(customer, lines, shipping_zones)
+
+        # Règle de port décrite par le calculateur, pour les arguments qu'il a reçus
+        shipping_call = shipping.last_call('calculate')
+        self.traces[customer.id] = {
+            'customer': _jsonable(customer),
+            'lines': [
+                self._trace_line(line, line_total, weight, morning_bonus)
+                for line, (line_total, weight, morning_bonus)
+                in zip(lines, recording.line_amounts)
+            ],
+            'steps': steps,
+            'tax_mode': 'global' if all(line.taxable for line in lines) else 'per_line',
+            'shipping_rule': (
+                None if shipping_call is None
+                else self.shipping_calc.describe(*shipping_call[0], **shipping_call[1])
+            ),
+            'currency_rate': CURRENCY_RATES.get(customer.currency, 1.0),
+            'summary': {
+                **{f.name: getattr(summary, f.name) for f in fields(summary) if f.name != 'customer'},
+                'total_discount': summary.total_discount,
+                'taxable_amount': summary.taxable_amount,
+            },
+        }
+        return summary
+
+    @staticmethod
+    def _trace_line(
+        line: EnrichedLine,
+        line_total: float,
+        weight: float,
+        morning_bonus: float
+    ) -> Dict[str, Any]:
+        """Détail d'une ligne: données enrichies et montants retenus par le calcul"""
+        return {
+            'order_id': line.order.id,
+            'product_id': line.order.product_id,
+            'product_found': line.product_found,
+            'qty': line.order.qty,
+            'base_price': line.base_price,
+            'promo_code': line.order.promo_code,
+            'discount_rate': line.discount_rate,
+            'fixed_discount': line.fixed_discount,
+            'hour': line.hour,
+            'morning_bonus': morning_bonus,
+            'line_total': line_total,
+            'weight': weight,
+            'taxable': line.taxable,
+        }
+
+    def to_json(self) -> str:
+        """Traces de tous les clients tracés (JSON indenté)"""
+        return json.dumps(self.traces, ensure_ascii=False, indent=2)
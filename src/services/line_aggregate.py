@@ -0,0 +1,221 @@
+"""
+Line Aggregate
+Agrégats de lignes de commande fusionnables sans perte: un client peut être
+calculé à partir d'agrégats partiels (par jour, par morceau de fichier...)
+avec exactement le même résultat qu'à partir de toutes ses lignes.
+
+Les sommes sont gardées exactes (ExactSum) et arrondies une seule fois à la
+lecture, comme math.fsum dans OrderProcessor: l'ordre et le découpage des
+fusions n'ont aucune influence sur le résultat.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Tuple
+
+from ..config.constants import MORNING_BONUS_RATE, MORNING_CUTOFF_HOUR
+from ..models.enriched_line import EnrichedLine
+from .tax_calculator import TaxCalculator
+
+
+def line_amounts(line: EnrichedLine) -> tuple[float, float, float]:
+    """
+    Montants d'une ligne: (total après promo et bonus matinal, poids, bonus matinal).
+    
+    Args:
+        line: Ligne enrichie
+        
+    Returns:
+        Tuple (line_total, weight, morning_bonus)
+    """
+    qty = line.order.qty
+    
+    # Calcul ligne avec promo
+    # Bug legacy préservé: FIXED appliquée par ligne au lieu de global
+    line_total = qty * line.base_price * (1 - line.discount_rate) - line.fixed_discount * qty
+    
+    # Bonus matinal (règle cachée: avant 10h)
+    morning_bonus = 0.0
+    if line.hour < MORNING_CUTOFF_HOUR:
+        morning_bonus = line_total * MORNING_BONUS_RATE
+        line_total = line_total - morning_bonus
+    
+    return (line_total, line.unit_weight * qty, morning_bonus)
+
+
+@dataclass(frozen=True)
+class ExactSum:
+    """
+    Somme exacte de flottants: mantissa × 2**exponent.
+
+    Attributes:
+        mantissa: Entier (taille non bornée)
+        exponent: Exposant binaire commun
+    """
+    mantissa: int = 0
+    exponent: int = 0
+
+    @classmethod
+    def of(cls, values: Iterable[float]) -> 'ExactSum':
+        """Somme exacte d'une suite de flottants finis"""
+        return cls.total(value.as_integer_ratio() for value in values)
+
+    @classmethod
+    def total(cls, terms: Iterable[Tuple[int, int]]) -> 'ExactSum':
+        """
+        Somme exacte de termes (numérateur, dénominateur puissance de 2).
+
+        Boucle unique sans objet intermédiaire: c'est le chemin chaud de la
+        construction et de la fusion des agrégats.
+
+        Args:
+            terms: float.as_integer_ratio() ou ExactSum.as_ratio()
+        """
+        mantissa, exponent = 0, 0
+        for numerator, denominator in terms:
+            if not numerator:
+                continue
+            e = 1 - denominator.bit_length()
+            if not mantissa:
+                mantissa, exponent = numerator, e
+            elif e >= exponent:
+                mantissa += numerator << (e - exponent)
+            else:
+                mantissa = (mantissa << (exponent - e)) + numerator
+                exponent = e
+        return cls(mantissa, exponent)
+
+    def as_ratio(self) -> Tuple[int, int]:
+        """(numérateur, dénominateur) comme float.as_integer_ratio() (exposant <= 0)"""
+        if self.exponent >= 0:
+            return (self.mantissa << self.exponent, 1)
+        return (self.mantissa, 1 << -self.exponent)
+
+    def __add__(self, other: 'ExactSum') -> 'ExactSum':
+        return ExactSum.total((self.as_ratio(), other.as_ratio()))
+
+    def __float__(self) -> float:
+        """Valeur arrondie au flottant le plus proche (identique à math.fsum)"""
+        if self.exponent >= 0:
+            return float(self.mantissa << self.exponent)
+        # Division entière vraie: correctement arrondie
+        return self.mantissa / (1 << -self.exponent)
+
+    def to_json(self) -> Tuple[int, int]:
+        return (self.mantissa, self.exponent)
+
+    @classmethod
+    def from_json(cls, data: Iterable[int]) -> 'ExactSum':
+        mantissa, exponent = data
+        return cls(int(mantissa), int(exponent))
+
+
+@dataclass(frozen=True)
+class LineAggregate:
+    """
+    Agrégat des lignes d'un client, avant remises.
+
+    Contient tout ce qu'OrderProcessor.process_customer_aggregate utilise:
+    les montants par ligne (voir line_amounts) sont cumulés exactement.
+
+    Attributes:
+        subtotal: Somme des totaux de lignes après promos et bonus matinal
+        weight: Somme des poids
+        morning_bonus: Somme des bonus matinaux
+        loyalty_base: Somme des quantité × prix de commande (base des points)
+        line_tax: Somme des taxes par ligne (calcul des commandes mixtes)
+        line_count: Nombre de lignes
+        untaxed_count: Nombre de lignes non taxables
+        first_seq: Rang dans le fichier de la première ligne (None si vide)
+        first_date: Date de cette première ligne
+    """
+    subtotal: ExactSum = field(default_factory=ExactSum)
+    weight: ExactSum = field(default_factory=ExactSum)
+    morning_bonus: ExactSum = field(default_factory=ExactSum)
+    loyalty_base: ExactSum = field(default_factory=ExactSum)
+    line_tax: ExactSum = field(default_factory=ExactSum)
+    line_count: int = 0
+    untaxed_count: int = 0
+    first_seq: Optional[int] = None
+    first_date: str = ''
+
+    @classmethod
+    def of_lines(
+        cls,
+        numbered_lines: Iterable[Tuple[int, EnrichedLine]],
+        tax_calc: TaxCalculator
+    ) -> 'LineAggregate':
+        """
+        Agrège des lignes numérotées.
+
+        Args:
+            numbered_lines: Tuples (rang dans le fichier, ligne enrichie)
+            tax_calc: Calculateur de taxes (taux des taxes par ligne)
+
+        Returns:
+            L'agrégat des lignes
+        """
+        line_totals, weights, bonuses, bases, taxes = [], [], [], [], []
+        untaxed = 0
+        first_seq, first_date = None, ''
+        for seq, line in numbered_lines:
+            line_total, weight, morning_bonus = line_amounts(line)
+            line_totals.append(line_total)
+            weights.append(weight)
+            bonuses.append(morning_bonus)
+            bases.append(line.order.line_total())
+            taxes.append(tax_calc.line_tax(line))
+            if not line.taxable:
+                untaxed += 1
+            if first_seq is None or seq < first_seq:
+                first_seq, first_date = seq, line.order.date
+        return cls(
+            ExactSum.of(line_totals), ExactSum.of(weights), ExactSum.of(bonuses),
+            ExactSum.of(bases), ExactSum.of(taxes),
+            len(line_totals), untaxed, first_seq, first_date
+        )
+
+    def merge(self, other: 'LineAggregate') -> 'LineAggregate':
+        """Agrégat de l'union des lignes des deux agrégats"""
+        return LineAggregate.merge_all((self, other))
+
+    @classmethod
+    def merge_all(cls, aggregates: Iterable['LineAggregate']) -> 'LineAggregate':
+        """
+        Fusionne des agrégats (ordre indifférent).
+
+        Args:
+            aggregates: Agrégats de lignes disjointes d'un même client
+
+        Returns:
+            L'agrégat de toutes leurs lignes
+        """
+        aggregates = list(aggregates)
+        first = min(
+            (agg for agg in aggregates if agg.first_seq is not None),
+            key=lambda agg: agg.first_seq,
+            default=cls()
+        )
+        return cls(
+            ExactSum.total(agg.subtotal.as_ratio() for agg in aggregates),
+            ExactSum.total(agg.weight.as_ratio() for agg in aggregates),
+            ExactSum.total(agg.morning_bonus.as_ratio() for agg in aggregates),
+            ExactSum.total(agg.loyalty_base.as_ratio() for agg in aggregates),
+            ExactSum.total(agg.line_tax.as_ratio() for agg in aggregates),
+            sum(agg.line_count for agg in aggregates),
+            sum(agg.untaxed_count for agg in aggregates),
+            first.first_seq,
+            first.first_date
+        )
+
+    def to_json(self) -> list:
+        return [
+            self.subtotal.to_json(), self.weight.to_json(), self.morning_bonus.to_json(),
+            self.loyalty_base.to_json(), self.line_tax.to_json(),
+            self.line_count, self.untaxed_count, self.first_seq, self.first_date
+        ]
+
+    @classmethod
+    def from_json(cls, data: list) -> 'LineAggregate':
+        sums = [ExactSum.from_json(value) for value in data[:5]]
+        line_count, untaxed_count, first_seq, first_date = data[5:]
+        return cls(*sums, line_count, untaxed_count, first_seq, first_date)
@@ -3,9 +3,10 @@ Loyalty Calculator
 Calcule les points de fidélité.
 """
 
-from typing import List
+from typing import Iterable
 from ..models.order import Order
 from ..config.constants import LOYALTY_POINTS_RATE
+from .summation import summation
 
 
 class LoyaltyCalculator:
@@ -14,7 +15,15 @@ class LoyaltyCalculator:
     Responsabilité unique: calculer les points de fidélité.
     """
     
-    def calculate_points(self, orders: List[Order]) -> float:
+    def __init__(self, exact_sums: bool = False):
+        """
+        Args:
+            exact_sums: Somme exacte (math.fsum) au lieu de la somme séquentielle legacy
+        """
+        self.exact_sums = exact_sums
+        self._sum = summation(exact_sums)
+    
+    def calculate_points(self, orders: Iterable[Order]) -> float:
         """
         Calcule les points de fidélité basés sur le montant des commandes.
         
@@ -24,5 +33,16 @@ class LoyaltyCalculator:
         Returns:
             Nombre de points de fidélité (float)
         """
-        total = sum(order.line_total() for order in orders)
+        return self.points_for_total(self._sum(order.line_total() for order in orders))
+    
+    def points_for_total(self, total: float) -> float:
+        """
+        Points de fidélité d'un montant de commandes déjà cumulé.
+        
+        Args:
+            total: Somme des totaux de lignes (quantité × prix)
+            
+        Returns:
+            Nombre de points de fidélité (float)
+        """
         return total * LOYALTY_POINTS_RATE
@@ -0,0 +1,94 @@
+"""
+Order Enricher
+Joint chaque commande à son produit et à sa promotion, une seule fois.
+
+Remplace les recherches répétées dans le dict des produits (sous-total,
+taxes globales, taxes par ligne) et le fallback prix/poids dupliqué.
+"""
+
+from typing import Dict, Iterable, Iterator, List
+from ..models.enriched_line import EnrichedLine
+from ..models.order import Order
+from ..models.product import Product
+from ..models.promotion import Promotion
+
+
+class OrderEnricher:
+    """
+    Étape d'enrichissement des lignes de commande.
+    Responsabilité unique: résoudre produit et promotion de chaque ligne.
+    """
+    
+    def enrich(
+        self,
+        orders: Iterable[Order],
+        products: Dict[str, Product],
+        promotions: Dict[str, Promotion]
+    ) -> List[EnrichedLine]:
+        """
+        Construit les lignes enrichies, dans l'ordre des commandes.
+        
+        Args:
+            orders: Commandes à enrichir
+            products: Dict des produits
+            promotions: Dict des promotions
+            
+        Returns:
+            Liste de EnrichedLine
+        """
+        return [self.enrich_one(order, products, promotions) for order in orders]
+    
+    def iter_enrich(
+        self,
+        orders: Iterable[Order],
+        products: Dict[str, Product],
+        promotions: Dict[str, Promotion]
+    ) -> Iterator[EnrichedLine]:
+        """Comme enrich(), au fil de l'eau (pour un flux de commandes)"""
+        for order in orders:
+            yield self.enrich_one(order, products, promotions)
+    
+    def enrich_one(
+        self,
+        order: Order,
+        products: Dict[str, Product],
+        promotions: Dict[str, Promotion]
+    ) -> EnrichedLine:
+        """
+        Enrichit une commande.
+        
+        Préserve le comportement legacy:
+        - Produit inconnu: prix de la commande, poids 1.0 kg, considéré taxable
+          pour le choix du mode de taxe mais exclu du calcul ligne par ligne
+        - Promotion inconnue ou inactive: aucune remise
+        """
+        prod = products.get(order.product_id)
+        if not prod:
+            # Fallback: utiliser le prix de la commande
+            base_price = order.unit_price
+            weight = 1.0
+            taxable = True
+        else:
+            base_price = prod.price
+            weight = prod.weight
+            taxable = prod.taxable
+        
+        discount_rate = 0.0
+        fixed_discount = 0.0
+        promo_code = order.promo_code
+        if promo_code and promo_code in promotions:
+            promo = promotions[promo_code]
+            if promo.active:
+                discount_rate = promo.get_discount_rate()
+                fixed_discount = promo.get_fixed_discount()
+        
+        return EnrichedLine(
+            order=order,
+            base_price=base_price,
+            unit_weight=weight,
+            product_found=bool(prod),
+            taxable=taxable,
+            discount_rate=discount_rate,
+            fixed_discount=fixed_discount,
+            hour=order.get_hour()
+        )
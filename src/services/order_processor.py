@@ -3,18 +3,40 @@ Order Processor
 Orchestre les différents calculateurs pour traiter une commande client.
 """
 
-from typing import List, Dict
+from typing import Callable, Dict, Iterable, Iterator, List
 from ..models.customer import Customer
+from ..models.enriched_line import EnrichedLine
 from ..models.order import Order
 from ..models.product import Product
 from ..models.shipping_zone import ShippingZone
 from ..models.order_summary import OrderSummary
 from ..models.promotion import Promotion
-from ..config.constants import MORNING_BONUS_RATE, MORNING_CUTOFF_HOUR, CURRENCY_RATES
+from ..config.constants import CURRENCY_RATES
 from .discount_calculator import DiscountCalculator
 from .tax_calculator import TaxCalculator
 from .shipping_calculator import ShippingCalculator
 from .loyalty_calculator import LoyaltyCalculator
+from .order_enricher import OrderEnricher
+from .line_aggregate import LineAggregate, line_amounts
+from .summation import summation
+
+
+class UnsortedInputError(ValueError):
+    """
+    Commandes non groupées par client en mode flux trié.
+    
+    Attributes:
+        customer_id: Client rencontré hors ordre
+        previous_id: Client traité juste avant
+    """
+    
+    def __init__(self, customer_id: str, previous_id: str):
+        super().__init__(
+            f"Commandes non triées par client: {customer_id} après {previous_id} "
+            "(relancer sans --sorted-input, ou avec --sorted-input auto)"
+        )
+        self.customer_id = customer_id
+        self.previous_id = previous_id
 
 
 class OrderProcessor:
@@ -28,7 +50,9 @@ class OrderProcessor:
         discount_calc: DiscountCalculator | None = None,
         tax_calc: TaxCalculator | None = None,
         shipping_calc: ShippingCalculator | None = None,
-        loyalty_calc: LoyaltyCalculator | None = None
+        loyalty_calc: LoyaltyCalculator | None = None,
+        enricher: OrderEnricher | None = None,
+        exact_sums: bool = False
     ):
         """
         Args:
@@ -36,11 +60,18 @@ class OrderProcessor:
             tax_calc: Calculateur de taxes
             shipping_calc: Calculateur de frais de port
             loyalty_calc: Calculateur de points fidélité
+            enricher: Jointure commandes/produits/promotions
+            exact_sums: Sommes exactes (math.fsum) au lieu des sommes
+                séquentielles legacy (voir summation); s'applique aussi aux
+                calculateurs de taxes et de fidélité créés par défaut
         """
         self.discount_calc = discount_calc or DiscountCalculator()
-        self.tax_calc = tax_calc or TaxCalculator()
+        self.tax_calc = tax_calc or TaxCalculator(exact_sums=exact_sums)
         self.shipping_calc = shipping_calc or ShippingCalculator()
-        self.loyalty_calc = loyalty_calc or LoyaltyCalculator()
+        self.loyalty_calc = loyalty_calc or LoyaltyCalculator(exact_sums=exact_sums)
+        self.enricher = enricher or OrderEnricher()
+        self.exact_sums = exact_sums
+        self._sum = summation(exact_sums)
     
     def process_customer_orders(
         self,
@@ -61,24 +92,100 @@ class OrderProcessor:
             promotions: Dict des promotions
             shipping_zones: Dict des zones de livraison
             
+        Returns:
+            OrderSummary avec tous les montants calculés
+        """
+        lines = self.enricher.enrich(orders, products, promotions)
+        return self.process_customer_lines(customer, lines, shipping_zones)
+    
+    def process_customer_lines(
+        self,
+        customer: Customer,
+        lines: List[EnrichedLine],
+        shipping_zones: Dict[str, ShippingZone]
+    ) -> OrderSummary:
+        """
+        Traite les lignes enrichies d'un client (produits et promos déjà joints).
+        Fonction pure: pas de side effects.
+        
+        Args:
+            customer: Le client
+            lines: Ses lignes enrichies, dans l'ordre du fichier
+            shipping_zones: Dict des zones de livraison
+            
         Returns:
             OrderSummary avec tous les montants calculés
         """
         # 1. Calculer subtotal et appliquer promotions
-        subtotal, weight, morning_bonus = self._calculate_subtotal_with_promos(
-            orders, products, promotions
-        )
+        subtotal, weight, morning_bonus = self._calculate_subtotal_with_promos(lines)
         
         # 2. Calculer points de fidélité
-        loyalty_points = self.loyalty_calc.calculate_points(orders)
+        loyalty_points = self.loyalty_calc.calculate_points(line.order for line in lines)
+        
+        # Date de la première ligne reçue (ordre du fichier). Pour un rapport
+        # filtré par dates, c'est la première ligne du client DANS la plage.
+        first_order_date = lines[0].order.date if lines else ''
+        
+        return self._summarize(
+            customer, subtotal, weight, morning_bonus, loyalty_points,
+            first_order_date, len(lines), shipping_zones,
+            lambda taxable_amount: self.tax_calc.calculate_lines(lines, taxable_amount)
+        )
+    
+    def process_customer_aggregate(
+        self,
+        customer: Customer,
+        aggregate: LineAggregate,
+        shipping_zones: Dict[str, ShippingZone]
+    ) -> OrderSummary:
+        """
+        Traite un client à partir de l'agrégat de ses lignes.
+        
+        Les agrégats gardent des sommes exactes: même résultat que
+        process_customer_lines d'un processeur exact_sums=True sur les lignes
+        agrégées, quel que soit le découpage des agrégats partiels fusionnés.
         
+        Args:
+            customer: Le client
+            aggregate: Agrégat de ses lignes (voir LineAggregate)
+            shipping_zones: Dict des zones de livraison
+            
+        Returns:
+            OrderSummary avec tous les montants calculés
+        """
+        return self._summarize(
+            customer,
+            float(aggregate.subtotal),
+            float(aggregate.weight),
+            float(aggregate.morning_bonus),
+            self.loyalty_calc.points_for_total(float(aggregate.loyalty_base)),
+            aggregate.first_date,
+            aggregate.line_count,
+            shipping_zones,
+            lambda taxable_amount: self.tax_calc.calculate_totals(
+                aggregate.untaxed_count == 0, taxable_amount, float(aggregate.line_tax)
+            )
+        )
+    
+    def _summarize(
+        self,
+        customer: Customer,
+        subtotal: float,
+        weight: float,
+        morning_bonus: float,
+        loyalty_points: float,
+        first_order_date: str,
+        item_count: int,
+        shipping_zones: Dict[str, ShippingZone],
+        calculate_tax: Callable[[float], float]
+    ) -> OrderSummary:
+        """Règles client (remises, plafond, taxe, port, devise) à partir des cumuls"""
         # 3. Calculer remises
         volume_discount = self.discount_calc.calculate_volume_discount(
             subtotal, customer.level
         )
         
         # Appliquer bonus weekend sur remise volume
-        first_order_date = orders[0].date if orders else ''
         volume_discount = self.discount_calc.apply_weekend_bonus(
             volume_discount, first_order_date
         )
@@ -95,14 +202,14 @@ class OrderProcessor:
         
         # 4. Calculer taxe
         taxable_amount = subtotal - (volume_discount + loyalty_discount)
-        tax = self.tax_calc.calculate(orders, products, taxable_amount)
+        tax = calculate_tax(taxable_amount)
         
         # 5. Calculer frais de port
         zone = shipping_zones.get(customer.shipping_zone)
         shipping = self.shipping_calc.calculate(
             subtotal, weight, zone, customer.shipping_zone
         )
-        handling = self.shipping_calc.calculate_handling_fee(len(orders))
+        handling = self.shipping_calc.calculate_handling_fee(item_count)
         
         # 6. Conversion devise
         currency_rate = CURRENCY_RATES.get(customer.currency, 1.0)
@@ -125,60 +232,132 @@ class OrderProcessor:
             loyalty_points=loyalty_points,
             weight=weight,
             morning_bonus=morning_bonus,
-            item_count=len(orders)
+            item_count=item_count
         )
     
+    def iter_summaries(
+        self,
+        customers: Dict[str, Customer],
+        lines_by_customer: Dict[str, List[EnrichedLine]],
+        shipping_zones: Dict[str, ShippingZone]
+    ) -> Iterator[OrderSummary]:
+        """
+        Produit les résumés client par client, sans les accumuler.
+        
+        Tri par ID client pour ordre déterministe (comportement legacy),
+        clients sans commandes ignorés.
+        
+        Args:
+            customers: Dict des clients
+            lines_by_customer: Lignes enrichies groupées par client
+            shipping_zones: Dict des zones de livraison
+            
+        Yields:
+            OrderSummary dans l'ordre des IDs client
+        """
+        for customer_id in sorted(customers.keys()):
+            customer_lines = lines_by_customer.get(customer_id)
+            
+            if not customer_lines:
+                continue  # Skip clients sans commandes
+            
+            yield self.process_customer_lines(
+                customer=customers[customer_id],
+                lines=customer_lines,
+                shipping_zones=shipping_zones
+            )
+    
+    def iter_sorted_summaries(
+        self,
+        customers: Dict[str, Customer],
+        lines: Iterable[EnrichedLine],
+        shipping_zones: Dict[str, ShippingZone]
+    ) -> Iterator[OrderSummary]:
+        """
+        Produit les résumés d'un flux de lignes trié par ID client.
+        
+        Seules les lignes du client courant sont gardées en mémoire: un
+        résumé est émis dès que le client change. Résultat identique à
+        iter_summaries(group_by_customer(lines)) sur une entrée triée.
+        Les lignes de clients inconnus sont ignorées (comme iter_summaries).
+        
+        Args:
+            customers: Dict des clients
+            lines: Lignes enrichies, groupées et triées par ID client croissant
+            shipping_zones: Dict des zones de livraison
+            
+        Yields:
+            OrderSummary dans l'ordre des IDs client
+            
+        Raises:
+            UnsortedInputError: Si un client apparaît après un ID supérieur
+        """
+        current_id = None
+        current_lines: List[EnrichedLine] = []
+        
+        for line in lines:
+            customer_id = line.order.customer_id
+            if customer_id not in customers:
+                continue
+            if customer_id != current_id:
+                if current_id is not None:
+                    if customer_id < current_id:
+                        raise UnsortedInputError(customer_id, current_id)
+                    yield self.process_customer_lines(
+                        customers[current_id], current_lines, shipping_zones
+                    )
+                current_id = customer_id
+                current_lines = []
+            current_lines.append(line)
+        
+        if current_lines:
+            yield self.process_customer_lines(
+                customers[current_id], current_lines, shipping_zones
+            )
+    
+    @staticmethod
+    def group_by_customer(lines: Iterable[EnrichedLine]) -> Dict[str, List[EnrichedLine]]:
+        """Groupe les lignes par client en une passe (ordre du fichier conservé)"""
+        lines_by_customer: Dict[str, List[EnrichedLine]] = {}
+        for line in lines:
+            lines_by_customer.setdefault(line.order.customer_id, []).append(line)
+        return lines_by_customer
+    
     def _calculate_subtotal_with_promos(
         self,
-        orders: List[Order],
-        products: Dict[str, Product],
-        promotions: Dict[str, Promotion]
+        lines: List[EnrichedLine]
     ) -> tuple[float, float, float]:
         """
         Calcule le subtotal en appliquant les promotions et bonus matinaux.
         
+        Par défaut, sommes séquentielles dans l'ordre des lignes (legacy).
+        Avec exact_sums, sommes exactes arrondies une seule fois (math.fsum):
+        le résultat ne dépend plus de l'ordre des lignes et s'obtient aussi
+        par fusion d'agrégats partiels (voir LineAggregate).
+        
         Returns:
             Tuple (subtotal, weight_total, morning_bonus_total)
         """
-        subtotal = 0.0
-        total_weight = 0.0
-        total_morning_bonus = 0.0
-        
-        for order in orders:
-            # Récupérer produit (avec fallback legacy)
-            prod = products.get(order.product_id)
-            if not prod:
-                # Fallback: utiliser le prix de la commande
-                base_price = order.unit_price
-                weight = 1.0
-            else:
-                base_price = prod.price
-                weight = prod.weight
-            
-            # Appliquer promo
-            promo_code = order.promo_code
-            discount_rate = 0.0
-            fixed_discount = 0.0
-            
-            if promo_code and promo_code in promotions:
-                promo = promotions[promo_code]
-                if promo.active:
-                    discount_rate = promo.get_discount_rate()
-                    fixed_discount = promo.get_fixed_discount()
-            
-            # Calcul ligne avec promo
-            # Bug legacy préservé: FIXED appliquée par ligne au lieu de global
-            line_total = order.qty * base_price * (1 - discount_rate) - fixed_discount * order.qty
-            
-            # Bonus matinal (règle cachée: avant 10h)
-            hour = order.get_hour()
-            morning_bonus = 0.0
-            if hour < MORNING_CUTOFF_HOUR:
-                morning_bonus = line_total * MORNING_BONUS_RATE
-                line_total = line_total - morning_bonus
-            
+        amounts = self._line_amounts(lines)
+        if self.exact_sums:
+            line_totals, weights, morning_bonuses = zip(*amounts) if lines else ((), (), ())
+            total = self._sum
+            return (total(line_totals), total(weights), total(morning_bonuses))
+        
+        # Sommes séquentielles (legacy), sans listes intermédiaires
+        subtotal = weight_total = morning_bonus_total = 0.0
+        for line_total, weight, morning_bonus in amounts:
             subtotal += line_total
-            total_weight += weight * order.qty
-            total_morning_bonus += morning_bonus
+            weight_total += weight
+            morning_bonus_total += morning_bonus
+        return (subtotal, weight_total, morning_bonus_total)
+    
+    def _line_amounts(self, lines: List[EnrichedLine]) -> Iterable[tuple[float, float, float]]:
+        """
+        Montants de chaque ligne, dans l'ordre des lignes (voir line_amounts).
         
-        return (subtotal, total_weight, total_morning_bonus)
+        Returns:
+            Tuple (total après promo et bonus, poids, bonus matinal) par ligne
+            (bonus 0.0 après l'heure limite)
+        """
+        return map(line_amounts, lines)
@@ -0,0 +1,102 @@
+"""
+Report Queries
+Requêtes agrégées sur les résumés clients, sans rendu du rapport complet.
+
+- Totaux globaux en flux: aucun résumé conservé
+- Top N par un champ de OrderSummary: tas borné à N éléments
+"""
+
+import heapq
+from dataclasses import dataclass, fields
+from typing import Iterable, List
+
+from ..models.order_summary import OrderSummary
+
+
+# Champs numériques de OrderSummary utilisables pour un classement
+RANKABLE_FIELDS = tuple(
+    f.name for f in fields(OrderSummary) if f.name != 'customer'
+) + ('total_discount', 'taxable_amount')
+
+
+@dataclass
+class GrandTotals:
+    """
+    Accumulateur des totaux globaux du rapport.
+
+    Même ordre d'addition que TextReportFormatter.format: les totaux sont
+    identiques au pied du rapport complet.
+
+    Attributes:
+        grand_total: Somme des totaux clients
+        total_tax: Somme des taxes
+        customers: Nombre de clients agrégés
+    """
+    grand_total: float = 0.0
+    total_tax: float = 0.0
+    customers: int = 0
+
+    def add(self, summary: OrderSummary) -> None:
+        """Ajoute un résumé client"""
+        self.grand_total += summary.total
+        self.total_tax += summary.tax
+        self.customers += 1
+
+    @classmethod
+    def from_summaries(cls, summaries: Iterable[OrderSummary]) -> 'GrandTotals':
+        """Agrège un flux de résumés (mémoire constante)"""
+        totals = cls()
+        for summary in summaries:
+            totals.add(summary)
+        return totals
+
+    def format(self) -> str:
+        """Lignes de totaux, au format du pied de rapport"""
+        return '\n'.join([
+            f'Grand Total: {self.grand_total:.2f} EUR',
+            f'Total Tax Collected: {self.total_tax:.2f} EUR',
+        ])
+
+
+def top_n(
+    summaries: Iterable[OrderSummary],
+    n: int,
+    field: str = 'total'
+) -> List[OrderSummary]:
+    """
+    Retourne les N résumés ayant la plus grande valeur du champ demandé.
+
+    Mémoire O(N): tas borné, les autres résumés ne sont pas conservés.
+    En cas d'égalité, le premier rencontré (plus petit ID client) l'emporte.
+
+    Args:
+        summaries: Flux de résumés
+        n: Nombre de résumés à garder
+        field: Champ de classement (voir RANKABLE_FIELDS)
+
+    Returns:
+        Résumés triés par valeur décroissante
+
+    Raises:
+        ValueError: Si le champ n'est pas classable
+    """
+    if field not in RANKABLE_FIELDS:
+        raise ValueError(f"Champ de classement inconnu: {field}")
+    return heapq.nlargest(n, summaries, key=lambda s: getattr(s, field))
+
+
+def format_top(ranked: List[OrderSummary], field: str = 'total') -> str:
+    """
+    Formate un classement, une ligne par client.
+
+    Args:
+        ranked: Résumés classés (voir top_n)
+        field: Champ de classement affiché
+
+    Returns:
+        Texte du classement
+    """
+    return '\n'.join(
+        f'{rank}. {s.customer.name} ({s.customer.id}): {field}={getattr(s, field):.2f}'
+        for rank, s in enumerate(ranked, start=1)
+    )
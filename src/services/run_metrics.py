@@ -0,0 +1,231 @@
+"""
+Run Metrics
+Métriques d'une exécution du rapport, exportées au format texte Prometheus
+pour le textfile collector de node-exporter.
+
+- Histogrammes: temps de calcul par client, lignes par client
+- Par repository: lignes chargées, rejets (par type d'erreur), débit de parsing
+- Durée et horodatage de la dernière exécution
+
+Collecte à coût borné: un appel perf_counter de part et d'autre du calcul
+d'un client et une recherche dichotomique dans les bornes de l'histogramme
+(voir benchmarks.metrics_overhead).
+"""
+
+import os
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..models.customer import Customer
+from ..models.enriched_line import EnrichedLine
+from ..models.order_summary import OrderSummary
+from ..models.shipping_zone import ShippingZone
+from ..repositories.rejection_stats import LoadStats
+from .order_processor import OrderProcessor
+
+
+# Bornes (secondes) du temps de calcul d'un client
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+
+# Bornes du nombre de lignes de commande d'un client
+LINE_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels) -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """
+    Histogramme Prometheus (bornes fixes, sans labels).
+
+    Attributes:
+        name: Nom de la métrique
+        help: Description
+        buckets: Bornes supérieures croissantes (+Inf implicite)
+    """
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Ajoute une observation"""
+        self._counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        cumulative = 0
+        for bound, count in zip(self.buckets, self._counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f'{self.name}_sum {_format_value(self.sum)}')
+        lines.append(f'{self.name}_count {self.count}')
+        return lines
+
+
+class LabeledValues:
+    """
+    Compteur ou jauge Prometheus avec labels.
+
+    Attributes:
+        name: Nom de la métrique
+        help: Description
+        kind: 'counter' ou 'gauge'
+    """
+
+    def __init__(self, name: str, help: str, kind: str = 'counter'):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[tuple(sorted(labels.items()))] = value
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        for labels, value in sorted(self.values.items()):
+            lines.append(f'{self.name}{_format_labels(labels)} {_format_value(value)}')
+        return lines
+
+
+class RunMetrics:
+    """
+    Métriques d'une exécution (ou cumulées sur un processus long).
+
+    Attributes:
+        customer_seconds: Temps de calcul par client
+        customer_lines: Lignes de commande par client
+        rows_loaded: Lignes chargées par repository
+        rows_rejected: Lignes rejetées par repository et type d'erreur
+        parse_rows_per_second: Débit du dernier chargement par repository
+        run_seconds: Durée de la dernière exécution
+        last_run_timestamp: Fin de la dernière exécution (epoch)
+    """
+
+    def __init__(self, prefix: str = 'order_report'):
+        self.customer_seconds = Histogram(
+            f'{prefix}_customer_processing_seconds',
+            'Temps de calcul du résumé d un client', LATENCY_BUCKETS
+        )
+        self.customer_lines = Histogram(
+            f'{prefix}_customer_order_lines',
+            'Lignes de commande par client', LINE_COUNT_BUCKETS
+        )
+        self.rows_loaded = LabeledValues(
+            f'{prefix}_rows_loaded_total', 'Lignes CSV chargées', 'counter'
+        )
+        self.rows_rejected = LabeledValues(
+            f'{prefix}_rows_rejected_total', 'Lignes CSV rejetées', 'counter'
+        )
+        self.parse_rows_per_second = LabeledValues(
+            f'{prefix}_parse_rows_per_second', 'Débit du dernier chargement', 'gauge'
+        )
+        self.run_seconds = LabeledValues(
+            f'{prefix}_run_seconds', 'Durée de la dernière exécution', 'gauge'
+        )
+        self.last_run_timestamp = LabeledValues(
+            f'{prefix}_last_run_timestamp_seconds', 'Fin de la dernière exécution', 'gauge'
+        )
+
+    def record_load(self, repository: str, stats: Optional[LoadStats], seconds: float) -> None:
+        """
+        Enregistre un chargement CSV.
+
+        Args:
+            repository: Nom du repository (label)
+            stats: Statistiques du chargement (ignoré si None, ex: lecture en flux)
+            seconds: Durée du chargement
+        """
+        if stats is None:
+            return
+        self.rows_loaded.inc(stats.rows_loaded, repository=repository)
+        for error, count in stats.by_error.items():
+            self.rows_rejected.inc(count, repository=repository, error=error)
+        if seconds > 0:
+            self.parse_rows_per_second.set(stats.rows_read / seconds, repository=repository)
+
+    def record_run(self, seconds: Optional[float] = None) -> None:
+        """
+        Enregistre la fin d'une exécution.
+
+        Args:
+            seconds: Durée de l'exécution (None en mode surveillance, où
+                seul l'horodatage du dernier rapport a un sens)
+        """
+        if seconds is not None:
+            self.run_seconds.set(seconds)
+        self.last_run_timestamp.set(time.time())
+
+    def render(self) -> str:
+        """Exposition texte Prometheus"""
+        lines: List[str] = []
+        for metric in (
+            self.customer_seconds, self.customer_lines, self.rows_loaded,
+            self.rows_rejected, self.parse_rows_per_second, self.run_seconds,
+            self.last_run_timestamp
+        ):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: Path | str) -> None:
+        """
+        Écrit l'exposition pour le textfile collector.
+
+        Écriture atomique (fichier temporaire puis rename): le collector ne
+        lit jamais un fichier à moitié écrit.
+        """
+        path = Path(path)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp_path.write_text(self.render(), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+
+class MeteredOrderProcessor(OrderProcessor):
+    """OrderProcessor qui mesure le calcul de chaque client"""
+
+    def __init__(self, metrics: RunMetrics, **calculators):
+        """
+        Args:
+            metrics: Métriques à alimenter
+            **calculators: Calculateurs (voir OrderProcessor)
+        """
+        super().__init__(**calculators)
+        self.metrics = metrics
+
+    def process_customer_lines(
+        self,
+        customer: Customer,
+        lines: List[EnrichedLine],
+        shipping_zones: Dict[str, ShippingZone]
+    ) -> OrderSummary:
+        start = time.perf_counter()
+        summary = super().process_customer_lines(customer, lines, shipping_zones)
+        self.metrics.customer_seconds.observe(time.perf_counter() - start)
+        self.metrics.customer_lines.observe(len(lines))
+        return summary
@@ -0,0 +1,271 @@
+"""
+Sampling
+Estimation des totaux globaux (Grand Total, Total Tax Collected) à partir
+d'un échantillon de clients, avec intervalle de confiance.
+
+- Tirage aléatoire simple sans remise, uniforme ou stratifié (niveau ou
+  zone de livraison), avec allocation proportionnelle à la taille des
+  strates (au moins 2 clients par strate pour estimer sa variance).
+- Estimateur stratifié classique: total = somme des N_h × moyenne_h, variance
+  avec correction de population finie. Un client tiré sans commande compte
+  pour 0, comme dans le rapport complet où il n'apparaît pas.
+- Taille de l'échantillon fixée, ou déduite d'une erreur cible à partir de la
+  variance observée sur un premier échantillon (l'échantillon est complété,
+  jamais retiré: l'union reste un tirage aléatoire simple par strate).
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from statistics import NormalDist, fmean, variance
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from ..models.customer import Customer
+from ..models.order_summary import OrderSummary
+
+
+# Critères de stratification: nom -> strate d'un client
+STRATIFICATIONS: Dict[str, Callable[[Customer], str]] = {
+    'none': lambda customer: '',
+    'level': lambda customer: customer.level,
+    'zone': lambda customer: customer.shipping_zone,
+}
+
+# Champs estimés: libellé du pied de rapport -> champ de OrderSummary
+ESTIMATED_FIELDS = (('Grand Total', 'total'), ('Total Tax Collected', 'tax'))
+
+# Taille de l'échantillon initial quand seule l'erreur cible est donnée
+DEFAULT_PILOT_SIZE = 100
+
+_MIN_PER_STRATUM = 2
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """
+    Total estimé et demi-largeur de son intervalle de confiance.
+
+    Attributes:
+        value: Total estimé
+        margin: Demi-largeur de l'intervalle (0 si tous les clients sont tirés)
+        confidence: Niveau de confiance (ex: 0.95)
+    """
+    value: float
+    margin: float
+    confidence: float
+
+    @property
+    def low(self) -> float:
+        return self.value - self.margin
+
+    @property
+    def high(self) -> float:
+        return self.value + self.margin
+
+    @property
+    def relative_error(self) -> float:
+        """Demi-largeur rapportée au total estimé (inf si le total est nul)"""
+        if self.value == 0.0:
+            return 0.0 if self.margin == 0.0 else math.inf
+        return self.margin / abs(self.value)
+
+
+@dataclass(frozen=True)
+class SamplingPlan:
+    """
+    Population stratifiée et clients tirés dans chaque strate.
+
+    Attributes:
+        stratify: Critère de stratification (voir STRATIFICATIONS)
+        population: IDs clients de chaque strate (triés)
+        sample: IDs tirés dans chaque strate
+    """
+    stratify: str
+    population: Mapping[str, Tuple[str, ...]] = field(default_factory=dict)
+    sample: Mapping[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def draw(
+        cls,
+        customers: Mapping[str, Customer],
+        size: int,
+        stratify: str = 'none',
+        rng: Optional[random.Random] = None
+    ) -> 'SamplingPlan':
+        """
+        Tire un échantillon de clients.
+
+        Args:
+            customers: Population (dict des clients)
+            size: Nombre de clients à tirer (plafonné à la population)
+            stratify: Critère de stratification (voir STRATIFICATIONS)
+            rng: Générateur aléatoire (reproductible s'il est initialisé)
+
+        Returns:
+            Le plan d'échantillonnage
+
+        Raises:
+            ValueError: Si le critère de stratification est inconnu
+        """
+        if stratify not in STRATIFICATIONS:
+            raise ValueError(f"Stratification inconnue: {stratify}")
+        key = STRATIFICATIONS[stratify]
+        strata: Dict[str, List[str]] = {}
+        for cid in sorted(customers):
+            strata.setdefault(key(customers[cid]), []).append(cid)
+        plan = cls(stratify, {h: tuple(ids) for h, ids in sorted(strata.items())})
+        return plan.extend(size, rng)
+
+    @property
+    def population_size(self) -> int:
+        return sum(len(ids) for ids in self.population.values())
+
+    @property
+    def size(self) -> int:
+        return sum(len(ids) for ids in self.sample.values())
+
+    def sample_ids(self) -> Set[str]:
+        """IDs de tous les clients tirés"""
+        return {cid for ids in self.sample.values() for cid in ids}
+
+    def extend(self, size: int, rng: Optional[random.Random] = None) -> 'SamplingPlan':
+        """
+        Complète l'échantillon jusqu'à `size` clients (allocation proportionnelle).
+
+        Args:
+            size: Taille totale visée
+            rng: Générateur aléatoire
+
+        Returns:
+            Nouveau plan dont l'échantillon contient celui-ci
+        """
+        rng = rng or random.Random()
+        sample = {}
+        for stratum, n in self._allocate(size).items():
+            drawn = self.sample.get(stratum, ())
+            taken = set(drawn)
+            remaining = [cid for cid in self.population[stratum] if cid not in taken]
+            sample[stratum] = drawn + tuple(rng.sample(remaining, n - len(drawn)))
+        return SamplingPlan(self.stratify, self.population, sample)
+
+    def _allocate(self, size: int) -> Dict[str, int]:
+        """Taille par strate: proportionnelle (plus forts restes), bornée par la strate"""
+        total = self.population_size
+        size = min(max(size, 0), total)
+        if total == 0:
+            return {}
+        quotas = {h: size * len(ids) / total for h, ids in self.population.items()}
+        counts = {h: int(q) for h, q in quotas.items()}
+        by_remainder = sorted(quotas, key=lambda h: counts[h] - quotas[h])
+        for h in by_remainder[:size - sum(counts.values())]:
+            counts[h] += 1
+        return {
+            h: min(len(ids), max(counts[h], _MIN_PER_STRATUM, len(self.sample.get(h, ()))))
+            for h, ids in self.population.items()
+        }
+
+    def estimate(self, values: Mapping[str, float], confidence: float = 0.95) -> Estimate:
+        """
+        Estime le total d'une valeur sur toute la population.
+
+        Args:
+            values: Valeur de chaque client tiré (absent = 0)
+            confidence: Niveau de confiance de l'intervalle
+
+        Returns:
+            L'estimation et son intervalle
+        """
+        terms, variances = [], []
+        for stratum, drawn in self.sample.items():
+            if not drawn:
+                continue
+            population = len(self.population[stratum])
+            ys = [values.get(cid, 0.0) for cid in drawn]
+            terms.append(population * fmean(ys))
+            if len(ys) > 1 and len(ys) < population:
+                fpc = 1 - len(ys) / population
+                variances.append(population * population * fpc * variance(ys) / len(ys))
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        return Estimate(math.fsum(terms), z * math.sqrt(math.fsum(variances)), confidence)
+
+    def required_size(
+        self,
+        values: Mapping[str, float],
+        target_error: float,
+        confidence: float = 0.95
+    ) -> int:
+        """
+        Taille d'échantillon pour une erreur relative cible, d'après la variance observée.
+
+        Args:
+            values: Valeur de chaque client tiré (absent = 0)
+            target_error: Demi-largeur visée, relative au total (ex: 0.02)
+            confidence: Niveau de confiance de l'intervalle
+
+        Returns:
+            Taille totale estimée nécessaire (bornée par la population)
+        """
+        total = self.population_size
+        estimate = self.estimate(values, confidence)
+        # Variance intra-strate moyenne pondérée: V(n) = N²·A/n − N·A
+        spread = math.fsum(
+            len(self.population[h]) / total * variance([values.get(cid, 0.0) for cid in drawn])
+            for h, drawn in self.sample.items() if len(drawn) > 1
+        )
+        if spread == 0.0:
+            return self.size
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        allowed = (target_error * abs(estimate.value) / z) ** 2
+        return min(total, math.ceil(total * total * spread / (allowed + total * spread)))
+
+
+@dataclass(frozen=True)
+class SampledTotals:
+    """
+    Totaux globaux estimés sur un échantillon.
+
+    Attributes:
+        plan: Plan d'échantillonnage utilisé
+        estimates: Estimation de chaque champ de ESTIMATED_FIELDS
+    """
+    plan: SamplingPlan
+    estimates: Tuple[Estimate, ...]
+
+    @classmethod
+    def from_summaries(
+        cls,
+        plan: SamplingPlan,
+        summaries: Iterable[OrderSummary],
+        confidence: float = 0.95
+    ) -> 'SampledTotals':
+        """
+        Estime les totaux à partir des résumés des clients tirés.
+
+        Args:
+            plan: Plan d'échantillonnage
+            summaries: Résumés des clients tirés (ceux sans commande n'en ont pas)
+            confidence: Niveau de confiance des intervalles
+
+        Returns:
+            Les totaux estimés
+        """
+        values: Dict[str, Dict[str, float]] = {attr: {} for _, attr in ESTIMATED_FIELDS}
+        for summary in summaries:
+            for attr, by_customer in values.items():
+                by_customer[summary.customer.id] = getattr(summary, attr)
+        return cls(plan, tuple(
+            plan.estimate(values[attr], confidence) for _, attr in ESTIMATED_FIELDS
+        ))
+
+    def format(self) -> str:
+        """Totaux estimés, au format du pied de rapport, puis l'échantillon"""
+        lines = []
+        for (label, _), estimate in zip(ESTIMATED_FIELDS, self.estimates):
+            lines.append(
+                f'{label} (estimated): {estimate.value:.2f} EUR '
+                f'± {estimate.margin:.2f} ({estimate.confidence:.0%} CI: '
+                f'{estimate.low:.2f} .. {estimate.high:.2f})'
+            )
+        strata = '' if self.plan.stratify == 'none' else f', stratified by {self.plan.stratify}'
+        lines.append(f'Sample: {self.plan.size}/{self.plan.population_size} customers{strata}')
+        return '\n'.join(lines)
@@ -3,6 +3,9 @@ Shipping Calculator
 Centralise les calculs de frais de port dispersés dans le legacy.
 """
 
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence
+
 from ..models.shipping_zone import ShippingZone
 from ..config.constants import (
     SHIPPING_FREE_THRESHOLD,
@@ -14,6 +17,47 @@ from ..config.constants import (
 )
 
 
+# Zone appliquée quand la zone du client est inconnue (comportement legacy)
+DEFAULT_ZONE = ShippingZone(zone='DEFAULT', base=5.0, per_kg=0.5)
+
+
+@dataclass(frozen=True)
+class ZoneTariff:
+    """
+    Tarif précalculé d'une zone pour le calcul par lot.
+
+    Attributes:
+        base: Tarif de base (zone ou DEFAULT_ZONE)
+        per_kg: Tarif par kg au-delà du palier lourd
+        remote: Zone éloignée (majoration REMOTE_ZONE_MARKUP)
+    """
+    base: float
+    per_kg: float
+    remote: bool
+
+
+def build_tariffs(
+    zone_names: Iterable[str],
+    shipping_zones: Dict[str, ShippingZone]
+) -> Dict[str, ZoneTariff]:
+    """
+    Résout une fois chaque nom de zone distinct en ligne de tarif.
+
+    Args:
+        zone_names: Noms de zone des clients (doublons acceptés)
+        shipping_zones: Dict des zones de livraison
+
+    Returns:
+        Tarif par nom de zone
+    """
+    tariffs = {}
+    for name in zone_names:
+        if name not in tariffs:
+            zone = shipping_zones.get(name) or DEFAULT_ZONE
+            tariffs[name] = ZoneTariff(zone.base, zone.per_kg, name in REMOTE_ZONES)
+    return tariffs
+
+
 class ShippingCalculator:
     """
     Calculateur de frais de port.
@@ -47,6 +91,46 @@ class ShippingCalculator:
         # Sinon calcul standard
         return self._calculate_standard_shipping(weight, zone, zone_name)
     
+    def calculate_many(
+        self,
+        subtotals: Sequence[float],
+        weights: Sequence[float],
+        zone_names: Sequence[str],
+        shipping_zones: Dict[str, ShippingZone]
+    ) -> List[float]:
+        """
+        Calcule les frais de port de plusieurs clients en une passe.
+
+        Les zones sont résolues une seule fois (voir build_tariffs); les
+        paliers sont ceux de calculate() (mêmes méthodes), valeurs identiques.
+
+        Args:
+            subtotals: Montant de la commande de chaque client
+            weights: Poids total de chaque client
+            zone_names: Nom de zone de chaque client
+            shipping_zones: Dict des zones de livraison
+
+        Returns:
+            Frais de port, dans l'ordre des entrées
+
+        Raises:
+            ValueError: Si les séquences n'ont pas la même longueur
+        """
+        if not len(subtotals) == len(weights) == len(zone_names):
+            raise ValueError(
+                f"Longueurs différentes: {len(subtotals)} montants, "
+                f"{len(weights)} poids, {len(zone_names)} zones"
+            )
+
+        tariffs = build_tariffs(zone_names, shipping_zones)
+        charges = []
+        for subtotal, weight, name in zip(subtotals, weights, zone_names):
+            if subtotal >= SHIPPING_FREE_THRESHOLD:
+                charges.append(self._calculate_heavy_handling(weight))
+            else:
+                charges.append(self._tariff_shipping(weight, tariffs[name]))
+        return charges
+
     def _calculate_standard_shipping(
         self,
         weight: float,
@@ -56,24 +140,76 @@ class ShippingCalculator:
         """Calcule les frais standard avec paliers de poids"""
         if not zone:
             # Fallback si zone inconnue (comportement legacy)
-            zone = ShippingZone(zone='DEFAULT', base=5.0, per_kg=0.5)
-        
-        # Calcul par palier de poids
+            zone = DEFAULT_ZONE
+        return self._tariff_shipping(
+            weight, ZoneTariff(zone.base, zone.per_kg, zone_name in REMOTE_ZONES)
+        )
+
+    @staticmethod
+    def weight_tier(weight: float) -> str:
+        """Palier de poids du tarif standard: 'heavy', 'medium' ou 'base'"""
         if weight > WEIGHT_TIERS.HEAVY:
-            ship = zone.base + (weight - WEIGHT_TIERS.HEAVY) * zone.per_kg
-        elif weight > WEIGHT_TIERS.MEDIUM:
+            return 'heavy'
+        if weight > WEIGHT_TIERS.MEDIUM:
+            return 'medium'
+        return 'base'
+
+    def describe(
+        self,
+        subtotal: float,
+        weight: float,
+        zone: ShippingZone | None,
+        zone_name: str
+    ) -> str:
+        """
+        Règle appliquée par calculate() à ces arguments (mode explain).
+
+        Args:
+            subtotal: Montant de la commande
+            weight: Poids total en kg
+            zone: Zone de livraison (objet ShippingZone)
+            zone_name: Nom de la zone
+
+        Returns:
+            Palier, zone par défaut et majoration, ex: 'medium(>5.0kg), remote markup'
+        """
+        if subtotal >= SHIPPING_FREE_THRESHOLD:
+            if self._calculate_heavy_handling(weight):
+                return f'free_shipping+heavy_handling(>{WEIGHT_TIERS.VERY_HEAVY}kg)'
+            return 'free_shipping'
+        tier = self.weight_tier(weight)
+        if tier == 'heavy':
+            rule = f'heavy(>{WEIGHT_TIERS.HEAVY}kg, per_kg)'
+        elif tier == 'medium':
+            rule = f'medium(>{WEIGHT_TIERS.MEDIUM}kg)'
+        else:
+            rule = 'base'
+        if not zone:
+            rule += ', zone DEFAULT'
+        if zone_name in REMOTE_ZONES:
+            rule += ', remote markup'
+        return rule
+
+    def _tariff_shipping(self, weight: float, tariff: ZoneTariff) -> float:
+        """Frais standard d'un tarif de zone (calculate et calculate_many)"""
+        # Calcul par palier de poids
+        tier = self.weight_tier(weight)
+        if tier == 'heavy':
+            ship = tariff.base + (weight - WEIGHT_TIERS.HEAVY) * tariff.per_kg
+        elif tier == 'medium':
             # Palier intermédiaire (règle cachée legacy)
-            ship = zone.base + (weight - WEIGHT_TIERS.MEDIUM) * 0.3
+            ship = tariff.base + (weight - WEIGHT_TIERS.MEDIUM) * 0.3
         else:
-            ship = zone.base
+            ship = tariff.base
         
         # Majoration zones éloignées
-        if zone_name in REMOTE_ZONES:
+        if tariff.remote:
             ship *= REMOTE_ZONE_MARKUP
         
         return ship
     
-    def _calculate_heavy_handling(self, weight: float) -> float:
+    @staticmethod
+    def _calculate_heavy_handling(weight: float) -> float:
         """Frais de manutention pour livraison gratuite avec poids élevé"""
         if weight > WEIGHT_TIERS.VERY_HEAVY:
             return (weight - WEIGHT_TIERS.VERY_HEAVY) * 0.25
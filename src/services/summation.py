@@ -0,0 +1,32 @@
+"""
+Summation
+Mode de sommation des montants d'un client.
+
+- Séquentiel (défaut): additions flottantes dans l'ordre des lignes, comme
+  le legacy. Le rapport reste identique au legacy, centime pour centime.
+- Exact (opt-in): math.fsum, arrondi une seule fois. Le résultat ne dépend
+  ni de l'ordre ni du découpage des lignes: c'est celui des agrégats
+  fusionnés (LineAggregate, rollups, registre de fidélité), et il peut
+  différer du séquentiel d'un centime quand les additions ont dérivé.
+"""
+
+from math import fsum
+from typing import Callable, Iterable
+
+
+def sequential_sum(values: Iterable[float]) -> float:
+    """
+    Somme flottante de gauche à droite, comme les boucles `+=` du legacy.
+
+    Pas de sum(): depuis Python 3.12 il compense les erreurs d'arrondi et
+    ne reproduit plus le legacy.
+    """
+    total = 0.0
+    for value in values:
+        total += value
+    return total
+
+
+def summation(exact: bool) -> Callable[[Iterable[float]], float]:
+    """Fonction de sommation: math.fsum si exact, sinon sequential_sum"""
+    return fsum if exact else sequential_sum
@@ -3,10 +3,13 @@ Tax Calculator
 Centralise les calculs de taxes dispersés dans le legacy.
 """
 
-from typing import List, Dict
+from typing import Dict, Iterable, List
+from ..models.enriched_line import EnrichedLine
 from ..models.order import Order
 from ..models.product import Product
 from ..config.constants import TAX_RATE
+from .order_enricher import OrderEnricher
+from .summation import summation
 
 
 class TaxCalculator:
@@ -15,12 +18,16 @@ class TaxCalculator:
     Responsabilité unique: calculer les taxes selon les produits taxables.
     """
     
-    def __init__(self, tax_rate: float = TAX_RATE):
+    def __init__(self, tax_rate: float = TAX_RATE, exact_sums: bool = False):
         """
         Args:
             tax_rate: Taux de taxe (défaut: 20%)
+            exact_sums: Somme exacte (math.fsum) des taxes par ligne au lieu
+                de la somme séquentielle legacy
         """
         self.tax_rate = tax_rate
+        self.exact_sums = exact_sums
+        self._sum = summation(exact_sums)
     
     def calculate(
         self,
@@ -45,35 +52,65 @@ class TaxCalculator:
         Returns:
             Montant de la taxe arrondi à 2 décimales
         """
-        if self._all_taxable(items, products):
-            return round(taxable_amount * self.tax_rate, 2)
+        lines = OrderEnricher().enrich(items, products, {})
+        return self.calculate_lines(lines, taxable_amount)
+    
+    def calculate_lines(
+        self,
+        lines: List[EnrichedLine],
+        taxable_amount: float
+    ) -> float:
+        """
+        Calcule la taxe à partir des lignes enrichies (produits déjà joints).
+        
+        Args:
+            lines: Lignes enrichies du client
+            taxable_amount: Montant taxable (après remises)
+            
+        Returns:
+            Montant de la taxe arrondi à 2 décimales
+        """
+        if self._all_taxable(lines):
+            return self.calculate_totals(True, taxable_amount, 0.0)
         
-        return self._calculate_per_line(items, products)
+        return self.calculate_totals(False, taxable_amount, self._line_tax_total(lines))
     
-    def _all_taxable(
+    def calculate_totals(
         self,
-        items: List[Order],
-        products: Dict[str, Product]
-    ) -> bool:
+        all_taxable: bool,
+        taxable_amount: float,
+        line_tax_total: float
+    ) -> float:
+        """
+        Calcule la taxe à partir d'agrégats déjà cumulés (voir LineAggregate).
+        
+        Args:
+            all_taxable: Si toutes les lignes sont taxables
+            taxable_amount: Montant taxable (après remises)
+            line_tax_total: Somme des taxes par ligne (voir line_tax)
+            
+        Returns:
+            Montant de la taxe arrondi à 2 décimales
+        """
+        if all_taxable:
+            return round(taxable_amount * self.tax_rate, 2)
+        return round(line_tax_total, 2)
+    
+    def line_tax(self, line: EnrichedLine) -> float:
+        """Taxe d'une ligne pour le calcul ligne par ligne (commandes mixtes)"""
+        # Produits inconnus exclus (comportement legacy)
+        if line.product_found and line.taxable:
+            item_total = line.order.qty * line.base_price
+            return item_total * self.tax_rate
+        return 0.0
+    
+    def _all_taxable(self, lines: List[EnrichedLine]) -> bool:
         """Vérifie si tous les produits de la commande sont taxables"""
-        for item in items:
-            prod = products.get(item.product_id)
-            if prod and not prod.taxable:
+        for line in lines:
+            if not line.taxable:
                 return False
         return True
     
-    def _calculate_per_line(
-        self,
-        items: List[Order],
-        products: Dict[str, Product]
-    ) -> float:
-        """Calcule la taxe ligne par ligne (pour commandes mixtes)"""
-        tax = 0.0
-        
-        for item in items:
-            prod = products.get(item.product_id)
-            if prod and prod.taxable:
-                item_total = item.qty * prod.price
-                tax += item_total * self.tax_rate
-        
-        return round(tax, 2)
+    def _line_tax_total(self, lines: Iterable[EnrichedLine]) -> float:
+        """Somme des taxes par ligne, dans l'ordre des lignes (pour commandes mixtes)"""
+        return self._sum(self.line_tax(line) for line in lines)
@@ -0,0 +1,131 @@
+"""
+Tests du traitement par lot
+Vérifie que chaque rapport du lot est identique au rapport de main sur le
+même jeu de données, et que les références communes ne sont lues qu'une fois.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.main import main
+from src.pipeline.batch import BatchRunner, Dataset
+from src.repositories.product_repository import ProductRepository
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+@pytest.fixture
+def regions(tmp_path):
+    """Deux régions (commandes + clients) partageant les références de legacy/data"""
+    for name, line_count in (('north', None), ('south', 12)):
+        region = tmp_path / name
+        region.mkdir()
+        shutil.copy(DATA_PATH / 'customers.csv', region)
+        lines = (DATA_PATH / 'orders.csv').read_text(encoding='utf-8').splitlines(keepends=True)
+        (region / 'orders.csv').write_text(''.join(lines[:line_count]), encoding='utf-8')
+    return tmp_path
+
+
+def _single_report(region: Path, tmp_path: Path, capsys) -> str:
+    """Rapport de main sur un répertoire complet (région + références)"""
+    full = tmp_path / f'full-{region.name}'
+    shutil.copytree(DATA_PATH, full)
+    shutil.copy(region / 'orders.csv', full / 'orders.csv')
+    report = main(['--data-dir', str(full)])
+    capsys.readouterr()
+    return report + '\n'
+
+
+class TestBatchRunner:
+    """Tests de BatchRunner"""
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_reports_match_single_runs(self, regions, tmp_path, capsys, jobs):
+        """Test un rapport par région, identique à main sur cette région"""
+        out_dir = tmp_path / 'out'
+        results = BatchRunner(DATA_PATH, out_dir, jobs).run(
+            Dataset.from_path(regions / name) for name in ('north', 'south')
+        )
+
+        assert [r.error for r in results] == [None, None]
+        for name in ('north', 'south'):
+            expected = _single_report(regions / name, tmp_path, capsys)
+            assert (out_dir / f'{name}.txt').read_text(encoding='utf-8') == expected
+
+    def test_shared_references_parsed_once(self, regions, tmp_path, monkeypatch):
+        """Test produits communs parsés une fois pour tout le lot"""
+        calls = []
+        original = ProductRepository.load_all
+        monkeypatch.setattr(
+            ProductRepository, 'load_all',
+            lambda self, *args, **kwargs: calls.append(args) or original(self, *args, **kwargs)
+        )
+        datasets = [Dataset.from_path(regions / 'north'), Dataset.from_path(regions / 'south')]
+        BatchRunner(DATA_PATH, tmp_path / 'out').run(datasets)
+
+        assert len(calls) == 1
+
+    def test_local_reference_overrides_shared(self, regions, tmp_path, capsys):
+        """Test products.csv propre à une région: utilisé pour cette région seulement"""
+        rows = (DATA_PATH / 'products.csv').read_text(encoding='utf-8').splitlines()
+        doubled = [rows[0]] + [
+            ','.join(f[:3] + [f'{float(f[3]) * 2:.2f}'] + f[4:])
+            for f in (row.split(',') for row in rows[1:])
+        ]
+        (regions / 'south' / 'products.csv').write_text('\n'.join(doubled) + '\n', encoding='utf-8')
+        out_dir = tmp_path / 'out'
+        BatchRunner(DATA_PATH, out_dir).run(
+            Dataset.from_path(regions / name) for name in ('north', 'south')
+        )
+
+        full = tmp_path / 'full-south'
+        shutil.copytree(DATA_PATH, full)
+        for name in ('orders.csv', 'products.csv'):
+            shutil.copy(regions / 'south' / name, full / name)
+        expected_south = main(['--data-dir', str(full)]) + '\n'
+        capsys.readouterr()
+        assert (out_dir / 'south.txt').read_text(encoding='utf-8') == expected_south
+        assert (out_dir / 'north.txt').read_text(encoding='utf-8') == \
+            _single_report(regions / 'north', tmp_path, capsys)
+
+    def test_order_file_dataset_and_errors(self, regions, tmp_path):
+        """Test fichier de commandes seul, jeu manquant en erreur, noms en double refusés"""
+        shutil.copy(regions / 'north' / 'orders.csv', regions / 'north' / 'east.csv')
+        results = BatchRunner(DATA_PATH, tmp_path / 'out').run([
+            Dataset.from_path(regions / 'north' / 'east.csv'),
+            Dataset.from_path(regions / 'missing'),
+        ])
+
+        assert results[0].error is None and results[0].totals.customers == 10
+        assert results[1].report_path is None and 'introuvable' in results[1].error
+        with pytest.raises(ValueError):
+            BatchRunner(DATA_PATH, tmp_path / 'out').run([Dataset.from_path(regions / 'north')] * 2)
+
+    @pytest.mark.parametrize('options', [
+        ['--customers', 'C001'],
+        ['--customers-file', 'ids.txt'],
+        ['--totals'],
+        ['--top', '3'],
+        ['--split-dir', 'split'],
+        ['--columnar'],
+        ['--workers', '2'],
+        ['--rejects-dir', 'rejects'],
+        ['--sorted-input'],
+        ['--exact-sums'],
+        ['--explain', 'C001'],
+        ['--rollups', 'rollups.txt'],
+        ['--loyalty-ledger', 'loyalty.ledger'],
+        ['--metrics-file', 'metrics.prom'],
+        ['--sample', '5'],
+        ['--target-error', '0.1'],
+        ['--watch'],
+    ], ids=lambda options: options[0])
+    def test_options_ignored_by_batch_rejected(self, tmp_path, options, capsys):
+        """Test option sans effet en mode lot: erreur d'usage au lieu d'être ignorée"""
+        with pytest.raises(SystemExit):
+            main(['--batch', str(DATA_PATH), '--out-dir', str(tmp_path / 'out'), *options])
+        assert 'incompatible avec ' + options[0] in capsys.readouterr().err
+        assert not (tmp_path / 'out').exists()
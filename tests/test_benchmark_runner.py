@@ -0,0 +1,85 @@
+"""
+Tests du harnais de benchmarks
+Vérifie la détection de régressions (hors mesures réelles de performance).
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from benchmarks.runner import (
+    STAGES, StageResult, build_baseline, compare, load_baseline, run_stages
+)
+from src.repositories.parse_cache import PARSE_CACHE
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+def _baseline(median_s=1.0, iqr_s=0.01, peak_bytes=1000):
+    results = {'process': StageResult(100, median_s, iqr_s, peak_bytes)}
+    return build_baseline('small', 5, results)
+
+
+class TestCompare:
+    """Tests de compare()"""
+
+    def test_within_tolerance_passes(self):
+        """Test un ralentissement sous la tolérance n'est pas signalé"""
+        current = {'process': StageResult(100, 1.2, 0.01, 1050)}
+
+        assert compare(_baseline(), current, time_tolerance=0.25) == []
+
+    def test_slowdown_is_reported(self):
+        """Test ralentissement x3 signalé"""
+        current = {'process': StageResult(100, 3.0, 0.01, 1000)}
+
+        regressions = compare(_baseline(), current)
+
+        assert [(r.stage, r.metric) for r in regressions] == [('process', 'time')]
+
+    def test_noisy_runs_are_not_reported(self):
+        """Test écart inférieur au bruit (IQR) non signalé"""
+        current = {'process': StageResult(100, 1.5, 0.6, 1000)}
+
+        assert compare(_baseline(iqr_s=0.4), current) == []
+
+    def test_memory_growth_is_reported(self):
+        """Test hausse du pic mémoire signalée"""
+        current = {'process': StageResult(100, 1.0, 0.01, 2000)}
+
+        regressions = compare(_baseline(), current)
+
+        assert [(r.stage, r.metric) for r in regressions] == [('process', 'memory')]
+
+
+class TestBaseline:
+    """Tests de la baseline JSON"""
+
+    def test_run_and_reload(self, tmp_path):
+        """Test toutes les étapes mesurées, baseline relue"""
+        results = run_stages(DATA_PATH, repeats=1)
+        path = tmp_path / 'baseline.json'
+        path.write_text(json.dumps(build_baseline('small', 1, results)), encoding='utf-8')
+
+        baseline = load_baseline(path)
+
+        assert list(results) == list(STAGES)
+        assert results['load_orders'].items == 25
+        assert compare(baseline, results, time_tolerance=10) == []
+
+    def test_loads_measured_without_parse_cache(self):
+        """Test répétitions chronométrées parsées à nouveau, pas servies par le cache"""
+        before = PARSE_CACHE.stats()
+        run_stages(DATA_PATH, repeats=3)
+
+        assert PARSE_CACHE.stats().hits == before.hits
+
+    def test_format_version_mismatch_raises(self, tmp_path):
+        """Test baseline d'un ancien format refusée"""
+        path = tmp_path / 'baseline.json'
+        path.write_text(json.dumps({**_baseline(), 'format_version': 0}), encoding='utf-8')
+
+        with pytest.raises(ValueError, match='format'):
+            load_baseline(path)
@@ -0,0 +1,74 @@
+"""
+Tests du mode explain (trace de calcul)
+Vérifie que la trace reprend les montants du rapport sans les modifier.
+"""
+
+import json
+
+from src.main import main
+from src.models.shipping_zone import ShippingZone
+from src.services.calculation_trace import TracingOrderProcessor, _RecordingCalculator
+from src.services.order_processor import OrderProcessor
+from src.services.shipping_calculator import ShippingCalculator
+from src.services.summation import sequential_sum
+
+
+class TestCalculationTrace:
+    """Tests de --explain"""
+
+    def test_report_unchanged_and_trace_written(self, tmp_path):
+        """Test rapport identique, trace des seuls clients demandés"""
+        trace_file = tmp_path / 'trace.json'
+
+        report = main(['--explain', 'C002,C004', '--trace-file', str(trace_file)])
+
+        assert report == main([])
+        traces = json.loads(trace_file.read_text(encoding='utf-8'))
+        assert sorted(traces) == ['C002', 'C004']
+
+    def test_trace_matches_summary(self, tmp_path):
+        """Test lignes et étapes cohérentes avec le résumé"""
+        trace_file = tmp_path / 'trace.json'
+        main(['--explain', 'C002', '--trace-file', str(trace_file)])
+
+        trace = json.loads(trace_file.read_text(encoding='utf-8'))['C002']
+        summary = trace['summary']
+
+        # Montants par ligne retenus par le calcul (sommes séquentielles par défaut)
+        assert sequential_sum(line['line_total'] for line in trace['lines']) == summary['subtotal']
+        assert sequential_sum(line['weight'] for line in trace['lines']) == summary['weight']
+        steps = {step['step']: step for step in trace['steps']}
+        assert steps['tax.calculate_lines']['result'] == summary['tax'] / trace['currency_rate']
+        assert steps['shipping.calculate']['result'] == summary['shipping']
+        assert steps['discount.apply_max_discount_cap']['result'] == [
+            summary['volume_discount'], summary['loyalty_discount']
+        ]
+        assert trace['tax_mode'] in ('global', 'per_line')
+        shipping_args = steps['shipping.calculate']['args']
+        assert trace['shipping_rule'] == ShippingCalculator().describe(
+            shipping_args[0], shipping_args[1],
+            ShippingZone(**shipping_args[2]) if shipping_args[2] else None, shipping_args[3]
+        )
+
+    def test_recorded_calls_forward_keyword_arguments(self):
+        """Test appel par mots-clés: transmis au calculateur et enregistré"""
+        steps = []
+        shipping = _RecordingCalculator('shipping', ShippingCalculator(), steps)
+
+        result = shipping.calculate(30.0, weight=7.0, zone=None, zone_name='ZONE3')
+
+        assert result == ShippingCalculator().calculate(30.0, 7.0, None, 'ZONE3')
+        assert steps == [{
+            'step': 'shipping.calculate', 'args': [30.0],
+            'kwargs': {'weight': 7.0, 'zone': None, 'zone_name': 'ZONE3'}, 'result': result,
+        }]
+        assert shipping.last_call('calculate') == (
+            (30.0,), {'weight': 7.0, 'zone': None, 'zone_name': 'ZONE3'}
+        )
+
+    def test_untraced_customers_use_plain_calculation(self):
+        """Test aucune trace sans client sélectionné"""
+        processor = TracingOrderProcessor([])
+
+        assert isinstance(processor, OrderProcessor)
+        assert processor.to_json() == '{}'
@@ -0,0 +1,92 @@
+"""
+Tests du format colonnaire
+Vérifie l'aller-retour CSV -> binaire -> Order et l'identité du rapport.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.main import main
+from src.repositories.columnar_store import ColumnarStore
+from src.repositories.order_repository import OrderRepository
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Copie des données legacy (le fichier colonnaire est écrit à côté)"""
+    target = tmp_path / 'data'
+    shutil.copytree(DATA_PATH, target)
+    return target
+
+
+class TestColumnarStore:
+    """Tests de ColumnarStore"""
+
+    def test_round_trip_orders(self, data_dir):
+        """Test commandes identiques à celles du CSV"""
+        with ColumnarStore.load_or_build(data_dir) as store:
+            assert list(store.iter_orders()) == OrderRepository().load_all(data_dir / 'orders.csv')
+            assert store.order(3).id == 'O004'
+
+    def test_columns_are_zero_copy_views(self, data_dir):
+        """Test colonnes numériques et codes exposés en memoryview"""
+        orders = OrderRepository().load_all(data_dir / 'orders.csv')
+
+        with ColumnarStore.load_or_build(data_dir) as store:
+            qty = store.column('qty')
+            customers = store.dictionary('customer_id')
+
+            assert isinstance(qty, memoryview)
+            assert list(qty) == [o.qty for o in orders]
+            assert [customers[c] for c in store.column('customer_id')] == [o.customer_id for o in orders]
+            assert list(store.column('date_key')) == [int(o.date.replace('-', '')) for o in orders]
+
+    def test_filters_match_csv_path(self, data_dir):
+        """Test filtres dates/clients identiques au chargement CSV"""
+        expected = OrderRepository().load_all(
+            data_dir / 'orders.csv', '2025-01-18', '2025-01-26', customer_ids={'C001', 'C002'}
+        )
+
+        with ColumnarStore.load_or_build(data_dir) as store:
+            orders = list(store.iter_orders('2025-01-18', '2025-01-26', {'C001', 'C002'}))
+
+        assert orders == expected
+
+    def test_date_filter_keeps_string_order_for_odd_dates(self, data_dir):
+        """Test date inexistante au bon format gardée, date hors format écartée (comme le CSV)"""
+        with open(data_dir / 'orders.csv', 'a', encoding='utf-8') as f:
+            f.write('O900,C001,P001,1,10.00,2025-01-32,,10:00\n')
+            f.write('O901,C001,P001,1,10.00,2025/01/20,,10:00\n')
+        expected = OrderRepository().load_all(data_dir / 'orders.csv', '2025-01-20', '2025-02-01')
+
+        with ColumnarStore.load_or_build(data_dir) as store:
+            orders = list(store.iter_orders('2025-01-20', '2025-02-01'))
+            with pytest.raises(ValueError):
+                next(store.iter_orders('2025-1-20'))
+
+        assert orders == expected
+        assert 'O900' in {o.id for o in orders} and 'O901' not in {o.id for o in orders}
+
+    def test_rebuilt_when_source_changes(self, data_dir):
+        """Test reconversion quand orders.csv change"""
+        ColumnarStore.load_or_build(data_dir).close()
+        with open(data_dir / 'orders.csv', 'a', encoding='utf-8') as f:
+            f.write('O999,C001,P001,1,10.00,2025-02-01,,10:00\n')
+
+        with ColumnarStore.load_or_build(data_dir) as store:
+            assert len(store) == 26
+
+
+class TestColumnarReport:
+    """Tests du rapport depuis le fichier colonnaire"""
+
+    def test_report_matches_csv_path(self, data_dir):
+        """Test rapport identique (complet, plage, sous-ensemble)"""
+        for options in ([], ['--from', '2025-01-18'], ['--customers', 'C002,C007']):
+            csv_report = main(['--data-dir', str(data_dir)] + options)
+            assert main(['--data-dir', str(data_dir), '--columnar'] + options) == csv_report
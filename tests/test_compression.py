@@ -0,0 +1,82 @@
+"""
+Tests de la lecture des CSV compressés
+Vérifie que gzip/bz2/xz donnent exactement le même résultat que le CSV brut.
+"""
+
+import bz2
+import gzip
+import lzma
+from pathlib import Path
+
+import pytest
+
+from src.main import main
+from src.repositories.compression import detect_compression, resolve_csv_path
+from src.repositories.order_repository import OrderRepository
+from src.repositories.parse_cache import PARSE_CACHE
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+COMPRESSORS = {'.gz': gzip.compress, '.bz2': bz2.compress, '.xz': lzma.compress}
+
+
+def _compress(source: Path, target: Path, suffix: str) -> Path:
+    target.write_bytes(COMPRESSORS[suffix](source.read_bytes()))
+    return target
+
+
+class TestCompressedOrders:
+    """Tests du chargement de orders.csv compressé"""
+
+    @pytest.mark.parametrize('suffix', sorted(COMPRESSORS))
+    def test_same_orders_as_plain_csv(self, tmp_path, suffix):
+        """Test mêmes commandes que le CSV non compressé"""
+        path = _compress(DATA_PATH / 'orders.csv', tmp_path / f'orders.csv{suffix}', suffix)
+
+        assert detect_compression(path) == {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz'}[suffix]
+        assert OrderRepository().load_all(path) == OrderRepository().load_all(DATA_PATH / 'orders.csv')
+
+    def test_detected_by_magic_bytes(self, tmp_path):
+        """Test fichier gzip sans extension .gz détecté par sa signature"""
+        path = _compress(DATA_PATH / 'orders.csv', tmp_path / 'orders.csv', '.gz')
+
+        assert detect_compression(path) == 'gzip'
+        assert len(OrderRepository().load_all(path)) == 25
+
+    def test_date_range_and_workers_fall_back_to_streaming(self, tmp_path):
+        """Test plage de dates et workers sans index ni découpage"""
+        # Copie: l'index de dates du CSV brut est écrit à côté du fichier
+        source = tmp_path / 'plain' / 'orders.csv'
+        source.parent.mkdir()
+        source.write_bytes((DATA_PATH / 'orders.csv').read_bytes())
+        path = _compress(source, tmp_path / 'orders.csv.gz', '.gz')
+        plain = OrderRepository().load_all(
+            source, '2025-01-18', '2025-01-26', customer_ids={'C001', 'C002'}
+        )
+
+        compressed = OrderRepository().load_all(
+            path, '2025-01-18', '2025-01-26', customer_ids={'C001', 'C002'}
+        )
+
+        assert compressed == plain
+        assert not path.with_name('orders.csv.gz.dateidx').exists()
+        parallel = OrderRepository().load_all(path, workers=4)
+        PARSE_CACHE.invalidate(path)
+        assert parallel == OrderRepository().load_all(path)
+
+
+class TestResolveCsvPath:
+    """Tests de resolve_csv_path"""
+
+    def test_compressed_sibling_is_used(self, tmp_path):
+        """Test orders.csv absent: orders.csv.xz utilisé"""
+        _compress(DATA_PATH / 'orders.csv', tmp_path / 'orders.csv.xz', '.xz')
+
+        assert resolve_csv_path(tmp_path / 'orders.csv') == tmp_path / 'orders.csv.xz'
+
+    def test_report_from_compressed_directory(self, tmp_path):
+        """Test rapport identique avec tous les CSV compressés"""
+        for source in DATA_PATH.glob('*.csv'):
+            _compress(source, tmp_path / f'{source.name}.gz', '.gz')
+
+        assert main(['--data-dir', str(tmp_path)]) == main([])
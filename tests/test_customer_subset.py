@@ -0,0 +1,85 @@
+"""
+Tests du rapport ciblé sur un sous-ensemble de clients
+Vérifie que les sections sont identiques à celles du rapport complet.
+"""
+
+from pathlib import Path
+
+from src.main import main
+from src.repositories.csv_repository import ColumnFilter
+from src.repositories.order_repository import OrderRepository
+from src.repositories.product_repository import ProductRepository
+from src.services.report_queries import GrandTotals
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+def _sections(report: str) -> dict:
+    """Sections client d'un rapport, indexées par ID"""
+    sections = {}
+    for block in report.split('\n\n'):
+        first_line = block.splitlines()[0]
+        if first_line.startswith('Customer: '):
+            sections[first_line.rsplit('(', 1)[1].rstrip(')')] = block
+    return sections
+
+
+class TestCustomerSubset:
+    """Tests de --customers / --customers-file"""
+
+    def test_sections_match_full_report(self):
+        """Test sections identiques, totaux sur le sous-ensemble"""
+        full = _sections(main([]))
+
+        report = main(['--customers', 'C007,C002'])
+        subset = _sections(report)
+
+        assert list(subset) == ['C002', 'C007']
+        assert subset == {cid: full[cid] for cid in ('C002', 'C007')}
+        assert report.endswith(main(['--customers', 'C002,C007', '--totals']))
+
+    def test_customers_file(self, tmp_path):
+        """Test liste d'IDs depuis un fichier"""
+        ids_file = tmp_path / 'ids.txt'
+        ids_file.write_text('C004\n\nC009\n', encoding='utf-8')
+
+        assert main(['--customers-file', str(ids_file)]) == main(['--customers', 'C004,C009'])
+
+    def test_unknown_customer_gives_empty_report(self):
+        """Test ID inexistant: aucun client, totaux à zéro"""
+        assert main(['--customers', 'C999']) == GrandTotals().format()
+
+
+class TestSemiJoin:
+    """Tests des filtres appliqués au chargement"""
+
+    def test_orders_filtered_before_mapping(self):
+        """Test lignes écartées ni mappées ni rejetées"""
+        repo = OrderRepository()
+        orders = repo.load_all(DATA_PATH / 'orders.csv', customer_ids={'C001'})
+
+        assert [o.id for o in orders] == ['O001', 'O002', 'O022']
+        assert repo.last_stats.rows_read == 3
+        assert repo.last_stats.rows_rejected == 0
+
+    def test_orders_filter_combines_with_date_range_and_workers(self, tmp_path):
+        """Test filtre client + plage de dates / parsing parallèle"""
+        orders_path = tmp_path / 'orders.csv'
+        orders_path.write_bytes((DATA_PATH / 'orders.csv').read_bytes())
+        repo = OrderRepository()
+
+        in_range = repo.load_all(orders_path, '2025-01-16', '2025-01-31', customer_ids={'C002'})
+        parallel = repo.repo.load_parallel(
+            orders_path, workers=2, min_chunk_bytes=1,
+            row_filter=ColumnFilter.of('customer_id', {'C002'})
+        )
+
+        assert [o.id for o in in_range] == ['O003', 'O004', 'O005', 'O023']
+        assert parallel == in_range
+
+    def test_only_referenced_products(self):
+        """Test chargement des seuls produits référencés"""
+        products = ProductRepository().load_all(DATA_PATH / 'products.csv', ids={'P001', 'P404'})
+
+        assert list(products) == ['P001']
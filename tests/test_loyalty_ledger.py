@@ -0,0 +1,177 @@
+"""
+Tests du registre de fidélité
+Vérifie que les points lus dans le registre égalent le recalcul sur tout
+l'historique, et qu'aucune commande n'est comptée deux fois.
+"""
+
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src.main import main
+from src.pipeline.loyalty_ledger import LedgerLoyaltyCalculator, LoyaltyLedger, _encode
+from src.repositories.order_repository import OrderRepository
+from src.services.loyalty_calculator import LoyaltyCalculator
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+@pytest.fixture
+def orders():
+    return OrderRepository().load_all(DATA_PATH / 'orders.csv')
+
+
+def _expected_points(orders, customer_id):
+    return LoyaltyCalculator(exact_sums=True).calculate_points(o for o in orders if o.customer_id == customer_id)
+
+
+def _commit_in_process(path, orders):
+    """Exécution complète (ouverture, stage, commit) dans un autre processus"""
+    ledger = LoyaltyLedger(path)
+    list(ledger.stage(orders))
+    return ledger.commit()
+
+
+class TestLoyaltyLedger:
+    """Tests de LoyaltyLedger"""
+
+    def test_incremental_runs_equal_full_history(self, tmp_path, orders):
+        """Test historique validé en deux exécutions = points recalculés sur tout l'historique"""
+        path = tmp_path / 'loyalty.ledger'
+        half = len(orders) // 2
+        for batch in (orders[:half], orders[half:]):
+            ledger = LoyaltyLedger(path)
+            list(ledger.stage(batch))
+            ledger.commit()
+
+        ledger = LoyaltyLedger(path)
+        for cid in {o.customer_id for o in orders}:
+            assert ledger.points(cid) == _expected_points(orders, cid)
+        assert sum(ledger.order_count(cid) for cid in {o.customer_id for o in orders}) == len(orders)
+
+    def test_no_double_count(self, tmp_path, orders):
+        """Test commandes déjà comptées ou exécution non validée: rien n'est ajouté"""
+        path = tmp_path / 'loyalty.ledger'
+        ledger = LoyaltyLedger(path)
+        list(ledger.stage(orders))
+        assert ledger.commit() == len(orders)
+
+        # Exécution interrompue avant commit: rien d'écrit
+        crashed = LoyaltyLedger(path)
+        list(crashed.stage(orders[:3]))
+        size = path.stat().st_size
+
+        rerun = LoyaltyLedger(path)
+        list(rerun.stage(orders))
+        assert rerun.commit() == 0
+        assert path.stat().st_size == size
+        assert rerun.points('C001') == _expected_points(orders, 'C001')
+
+    def test_torn_tail_ignored_and_truncated(self, tmp_path, orders):
+        """Test fin de fichier incomplète (arrêt pendant l'écriture) ignorée puis retirée"""
+        path = tmp_path / 'loyalty.ledger'
+        ledger = LoyaltyLedger(path)
+        list(ledger.stage(orders[:5]))
+        ledger.commit()
+        with open(path, 'ab') as f:
+            f.write(b'0badc0de {"C001":{"orders":["O0')
+
+        ledger = LoyaltyLedger(path)
+        assert sum(ledger.order_count(cid) for cid in ('C001', 'C002', 'C003')) == 5
+        list(ledger.stage(orders))
+        assert ledger.commit() == len(orders) - 5
+
+        reopened = LoyaltyLedger(path)
+        for cid in {o.customer_id for o in orders}:
+            assert reopened.points(cid) == _expected_points(orders, cid)
+
+    def test_partially_known_record_adds_only_new_orders(self, tmp_path, orders):
+        """Test enregistrement dont une partie des commandes est déjà comptée"""
+        path = tmp_path / 'loyalty.ledger'
+        first, second = [o for o in orders if o.customer_id == 'C001'][:2]
+        path.write_bytes(
+            _encode({'C001': {'orders': {first.id: first.line_total()}}})
+            + _encode({'C001': {'orders': {
+                first.id: first.line_total(), second.id: second.line_total()
+            }}})
+        )
+
+        ledger = LoyaltyLedger(path)
+
+        assert ledger.order_count('C001') == 2
+        assert ledger.points('C001') == _expected_points([first, second], 'C001')
+
+    def test_concurrent_ledgers_do_not_double_count(self, tmp_path, orders):
+        """Test deux exécutions ouvertes en même temps, commandes en commun, compaction intercalée"""
+        path = tmp_path / 'loyalty.ledger'
+        first, second, third = LoyaltyLedger(path), LoyaltyLedger(path), LoyaltyLedger(path)
+        list(first.stage(orders[:15]))
+        list(second.stage(orders[10:]))
+        list(third.stage(orders))
+
+        assert first.commit() == 15
+        assert second.commit() == len(orders) - 15
+        LoyaltyLedger(path).compact()
+        assert third.commit() == 0
+
+        reopened = LoyaltyLedger(path)
+        for cid in {o.customer_id for o in orders}:
+            assert reopened.points(cid) == _expected_points(orders, cid)
+
+    def test_parallel_processes_count_each_order_once(self, tmp_path, orders):
+        """Test commits simultanés de plusieurs processus (verrou exclusif)"""
+        path = tmp_path / 'loyalty.ledger'
+        batches = [orders[i:i + 12] for i in range(0, len(orders), 6)]
+
+        with ProcessPoolExecutor(max_workers=len(batches)) as executor:
+            added = list(executor.map(_commit_in_process, [path] * len(batches), batches))
+
+        assert sum(added) == len(orders)
+        ledger = LoyaltyLedger(path)
+        for cid in {o.customer_id for o in orders}:
+            assert ledger.points(cid) == _expected_points(orders, cid)
+
+    def test_compaction_keeps_points(self, tmp_path, orders):
+        """Test compaction: un seul enregistrement, mêmes points"""
+        path = tmp_path / 'loyalty.ledger'
+        for order in orders[:4]:
+            ledger = LoyaltyLedger(path)
+            list(ledger.stage([order]))
+            ledger.commit()
+        ledger = LoyaltyLedger(path)
+        before = {cid: ledger.points(cid) for cid in ('C001', 'C002')}
+        ledger.compact()
+
+        assert len(path.read_bytes().splitlines()) == 1
+        reopened = LoyaltyLedger(path)
+        assert {cid: reopened.points(cid) for cid in before} == before
+
+    def test_report_with_ledger_matches_plain_report(self, tmp_path, capsys):
+        """Test --loyalty-ledger sur tout l'historique: rapport identique, relançable"""
+        data_dir = tmp_path / 'data'
+        shutil.copytree(DATA_PATH, data_dir)
+        ledger_path = tmp_path / 'loyalty.ledger'
+        expected = main(['--data-dir', str(data_dir)])
+
+        assert main(['--data-dir', str(data_dir), '--loyalty-ledger', str(ledger_path)]) == expected
+        assert main([
+            '--data-dir', str(data_dir), '--loyalty-ledger', str(ledger_path), '--compact-ledger'
+        ]) == expected
+        capsys.readouterr()
+
+    def test_compact_without_ledger_rejected(self, capsys):
+        """Test --compact-ledger sans --loyalty-ledger: erreur d'usage au lieu d'être ignoré"""
+        with pytest.raises(SystemExit):
+            main(['--compact-ledger'])
+        assert "--compact-ledger n'a d'effet qu'avec --loyalty-ledger" in capsys.readouterr().err
+
+    def test_calculator_initialized_as_loyalty_calculator(self, tmp_path):
+        """Test calculateur du registre: attributs de LoyaltyCalculator présents (sommes exactes)"""
+        calculator = LedgerLoyaltyCalculator(LoyaltyLedger(tmp_path / 'loyalty.ledger'))
+
+        assert calculator.exact_sums is True
+        assert calculator.points_for_total(calculator._sum([0.1] * 10)) == \
+            LoyaltyCalculator(exact_sums=True).points_for_total(1.0)
@@ -0,0 +1,120 @@
+"""
+Tests de l'index par date des commandes
+Vérifie que les rapports filtrés par dates équivalent à un orders.csv pré-filtré.
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.main import main
+from src.repositories.order_date_index import OrderDateIndex
+from src.repositories.order_repository import OrderRepository
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Copie des données legacy (l'index est écrit à côté du CSV)"""
+    target = tmp_path / 'data'
+    shutil.copytree(DATA_PATH, target)
+    return target
+
+
+def _prefiltered_copy(data_dir: Path, target: Path, start: str, end: str) -> Path:
+    """Copie du jeu de données avec un orders.csv filtré à la main"""
+    shutil.copytree(data_dir, target)
+    lines = (data_dir / 'orders.csv').read_text(encoding='utf-8').splitlines(keepends=True)
+    kept = [lines[0]] + [
+        line for line in lines[1:] if start <= line.split(',')[5] <= end
+    ]
+    (target / 'orders.csv').write_text(''.join(kept), encoding='utf-8')
+    return target
+
+
+class TestOrderDateIndex:
+    """Tests de OrderDateIndex"""
+
+    def test_filtered_load_matches_prefiltered_file(self, data_dir, tmp_path):
+        """Test chargement filtré == chargement complet d'un fichier pré-filtré"""
+        expected_dir = _prefiltered_copy(data_dir, tmp_path / 'expected', '2025-01-16', '2025-01-20')
+
+        filtered = OrderRepository().load_all(data_dir / 'orders.csv', '2025-01-16', '2025-01-20')
+        expected = OrderRepository().load_all(expected_dir / 'orders.csv')
+
+        assert filtered == expected
+        assert [o.id for o in filtered] == ['O003', 'O004', 'O005', 'O006', 'O007',
+                                             'O008', 'O009', 'O010', 'O011', 'O012',
+                                             'O013', 'O014']
+
+    def test_open_ended_ranges(self, data_dir):
+        """Test bornes optionnelles"""
+        repo = OrderRepository()
+
+        assert [o.id for o in repo.load_all(data_dir / 'orders.csv', start_date='2025-01-27')] == ['O024', 'O025']
+        assert [o.id for o in repo.load_all(data_dir / 'orders.csv', end_date='2025-01-15')] == ['O001', 'O002']
+        assert repo.load_all(data_dir / 'orders.csv', '2026-01-01', '2026-12-31') == []
+
+    def test_index_is_persisted_and_reused(self, data_dir):
+        """Test que l'index est écrit puis relu tant que le CSV ne change pas"""
+        orders_path = data_dir / 'orders.csv'
+        built = OrderDateIndex.load_or_build(orders_path)
+
+        assert OrderDateIndex.index_path_for(orders_path).exists()
+        reloaded = OrderDateIndex.load(OrderDateIndex.index_path_for(orders_path))
+        assert reloaded == built
+
+    def test_stale_index_is_rebuilt(self, data_dir):
+        """Test qu'un ajout dans orders.csv invalide l'index"""
+        orders_path = data_dir / 'orders.csv'
+        OrderRepository().load_all(orders_path, '2025-02-01', '2025-02-28')
+
+        with open(orders_path, 'a', encoding='utf-8') as f:
+            f.write('O026,C001,P005,1,3.50,2025-02-03,,14:30\n')
+
+        orders = OrderRepository().load_all(orders_path, '2025-02-01', '2025-02-28')
+        assert [o.id for o in orders] == ['O026']
+
+    def test_quoted_newlines_and_line_numbers(self, tmp_path):
+        """Test enregistrements multi-lignes et numéros de ligne des erreurs"""
+        orders_path = tmp_path / 'orders.csv'
+        orders_path.write_text(
+            'id,customer_id,product_id,qty,unit_price,date,promo_code,time\n'
+            '"O1\nbis",C001,P001,1,1.00,2025-01-01,,10:00\n'
+            'O2,C001,P001,0,1.00,2025-01-02,,10:00\n'
+            'O3,C001,P001,2,1.00,2025-01-02,,10:00\n',
+            encoding='utf-8'
+        )
+
+        orders = OrderRepository().load_all(orders_path, '2025-01-01', '2025-01-02')
+        assert [o.id for o in orders] == ['O1\nbis', 'O3']
+
+        orders_path.write_text(
+            orders_path.read_text(encoding='utf-8').replace('O3,C001,P001,2', 'O3,C001,P001,0'),
+            encoding='utf-8'
+        )
+        with pytest.raises(ValueError, match='Line 3: .*\n.*Line 4'):
+            OrderRepository().load_all(orders_path, '2025-01-02', '2025-01-02')
+
+
+class TestDateRangeReport:
+    """Tests du rapport filtré par dates"""
+
+    def test_report_matches_prefiltered_dataset(self, data_dir, tmp_path):
+        """Test rapport --from/--to == rapport complet sur données pré-filtrées"""
+        expected_dir = _prefiltered_copy(data_dir, tmp_path / 'expected', '2025-01-18', '2025-01-26')
+
+        filtered = main(['--data-dir', str(data_dir), '--from', '2025-01-18', '--to', '2025-01-26'])
+        expected = main(['--data-dir', str(expected_dir)])
+
+        assert filtered == expected
+        # C002: première ligne dans la plage = 2025-01-26 (dimanche) -> bonus weekend
+        assert 'Bob Durant (C002)' in filtered
+
+    def test_invalid_date_argument(self):
+        """Test validation des dates en ligne de commande"""
+        with pytest.raises(SystemExit):
+            main(['--from', '2025-13-45'])
@@ -0,0 +1,91 @@
+"""
+Tests de l'enrichissement des lignes de commande
+Vérifie la jointure produit/promotion et les fallbacks legacy.
+"""
+
+from src.models.customer import Customer
+from src.models.order import Order
+from src.models.product import Product
+from src.models.promotion import Promotion
+from src.models.shipping_zone import ShippingZone
+from src.services.order_enricher import OrderEnricher
+from src.services.order_processor import OrderProcessor
+from src.services.tax_calculator import TaxCalculator
+
+
+PRODUCTS = {
+    'P1': Product(id='P1', name='Laptop', category='E', price=100.0, weight=2.0),
+    'P2': Product(id='P2', name='Book', category='B', price=10.0, weight=0.5, taxable=False),
+}
+PROMOTIONS = {
+    'PCT10': Promotion(code='PCT10', type='PERCENTAGE', value=10.0),
+    'FIX5': Promotion(code='FIX5', type='FIXED', value=5.0),
+    'OLD': Promotion(code='OLD', type='PERCENTAGE', value=50.0, active=False),
+}
+
+
+def _order(order_id, product_id, qty=1, unit_price=20.0, promo_code='', time='12:00'):
+    return Order(id=order_id, customer_id='C1', product_id=product_id, qty=qty,
+                 unit_price=unit_price, date='2025-01-15', promo_code=promo_code, time=time)
+
+
+class TestOrderEnricher:
+    """Tests de OrderEnricher"""
+
+    def test_known_product_and_active_promo(self):
+        """Test jointure produit + promotion active"""
+        line = OrderEnricher().enrich_one(_order('O1', 'P1', promo_code='PCT10', time='09:30'),
+                                          PRODUCTS, PROMOTIONS)
+
+        assert line.base_price == 100.0
+        assert line.unit_weight == 2.0
+        assert line.product_found and line.taxable
+        assert line.discount_rate == 0.1
+        assert line.fixed_discount == 0.0
+        assert line.hour == 9
+
+    def test_missing_product_uses_legacy_fallback(self):
+        """Test fallback legacy: prix de la commande, 1 kg, taxable"""
+        line = OrderEnricher().enrich_one(_order('O1', 'P404', unit_price=7.5), PRODUCTS, PROMOTIONS)
+
+        assert line.base_price == 7.5
+        assert line.unit_weight == 1.0
+        assert not line.product_found
+        assert line.taxable
+
+    def test_inactive_or_unknown_promo_is_ignored(self):
+        """Test promotions inactives ou inconnues"""
+        enricher = OrderEnricher()
+
+        for code in ('OLD', 'NOPE'):
+            line = enricher.enrich_one(_order('O1', 'P1', promo_code=code), PRODUCTS, PROMOTIONS)
+            assert (line.discount_rate, line.fixed_discount) == (0.0, 0.0)
+
+
+class TestEnrichedProcessing:
+    """Tests du traitement à partir des lignes enrichies"""
+
+    def test_lines_and_orders_paths_agree(self):
+        """Test process_customer_lines == process_customer_orders"""
+        customer = Customer(id='C1', name='Alice', shipping_zone='ZONE1')
+        zones = {'ZONE1': ShippingZone(zone='ZONE1', base=5.0)}
+        orders = [
+            _order('O1', 'P1', qty=2, promo_code='PCT10', time='08:00'),
+            _order('O2', 'P2', qty=3, promo_code='FIX5'),
+            _order('O3', 'P404', qty=1, unit_price=12.0),
+        ]
+        processor = OrderProcessor()
+
+        lines = OrderEnricher().enrich(orders, PRODUCTS, PROMOTIONS)
+
+        assert processor.process_customer_lines(customer, lines, zones) == \
+            processor.process_customer_orders(customer, orders, PRODUCTS, PROMOTIONS, zones)
+
+    def test_tax_modes(self):
+        """Test taxe globale vs ligne par ligne (produit inconnu exclu)"""
+        calc = TaxCalculator()
+        taxable_orders = [_order('O1', 'P1'), _order('O2', 'P404')]
+        mixed_orders = [_order('O1', 'P1', qty=2), _order('O2', 'P2'), _order('O3', 'P404')]
+
+        assert calc.calculate(taxable_orders, PRODUCTS, 150.0) == 30.0
+        assert calc.calculate(mixed_orders, PRODUCTS, 150.0) == 40.0
@@ -0,0 +1,154 @@
+"""
+Tests des agrégats partiels calculés en parallèle
+Vérifie que le découpage des lignes d'un même client, entre morceaux ou
+entre processus, donne exactement le résultat du calcul en sommes exactes.
+"""
+
+import gzip
+import shutil
+
+import pytest
+
+from benchmarks.synthetic import DatasetSpec, generate_dataset
+from src.main import main
+from src.pipeline.parallel_aggregate import ParallelAggregator
+from src.repositories.csv_repository import ColumnFilter
+from src.repositories.customer_repository import CustomerRepository
+from src.repositories.order_repository import OrderRepository
+from src.repositories.product_repository import ProductRepository
+from src.repositories.promotion_repository import PromotionRepository
+from src.repositories.shipping_zone_repository import ShippingZoneRepository
+from src.services.line_aggregate import LineAggregate
+from src.services.order_enricher import OrderEnricher
+from src.services.order_processor import OrderProcessor
+
+
+# Peu de clients, beaucoup de lignes chacun: chaque client traverse toutes les plages
+SPEC = DatasetSpec(customers=3, products=15, orders=900, days=10, promo_rate=0.3)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    return generate_dataset(tmp_path / 'data', SPEC)
+
+
+def _references(data_dir):
+    return (
+        CustomerRepository().load_all(data_dir / 'customers.csv'),
+        ProductRepository().load_all(data_dir / 'products.csv'),
+        PromotionRepository().load_all(data_dir / 'promotions.csv'),
+        ShippingZoneRepository().load_all(data_dir / 'shipping_zones.csv'),
+    )
+
+
+class TestParallelAggregate:
+    """Tests de ParallelAggregator et de la fusion des agrégats"""
+
+    def test_chunks_of_one_customer_merge_to_serial_result(self, data_dir):
+        """Test lignes d'un client en morceaux, agrégés puis fusionnés dans le désordre"""
+        customers, products, promotions, zones = _references(data_dir)
+        processor = OrderProcessor(exact_sums=True)
+        lines = OrderEnricher().enrich(
+            OrderRepository().load_all(data_dir / 'orders.csv'), products, promotions
+        )
+        by_customer = processor.group_by_customer(lines)
+        for cid, customer_lines in by_customer.items():
+            numbered = list(enumerate(customer_lines))
+            parts = [
+                LineAggregate.of_lines(numbered[i:i + 37], processor.tax_calc)
+                for i in range(0, len(numbered), 37)
+            ]
+            merged = LineAggregate.merge_all(reversed(parts))
+            assert processor.process_customer_aggregate(customers[cid], merged, zones) == \
+                processor.process_customer_lines(customers[cid], customer_lines, zones)
+
+    def test_worker_ranges_match_serial_report(self, data_dir):
+        """Test plages réparties entre processus: résumés identiques au calcul en sommes exactes"""
+        customers, products, promotions, zones = _references(data_dir)
+        processor = OrderProcessor(exact_sums=True)
+        lines = OrderEnricher().enrich(
+            OrderRepository().load_all(data_dir / 'orders.csv'), products, promotions
+        )
+        expected = list(processor.iter_summaries(
+            customers, processor.group_by_customer(lines), zones
+        ))
+
+        aggregator = ParallelAggregator(workers=3, min_chunk_bytes=1)
+        aggregates = aggregator.aggregate(data_dir / 'orders.csv', products, promotions)
+        assert list(aggregator.iter_summaries(customers, aggregates, zones)) == expected
+
+    def test_compressed_orders_aggregated_in_process(self, data_dir):
+        """Test orders.csv.gz (non découpable): même agrégats"""
+        _, products, promotions, _ = _references(data_dir)
+        aggregator = ParallelAggregator(workers=3, min_chunk_bytes=1)
+        expected = aggregator.aggregate(data_dir / 'orders.csv', products, promotions)
+        with open(data_dir / 'orders.csv', 'rb') as src, \
+                gzip.open(data_dir / 'orders.csv.gz', 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        (data_dir / 'orders.csv').unlink()
+
+        assert aggregator.aggregate(data_dir / 'orders.csv', products, promotions) == expected
+
+    def test_all_invalid_rows_raise(self, data_dir):
+        """Test aucune ligne valide dans aucune plage: ValueError, comme le chargement normal"""
+        _, products, promotions, _ = _references(data_dir)
+        orders_path = data_dir / 'orders.csv'
+        header, *rows = orders_path.read_text(encoding='utf-8').splitlines()
+        qty = header.split(',').index('qty')
+        invalid = [','.join('x' if i == qty else v for i, v in enumerate(row.split(',')))
+                   for row in rows]
+        orders_path.write_text('\n'.join([header, *invalid]) + '\n', encoding='utf-8')
+
+        with pytest.raises(ValueError) as sequential:
+            OrderRepository().load_all(orders_path)
+        with pytest.raises(ValueError) as parallel:
+            ParallelAggregator(workers=3, min_chunk_bytes=1).aggregate(
+                orders_path, products, promotions
+            )
+        # Mêmes lignes citées: numéros du fichier, pas de la plage
+        assert str(parallel.value) == str(sequential.value)
+        with pytest.raises(ValueError):
+            main(['--data-dir', str(data_dir), '--aggregate-jobs', '2'])
+
+    def test_invalid_rows_reported_with_file_line_numbers(self, data_dir):
+        """Test rejets d'une plage éloignée: numéros de ligne du fichier, comme en séquentiel"""
+        _, products, promotions, _ = _references(data_dir)
+        orders_path = data_dir / 'orders.csv'
+        header, *rows = orders_path.read_text(encoding='utf-8').splitlines()
+        columns = header.split(',')
+        half = len(rows) // 2
+        kept = []
+        for i, row in enumerate(rows):
+            fields = row.split(',')
+            fields[columns.index('customer_id')] = 'C1' if i < half else 'C2'
+            if i >= half:
+                fields[columns.index('qty')] = 'x'
+            kept.append(','.join(fields))
+        orders_path.write_text('\n'.join([header, *kept]) + '\n', encoding='utf-8')
+
+        with pytest.raises(ValueError) as sequential:
+            OrderRepository().load_all(orders_path, customer_ids={'C2'})
+        with pytest.raises(ValueError) as parallel:
+            ParallelAggregator(workers=3, min_chunk_bytes=1).aggregate(
+                orders_path, products, promotions, [ColumnFilter.of('customer_id', {'C2'})]
+            )
+        assert f'Line {half + 2}:' in str(sequential.value)
+        assert str(parallel.value) == str(sequential.value)
+
+    @pytest.mark.parametrize('options', [
+        [],
+        ['--from', '2025-01-03', '--to', '2025-01-06'],
+        ['--customers', 'C000002', '--totals'],
+    ], ids=['full', 'date-range', 'customers'])
+    def test_main_aggregate_jobs_matches_report(self, data_dir, options, capsys):
+        """Test --aggregate-jobs: même rapport que le calcul en sommes exactes"""
+        expected = main(['--data-dir', str(data_dir), '--exact-sums', *options])
+
+        assert main(['--data-dir', str(data_dir), '--aggregate-jobs', '2', *options]) == expected
+        capsys.readouterr()
+
+    def test_incompatible_with_traced_modes(self, capsys):
+        """Test --aggregate-jobs avec --explain: erreur d'usage"""
+        with pytest.raises(SystemExit):
+            main(['--aggregate-jobs', '2', '--explain', 'C001'])
+        capsys.readouterr()
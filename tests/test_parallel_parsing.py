@@ -0,0 +1,109 @@
+"""
+Tests du parsing parallèle de orders.csv
+Vérifie que le découpage par plages d'octets donne le même résultat que load().
+"""
+
+import io
+
+import pytest
+
+from src.repositories.csv_records import find_record_boundaries
+from src.repositories.csv_repository import CSVRepository
+from src.repositories.order_repository import OrderRepository
+from src.repositories.parse_cache import PARSE_CACHE
+
+
+HEADER = 'id,customer_id,product_id,qty,unit_price,date,promo_code,time\n'
+
+
+def _write_orders(path, count, invalid_every=0):
+    """Génère un orders.csv avec des ids quotés multi-lignes"""
+    lines = [HEADER]
+    for i in range(count):
+        qty = 0 if invalid_every and i % invalid_every == 0 else 1 + i % 7
+        order_id = f'"O{i}\nbis"' if i % 5 == 0 else f'O{i}'
+        lines.append(f'{order_id},C{i % 13:03d},P{i % 9:03d},{qty},{i % 50}.25,2025-01-{1 + i % 28:02d},,{i % 24:02d}:00\n')
+    path.write_text(''.join(lines), encoding='utf-8')
+    return path
+
+
+class TestRecordBoundaries:
+    """Tests de find_record_boundaries"""
+
+    def test_boundaries_skip_quoted_newlines(self):
+        """Test qu'aucune frontière ne tombe dans un champ quoté"""
+        data = (HEADER + 'a,"x\ny\nz",1\n' * 200).encode('utf-8')
+        f = io.BytesIO(data)
+
+        boundaries = find_record_boundaries(f, len(HEADER), len(data), 7, block_size=64)
+
+        assert boundaries[0] == len(HEADER)
+        assert boundaries[-1] == len(data)
+        record_length = len('a,"x\ny\nz",1\n')
+        for b in boundaries:
+            assert (b - len(HEADER)) % record_length == 0
+
+
+class TestParallelLoad:
+    """Tests de OrderRepository.load_all(workers=N)"""
+
+    def test_parallel_matches_sequential(self, tmp_path, monkeypatch):
+        """Test même résultat et même ordre qu'en séquentiel"""
+        path = _write_orders(tmp_path / 'orders.csv', 2000, invalid_every=17)
+        repo = OrderRepository()
+        parse_parallel = CSVRepository._parse_parallel
+        calls = []
+        monkeypatch.setattr(
+            CSVRepository, '_parse_parallel',
+            lambda self, *args: calls.append(args) or parse_parallel(self, *args)
+        )
+
+        sequential = repo.load_all(path)
+        PARSE_CACHE.invalidate(path)  # Sinon le chargement parallèle est servi par le cache
+        parallel = repo.repo.load_parallel(path, workers=4, min_chunk_bytes=1)
+
+        assert len(calls) == 1
+        assert parallel == sequential
+        assert len(parallel) == 2000 - len(range(0, 2000, 17))
+
+    def test_small_file_falls_back_to_sequential(self, tmp_path):
+        """Test qu'un petit fichier n'est pas découpé"""
+        path = _write_orders(tmp_path / 'orders.csv', 10)
+
+        parallel = OrderRepository().load_all(path, workers=4)
+        PARSE_CACHE.invalidate(path)
+
+        assert parallel == OrderRepository().load_all(path)
+
+    def test_all_invalid_rows_raise(self, tmp_path):
+        """Test contrôle "aucune ligne valide" sur le fichier entier"""
+        path = _write_orders(tmp_path / 'orders.csv', 300, invalid_every=1)
+
+        with pytest.raises(ValueError, match='Line 2: '):
+            OrderRepository().repo.load_parallel(path, workers=3, min_chunk_bytes=1)
+
+    def test_values_shared_across_ranges(self, tmp_path):
+        """Test valeurs répétées partagées entre plages parsées par des workers différents"""
+        path = _write_orders(tmp_path / 'orders.csv', 2000)
+        repo = OrderRepository()
+
+        orders = repo.repo.load_parallel(path, workers=4, min_chunk_bytes=1)
+
+        for column in ('customer_id', 'product_id', 'date', 'time'):
+            values = [getattr(order, column) for order in orders]
+            assert len({id(value) for value in values}) == len(set(values))
+
+    def test_pool_reset_per_load_and_bounded(self, tmp_path, monkeypatch):
+        """Test dictionnaire de partage vidé à chaque chargement, et borné"""
+        repo = OrderRepository()
+        repo.load_all(_write_orders(tmp_path / 'big.csv', 2000))
+        repo.load_all(_write_orders(tmp_path / 'small.csv', 3))
+        assert len(repo._pool) == 3 + 3 + 3 + 1 + 3
+
+        monkeypatch.setattr('src.repositories.order_repository.POOL_MAX_ENTRIES', 50)
+        orders = repo.load_all(_write_orders(tmp_path / 'orders.csv', 2000))
+        assert 50 <= len(repo._pool) < 50 + 5
+        # Dictionnaire plein: les valeurs déjà présentes restent partagées
+        first = orders[0]
+        assert all(o.customer_id is first.customer_id for o in orders if o.customer_id == 'C000')
+        assert all(o.date is first.date for o in orders if o.date == first.date)
@@ -0,0 +1,120 @@
+"""
+Tests du cache des fichiers parsés
+Vérifie qu'un fichier inchangé n'est parsé qu'une fois, et qu'un fichier
+modifié ne sert jamais l'ancien résultat.
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.repositories.csv_repository import ColumnFilter, CSVRepository
+from src.models.order import Order
+from src.repositories.parse_cache import PARSE_CACHE, ParseCache, estimate_bytes
+from src.repositories.product_repository import ProductRepository
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+class CountingMapper:
+    """Mapper qui compte les lignes converties"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, row):
+        self.calls += 1
+        return (row['id'], row['price'])
+
+
+@pytest.fixture
+def products_path(tmp_path):
+    path = tmp_path / 'products.csv'
+    shutil.copy(DATA_PATH / 'products.csv', path)
+    return path
+
+
+class TestParseCache:
+    """Tests de ParseCache et de son usage par CSVRepository"""
+
+    def test_unchanged_file_parsed_once(self, products_path):
+        """Test second chargement servi par le cache: mêmes objets, mêmes statistiques"""
+        before = PARSE_CACHE.stats()
+        first = ProductRepository().load_all(products_path)
+        repository = ProductRepository()
+        second = repository.load_all(products_path)
+
+        assert second == first
+        assert all(second[pid] is first[pid] for pid in first)
+        assert repository.last_stats.rows_loaded == len(first)
+        after = PARSE_CACHE.stats()
+        assert (after.hits - before.hits, after.misses - before.misses) == (1, 1)
+
+    def test_modified_file_reparsed(self, products_path):
+        """Test fichier réécrit (taille différente): nouveau parsing"""
+        mapper = CountingMapper()
+        repo = CSVRepository(mapper, cache=ParseCache())
+        items = repo.load(products_path)
+        assert repo.load(products_path) == items
+        assert mapper.calls == len(items)
+
+        with open(products_path, 'a', encoding='utf-8') as f:
+            f.write('P999,Extra,misc,1.0,1.0,true\n')
+        reloaded = repo.load(products_path)
+        assert reloaded[-1] == ('P999', '1.0')
+        assert mapper.calls == 2 * len(items) + 1
+
+    def test_caller_owns_returned_list(self, products_path):
+        """Test liste modifiée par l'appelant: le cache n'est pas affecté"""
+        repo = CSVRepository(CountingMapper(), cache=ParseCache())
+        items = repo.load(products_path)
+        expected = list(items)
+        items.clear()
+        assert repo.load(products_path) == expected
+
+    def test_filters_and_rejects(self, products_path, tmp_path):
+        """Test ColumnFilter dans la clé; fichier de rejets et filtre quelconque: pas de cache"""
+        cache = ParseCache()
+        repo = CSVRepository(CountingMapper(), cache=cache)
+        subset = repo.load(products_path, ColumnFilter.of('id', ['P001']))
+        assert subset == [('P001', subset[0][1])]
+        assert len(repo.load(products_path)) > 1
+        repo.load(products_path, lambda row: True)
+        CSVRepository(CountingMapper(), reject_path=tmp_path / 'rejects.csv', cache=cache).load(
+            products_path
+        )
+        assert cache.stats().entries == 2
+
+    def test_lru_bounds_and_invalidation(self, tmp_path):
+        """Test éviction par nombre d'entrées et par taille, invalidation explicite"""
+        paths = []
+        for i in range(3):
+            path = tmp_path / f'products{i}.csv'
+            shutil.copy(DATA_PATH / 'products.csv', path)
+            paths.append(path)
+        cache = ParseCache(max_entries=2)
+        repo = CSVRepository(CountingMapper(), cache=cache)
+        for path in paths:
+            repo.load(path)
+        repo.load(paths[2])
+        stats = cache.stats()
+        assert (stats.entries, stats.evictions, stats.hits) == (2, 1, 1)
+
+        assert cache.invalidate(paths[2]) == 1
+        assert cache.invalidate() == 1
+        assert cache.stats().bytes == 0
+
+        tiny = ParseCache(max_bytes=1)
+        CSVRepository(CountingMapper(), cache=tiny).load(paths[0])
+        assert tiny.stats().entries == 0
+
+    def test_estimate_counts_slotted_fields(self):
+        """Test dataclass avec __slots__ (Order): valeurs des champs comptées"""
+        order = Order('O' * 40, 'C' * 40, 'P' * 40, 1, 1.0, '2025-01-01', 'PROMO', '10:00')
+        fields = sum(sys.getsizeof(getattr(order, name)) for name in Order.__slots__)
+
+        assert not hasattr(order, '__dict__')
+        assert estimate_bytes([order]) == sys.getsizeof([order]) + sys.getsizeof(order) + fields
@@ -0,0 +1,93 @@
+"""
+Tests des données de référence rechargeables (instantanés versionnés)
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.repositories.reference_store import ReferenceStore
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Copie modifiable des données legacy"""
+    target = tmp_path / 'data'
+    shutil.copytree(DATA_PATH, target)
+    return target
+
+
+def _rewrite(path: Path, text: str) -> None:
+    """Réécrit un fichier en garantissant un nouveau mtime"""
+    stat = os.stat(path)
+    path.write_text(text, encoding='utf-8')
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestReferenceStore:
+    """Tests de ReferenceStore"""
+
+    def test_refresh_without_change_keeps_snapshot(self, data_dir):
+        """Test aucun changement: même instantané, même version"""
+        store = ReferenceStore(data_dir)
+        snapshot = store.snapshot
+
+        assert store.refresh() is snapshot
+        assert snapshot.version == 1
+
+    def test_only_changed_file_is_reparsed(self, data_dir):
+        """Test seul promotions.csv est rechargé, les autres sont partagés"""
+        store = ReferenceStore(data_dir)
+        before = store.snapshot
+        _rewrite(data_dir / 'promotions.csv', 'code,type,value,active\nNEW5,PERCENTAGE,5,true\n')
+
+        after = store.refresh()
+
+        assert after.version == before.version + 1
+        assert list(after.promotions) == ['NEW5']
+        assert after.products is before.products
+        assert after.shipping_zones is before.shipping_zones
+        assert after.file_versions['promotions.csv'] == after.version
+        assert after.file_versions['products.csv'] == before.version
+
+    def test_in_flight_snapshot_is_unchanged(self, data_dir):
+        """Test un instantané déjà lu n'est ni modifié ni modifiable"""
+        store = ReferenceStore(data_dir)
+        in_flight = store.snapshot
+        codes = set(in_flight.promotions)
+        _rewrite(data_dir / 'promotions.csv', 'code,type,value,active\n')
+
+        store.refresh()
+
+        assert set(in_flight.promotions) == codes
+        assert store.snapshot.promotions == {}
+        with pytest.raises(TypeError):
+            in_flight.promotions['X'] = None
+
+    def test_reload_unknown_file(self, data_dir):
+        """Test rechargement d'un fichier qui n'est pas une référence"""
+        with pytest.raises(ValueError):
+            ReferenceStore(data_dir).reload('orders.csv')
+
+    def test_reload_ignores_unchanged_signature(self, data_dir):
+        """Test fichier réécrit à taille et mtime identiques: reload le re-parse quand même"""
+        store = ReferenceStore(data_dir)
+        before = store.snapshot
+        promotions = data_dir / 'promotions.csv'
+        stat = os.stat(promotions)
+        promotions.write_text(
+            promotions.read_text(encoding='utf-8').replace('PREMIUM10', 'PREMIUM20'),
+            encoding='utf-8'
+        )
+        os.utime(promotions, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert store.refresh() is before
+
+        reloaded = store.reload('promotions.csv')
+
+        assert 'PREMIUM20' in reloaded.promotions
+        assert 'PREMIUM10' not in reloaded.promotions
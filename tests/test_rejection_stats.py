@@ -0,0 +1,142 @@
+"""
+Tests de la collecte bornée des rejets CSV
+Vérifie compteurs, échantillon plafonné et fichier annexe des rejets.
+"""
+
+import csv
+
+import pytest
+
+from src.repositories.order_repository import OrderRepository
+from src.repositories.product_repository import ProductRepository
+from src.repositories.rejection_stats import RejectionCollector, ROW_LEVEL
+
+
+HEADER = 'id,customer_id,product_id,qty,unit_price,date,promo_code,time\n'
+
+
+def _write_orders(path, rows):
+    path.write_text(HEADER + ''.join(rows), encoding='utf-8')
+    return path
+
+
+class TestRejectionCollector:
+    """Tests du RejectionCollector"""
+
+    def test_samples_are_capped(self):
+        """Test mémoire bornée: compteurs complets, échantillon plafonné"""
+        collector = RejectionCollector(max_samples=3)
+        for line_num in range(2, 1002):
+            collector.reject(line_num, ValueError('bad'))
+
+        stats = collector.stats('orders.csv', rows_loaded=10)
+
+        assert stats.rows_rejected == 1000
+        assert stats.rows_read == 1010
+        assert stats.by_error == {'ValueError': 1000}
+        assert stats.by_column == {ROW_LEVEL: 1000}
+        assert [s.line_num for s in stats.samples] == [2, 3, 4]
+
+    def test_merge_shifts_line_numbers(self):
+        """Test fusion d'un collecteur de worker"""
+        main, worker = RejectionCollector(max_samples=2), RejectionCollector()
+        main.reject(5, KeyError('qty'))
+        worker.reject(2, ValueError('x'))
+        worker.reject(3, ValueError('y'))
+
+        main.merge(worker, line_offset=100)
+
+        assert main.rejected == 3
+        assert main.by_column == {'qty': 1, ROW_LEVEL: 2}
+        assert [s.line_num for s in main.samples] == [5, 102]
+
+
+class TestLoadStats:
+    """Tests des statistiques exposées par les repositories"""
+
+    def test_stats_by_error_and_column(self, tmp_path):
+        """Test comptage par type d'erreur et par colonne"""
+        path = _write_orders(tmp_path / 'orders.csv', [
+            'O1,C001,P001,1,10.00,2025-01-01,,10:00\n',
+            'O2,C001,P001,abc,10.00,2025-01-01,,10:00\n',
+            'O3,C001,P001,0,10.00,2025-01-01,,10:00\n',
+            'O4,C001,P001,1,-1,2025-01-01,,10:00\n',
+            'O5,C001,P001,1,x,2025-01-01,,10:00\n',
+        ])
+        repo = OrderRepository()
+
+        orders = repo.load_all(path)
+        stats = repo.last_stats
+
+        assert [o.id for o in orders] == ['O1']
+        assert stats.rows_read == 5
+        assert stats.rows_loaded == 1
+        assert stats.rows_rejected == 4
+        assert stats.by_error == {'FieldError': 4}
+        assert stats.by_column == {'qty': 2, 'unit_price': 2}
+        assert [s.line_num for s in stats.samples] == [3, 4, 5, 6]
+
+    def test_non_finite_amounts_rejected(self, tmp_path):
+        """Test prix nan/inf: ligne rejetée (colonne du montant) au lieu de casser les sommes"""
+        path = _write_orders(tmp_path / 'orders.csv', [
+            'O1,C001,P001,1,10.00,2025-01-01,,10:00\n',
+            'O2,C001,P001,1,nan,2025-01-01,,10:00\n',
+            'O3,C001,P001,1,inf,2025-01-01,,10:00\n',
+            'O4,C001,P001,1,-Infinity,2025-01-01,,10:00\n',
+        ])
+        repo = OrderRepository()
+
+        orders = repo.load_all(path)
+
+        assert [o.id for o in orders] == ['O1']
+        assert repo.last_stats.by_column == {'unit_price': 3}
+
+        products = tmp_path / 'products.csv'
+        products.write_text(
+            'id,name,category,price,weight\nP1,A,B,1.0,1.0\nP2,A,B,nan,1.0\nP3,A,B,1.0,inf\n',
+            encoding='utf-8'
+        )
+        assert list(ProductRepository().load_all(products)) == ['P1']
+
+    def test_missing_column_is_attributed(self, tmp_path):
+        """Test qu'une colonne absente est comptée sous son nom"""
+        path = tmp_path / 'products.csv'
+        path.write_text('id,name,category\nP1,A,B\n', encoding='utf-8')
+
+        with pytest.raises(ValueError, match='Line 2'):
+            ProductRepository().load_all(path)
+
+    def test_reject_file_receives_every_rejection(self, tmp_path):
+        """Test fichier annexe: tous les rejets, y compris hors échantillon"""
+        rows = ['O0,C001,P001,1,1.00,2025-01-01,,10:00\n']
+        rows += [f'O{i},C001,P001,0,1.00,2025-01-01,,10:00\n' for i in range(1, 51)]
+        path = _write_orders(tmp_path / 'orders.csv', rows)
+        reject_path = tmp_path / 'orders.rejects.csv'
+
+        repo = OrderRepository(reject_path=reject_path)
+        repo.load_all(path)
+
+        with open(reject_path, encoding='utf-8', newline='') as f:
+            rejects = list(csv.DictReader(f))
+        assert len(rejects) == 50
+        assert len(repo.last_stats.samples) == 20
+        assert rejects[0]['line'] == '3'
+        assert rejects[0]['column'] == 'qty'
+        assert '"id": "O1"' in rejects[0]['row']
+
+    def test_parallel_load_reports_same_stats(self, tmp_path):
+        """Test statistiques et fichier de rejets identiques en parallèle"""
+        rows = [
+            f'O{i},C001,P001,{0 if i % 7 == 0 else 1},1.00,2025-01-01,,10:00\n'
+            for i in range(3000)
+        ]
+        path = _write_orders(tmp_path / 'orders.csv', rows)
+
+        sequential = OrderRepository(reject_path=tmp_path / 'seq.csv')
+        sequential.load_all(path)
+        parallel = OrderRepository(reject_path=tmp_path / 'par.csv')
+        parallel.repo.load_parallel(path, workers=4, min_chunk_bytes=1)
+
+        assert parallel.last_stats == sequential.last_stats
+        assert (tmp_path / 'par.csv').read_text() == (tmp_path / 'seq.csv').read_text()
+        assert not list(tmp_path.glob('par.csv.part*'))
@@ -0,0 +1,101 @@
+"""
+Tests du manifeste de rapport et de la comparaison de rapports
+Vérifie les positions des sections et que la comparaison ne lit que les
+seaux modifiés.
+"""
+
+from dataclasses import replace
+from pathlib import Path
+
+from src.formatters.report_manifest import (
+    MANIFEST_SUFFIX, ManifestTextFormatter, ReportDiff, ReportManifest
+)
+from src.formatters.text_formatter import TextReportFormatter
+from src.main import main
+from src.models.customer import Customer
+from src.models.order_summary import OrderSummary
+
+
+def _summary(i: int, total: float = 100.0) -> OrderSummary:
+    return OrderSummary(
+        customer=Customer(id=f'C{i:05d}', name=f'Client é{i}'),
+        subtotal=total, volume_discount=0.0, loyalty_discount=0.0, tax=total * 0.2,
+        shipping=5.0, handling=0.0, total=total * 1.2 + 5.0, loyalty_points=total / 10, weight=1.0
+    )
+
+
+def _write(tmp_path: Path, name: str, summaries) -> Path:
+    formatter = ManifestTextFormatter()
+    report_path = tmp_path / name
+    report_path.write_text(formatter.format(summaries) + '\n', encoding='utf-8')
+    formatter.write_manifest(str(report_path) + MANIFEST_SUFFIX)
+    return report_path
+
+
+def _diff(old: Path, new: Path) -> ReportDiff:
+    return ReportDiff.between(
+        ReportManifest(str(old) + MANIFEST_SUFFIX), ReportManifest(str(new) + MANIFEST_SUFFIX)
+    )
+
+
+class TestReportManifest:
+    """Tests du manifeste"""
+
+    def test_same_text_and_section_offsets(self, tmp_path):
+        """Test rapport inchangé; chaque position désigne la section du client"""
+        summaries = [_summary(i, 10.0 * i) for i in range(50)]
+        formatter = ManifestTextFormatter()
+        report = formatter.format(summaries)
+
+        assert report == TextReportFormatter().format(summaries)
+        data = (report + '\n').encode('utf-8')
+        for summary, (cid, _, _, offset, length) in zip(summaries, formatter.entries):
+            assert cid == summary.customer.id
+            assert data[offset:offset + length].decode('utf-8') == formatter.format_section(summary)
+        assert formatter.footer == report.splitlines()[-2:]
+
+
+class TestReportDiff:
+    """Tests de la comparaison par manifestes"""
+
+    def test_reads_only_changed_buckets(self, tmp_path):
+        """Test 1 modifié, 1 ajouté, 1 supprimé: seuls leurs seaux sont lus"""
+        summaries = [_summary(i) for i in range(5000)]
+        old = _write(tmp_path, 'old.txt', summaries)
+        changed = list(summaries)
+        changed[10] = replace(changed[10], total=changed[10].total + 1e-9)  # Même rendu
+        del changed[20]
+        changed.append(_summary(99999))
+        new = _write(tmp_path, 'new.txt', changed)
+
+        diff = _diff(old, new)
+        assert (diff.changed, diff.added, diff.removed) == (('C00010',), ('C99999',), ('C00020',))
+        assert diff.buckets_read <= 3
+        assert ReportManifest(str(new) + MANIFEST_SUFFIX).customers == 5000
+
+    def test_identical_reports_read_nothing(self, tmp_path):
+        """Test même rapport: aucun seau lu, aucune différence"""
+        summaries = [_summary(i) for i in range(300)]
+        diff = _diff(_write(tmp_path, 'a.txt', summaries), _write(tmp_path, 'b.txt', summaries))
+
+        assert diff.is_empty() and diff.buckets_read == 0
+        assert diff.format() == ''
+
+    def test_main_diff_prints_sections(self, tmp_path, capsys):
+        """Test --manifest puis --diff: sections modifiées lues dans les rapports"""
+        old = _write(tmp_path, 'old.txt', [_summary(1), _summary(2)])
+        new = _write(tmp_path, 'new.txt', [_summary(1), _summary(2, 250.0)])
+        output = main(['--diff', str(old), str(new)])
+        capsys.readouterr()
+
+        lines = output.splitlines()
+        assert lines[0] == 'changed: C00002'
+        assert '- Subtotal: 100.00' in lines and '+ Subtotal: 250.00' in lines
+        assert lines[-5] == 'totals:'
+
+    def test_main_manifest_keeps_report(self, tmp_path, capsys):
+        """Test --manifest: rapport identique, manifeste écrit"""
+        manifest = tmp_path / 'report.txt.manifest'
+        assert main(['--manifest', str(manifest)]) == main([])
+        capsys.readouterr()
+        assert ReportManifest(manifest).customers == 10
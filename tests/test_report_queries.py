@@ -0,0 +1,78 @@
+"""
+Tests des requêtes agrégées (totaux, top N)
+Vérifie la cohérence avec le rapport complet.
+"""
+
+import pytest
+
+from src.main import main
+from src.models.customer import Customer
+from src.models.order_summary import OrderSummary
+from src.services.report_queries import GrandTotals, format_top, top_n
+
+
+def _summary(customer_id, total, tax=0.0):
+    return OrderSummary(
+        customer=Customer(id=customer_id, name=f'Client {customer_id}'),
+        subtotal=total, volume_discount=0.0, loyalty_discount=0.0, tax=tax,
+        shipping=0.0, handling=0.0, total=total, loyalty_points=0.0, weight=0.0
+    )
+
+
+class TestGrandTotals:
+    """Tests des totaux en flux"""
+
+    def test_totals_match_full_report_footer(self):
+        """Test --totals == pied du rapport complet"""
+        full_report = main([])
+
+        assert main(['--totals']) == '\n'.join(full_report.splitlines()[-2:])
+
+    def test_accumulates_stream(self):
+        """Test agrégation d'un générateur"""
+        totals = GrandTotals.from_summaries(_summary(f'C{i}', 10.0, 2.0) for i in range(5))
+
+        assert (totals.grand_total, totals.total_tax, totals.customers) == (50.0, 10.0, 5)
+
+
+class TestTopN:
+    """Tests du classement borné"""
+
+    def test_top_n_matches_full_sort(self):
+        """Test top N == tri complet tronqué"""
+        summaries = [_summary(f'C{i:03d}', float((i * 37) % 101)) for i in range(200)]
+
+        expected = sorted(summaries, key=lambda s: -s.total)[:10]
+
+        assert top_n(iter(summaries), 10) == expected
+
+    def test_ties_keep_smallest_customer_id(self):
+        """Test égalités: ordre des IDs client"""
+        summaries = [_summary('C001', 5.0), _summary('C002', 9.0), _summary('C003', 9.0)]
+
+        assert [s.customer.id for s in top_n(summaries, 2)] == ['C002', 'C003']
+
+    def test_unknown_field(self):
+        """Test champ de classement invalide"""
+        with pytest.raises(ValueError, match='inconnu'):
+            top_n([], 3, 'customer')
+
+    def test_format_top(self):
+        """Test format d'un classement"""
+        assert format_top([_summary('C001', 12.5)], 'total') == '1. Client C001 (C001): total=12.50'
+
+    @pytest.mark.parametrize('value', ['0', '-1', 'x'])
+    def test_main_top_requires_positive_count(self, value, capsys):
+        """Test --top 0, négatif ou non entier: erreur d'usage au lieu d'un classement vide"""
+        with pytest.raises(SystemExit):
+            main(['--top', value])
+        assert '--top' in capsys.readouterr().err
+
+    def test_main_top_by_field(self):
+        """Test --top N --by champ"""
+        report = main(['--top', '2', '--by', 'tax'])
+
+        assert report.splitlines() == [
+            '1. Grace Lee (C007): tax=559.40',
+            '2. Diana Prince (C004): tax=415.22',
+        ]
@@ -115,6 +115,19 @@ class TestOrderRepository:
         for order in orders:
             assert isinstance(order.qty, int)
             assert isinstance(order.unit_price, float)
+    
+    def test_repeated_values_are_shared(self):
+        """Test encodage par dictionnaire des colonnes répétitives"""
+        orders = OrderRepository().load_all(DATA_PATH / 'orders.csv')
+        
+        # O001 et O002: même client, même date, même heure
+        assert orders[0].customer_id is orders[1].customer_id
+        assert orders[0].date is orders[1].date
+        assert orders[0].time is orders[1].time
+        
+        raw = OrderRepository(intern_strings=False).load_all(DATA_PATH / 'orders.csv')
+        assert raw == orders
+        assert raw[0].date is not raw[1].date
 
 
 class TestPromotionRepository:
@@ -0,0 +1,118 @@
+"""
+Tests des agrégats journaliers
+Vérifie qu'un rapport calculé par fusion d'agrégats est identique au
+recalcul complet de la même plage.
+"""
+
+import os
+import random
+import shutil
+from math import fsum
+from pathlib import Path
+
+import pytest
+
+from src.main import main
+from src.pipeline.rollups import DailyRollupStore
+from src.models.order import Order
+from src.services.line_aggregate import ExactSum
+from src.services.order_enricher import OrderEnricher
+from src.services.order_processor import OrderProcessor
+from src.services.summation import sequential_sum
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Copie modifiable des données legacy"""
+    target = tmp_path / 'data'
+    shutil.copytree(DATA_PATH, target)
+    return target
+
+
+def _report(data_dir: Path, *args: str) -> str:
+    return main(['--data-dir', str(data_dir), *args])
+
+
+class TestExactSum:
+    """Tests de ExactSum"""
+
+    def test_merged_partials_equal_fsum(self):
+        """Test somme par morceaux = fsum de toutes les valeurs, quel que soit le découpage"""
+        rng = random.Random(7)
+        values = [rng.uniform(-1e6, 1e6) * rng.choice((1, 1e-9, 1e9)) for _ in range(500)]
+
+        parts = [ExactSum.of(values[i:i + 37]) for i in range(0, len(values), 37)]
+        merged = ExactSum()
+        for part in reversed(parts):
+            merged = merged + part
+
+        assert float(merged) == fsum(values)
+        assert float(ExactSum.of(values)) == fsum(values)
+
+    def test_processor_sums_sequentially_unless_exact(self):
+        """Test sous-total legacy (additions séquentielles) par défaut, fsum si exact_sums"""
+        orders = [Order(f'O{i}', 'C001', 'P404', 1, 0.1) for i in range(10)]
+        lines = OrderEnricher().enrich(orders, {}, {})
+        assert sequential_sum([0.1] * 10) != fsum([0.1] * 10)
+
+        assert OrderProcessor()._calculate_subtotal_with_promos(lines)[0] == \
+            sequential_sum([0.1] * 10)
+        assert OrderProcessor(exact_sums=True)._calculate_subtotal_with_promos(lines)[0] == \
+            fsum([0.1] * 10)
+
+
+class TestDailyRollupStore:
+    """Tests de DailyRollupStore"""
+
+    def test_rollup_report_matches_full_recompute(self, data_dir, tmp_path):
+        """Test rapport par agrégats = rapport --exact-sums --from/--to, plage complète et partielle"""
+        rollups = str(tmp_path / 'rollups.txt')
+
+        assert _report(data_dir, '--rollups', rollups) == _report(data_dir, '--exact-sums', '--from', '2025-01-01')
+        assert (_report(data_dir, '--rollups', rollups, '--from', '2025-01-17', '--to', '2025-01-24')
+                == _report(data_dir, '--exact-sums', '--from', '2025-01-17', '--to', '2025-01-24'))
+
+    def test_only_new_days_are_parsed(self, data_dir, tmp_path):
+        """Test mise à jour incrémentale: seul le jour ajouté est parsé"""
+        store = DailyRollupStore(tmp_path / 'rollups.txt', data_dir)
+        assert len(store.update()) == 14
+
+        with open(data_dir / 'orders.csv', 'a', encoding='utf-8') as f:
+            f.write('O900,C002,P001,1,1299.00,2025-02-01,PREMIUM10,09:00\n')
+        reopened = DailyRollupStore(tmp_path / 'rollups.txt', data_dir)
+
+        assert reopened.update() == ['2025-02-01']
+        assert reopened.update() == []
+        assert (_report(data_dir, '--rollups', str(tmp_path / 'rollups.txt'))
+                == _report(data_dir, '--exact-sums', '--from', '2025-01-01'))
+
+    def test_pricing_change_rebuilds_everything(self, data_dir, tmp_path):
+        """Test promotions modifiées: tous les jours sont reconstruits"""
+        store = DailyRollupStore(tmp_path / 'rollups.txt', data_dir)
+        store.update()
+        promotions = data_dir / 'promotions.csv'
+        stat = os.stat(promotions)
+        promotions.write_text(promotions.read_text(encoding='utf-8').replace(',10,', ',15,'), encoding='utf-8')
+        os.utime(promotions, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert len(DailyRollupStore(tmp_path / 'rollups.txt', data_dir).update()) == 14
+        assert (_report(data_dir, '--rollups', str(tmp_path / 'rollups.txt'))
+                == _report(data_dir, '--exact-sums', '--from', '2025-01-01'))
+
+    def test_invalid_rows(self, data_dir, tmp_path):
+        """Test un jour entièrement invalide reste vide; aucune ligne valide: ValueError"""
+        orders = data_dir / 'orders.csv'
+        with open(orders, 'a', encoding='utf-8') as f:
+            f.write('O900,C002,P001,x,1299.00,2025-02-01,,09:00\n')
+        store = DailyRollupStore(tmp_path / 'rollups.txt', data_dir)
+        assert '2025-02-01' in store.update()
+        assert store.day('2025-02-01') == {}
+
+        header = orders.read_text(encoding='utf-8').splitlines()[0]
+        orders.write_text(header + '\nO901,C002,P001,x,1299.00,2025-02-02,,09:00\n', encoding='utf-8')
+        with pytest.raises(ValueError):
+            DailyRollupStore(tmp_path / 'rollups2.txt', data_dir).update()
+        assert not (tmp_path / 'rollups2.txt').exists()
@@ -0,0 +1,64 @@
+"""
+Tests des métriques d'exécution (export Prometheus)
+"""
+
+from src.main import main
+from src.services.run_metrics import Histogram, RunMetrics
+from src.repositories.rejection_stats import LoadStats
+
+
+def _samples(text: str) -> dict:
+    """Échantillons de l'exposition texte: {nom{labels}: valeur}"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+class TestRunMetrics:
+    """Tests de RunMetrics et de --metrics-file"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bornes cumulatives, +Inf = count"""
+        histogram = Histogram('h', 'aide', (1, 5))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+
+        samples = _samples('\n'.join(histogram.render()))
+
+        assert samples['h_bucket{le="1"}'] == 2
+        assert samples['h_bucket{le="5"}'] == 3
+        assert samples['h_bucket{le="+Inf"}'] == 4
+        assert samples['h_sum'] == 14.5
+        assert samples['h_count'] == 4
+
+    def test_record_load(self):
+        """Test lignes chargées, rejets par erreur, débit"""
+        metrics = RunMetrics()
+        stats = LoadStats('orders.csv', rows_read=10, rows_loaded=8, rows_rejected=2,
+                          by_error={'FieldError': 2})
+
+        metrics.record_load('orders', stats, 0.5)
+        metrics.record_load('orders', None, 0.5)  # Lecture en flux: ignorée
+
+        samples = _samples(metrics.render())
+        assert samples['order_report_rows_loaded_total{repository="orders"}'] == 8
+        assert samples['order_report_rows_rejected_total{error="FieldError",repository="orders"}'] == 2
+        assert samples['order_report_parse_rows_per_second{repository="orders"}'] == 20
+
+    def test_metrics_file_written_and_report_unchanged(self, tmp_path):
+        """Test rapport identique, un client observé par section"""
+        metrics_file = tmp_path / 'order_report.prom'
+
+        report = main(['--metrics-file', str(metrics_file)])
+
+        assert report == main([])
+        assert not list(tmp_path.glob('*.tmp'))
+        samples = _samples(metrics_file.read_text(encoding='utf-8'))
+        assert samples['order_report_customer_processing_seconds_count'] == report.count('Customer:')
+        assert samples['order_report_customer_order_lines_count'] == report.count('Customer:')
+        for repository in ('customers', 'orders', 'products', 'promotions', 'shipping_zones'):
+            assert f'order_report_rows_loaded_total{{repository="{repository}"}}' in samples
+        assert samples['order_report_run_seconds'] > 0
@@ -0,0 +1,106 @@
+"""
+Tests des rapports estimés par échantillonnage
+Vérifie l'estimateur (sans biais, couverture des intervalles) et la
+cohérence avec les totaux exacts quand tout est tiré.
+"""
+
+import random
+
+import pytest
+
+from src.main import main
+from src.models.customer import Customer
+from src.services.sampling import SamplingPlan
+
+
+def _population(size=200, seed=3):
+    rng = random.Random(seed)
+    levels = ('BASIC', 'PREMIUM', 'VIP')
+    customers = {
+        f'C{i:04d}': Customer(id=f'C{i:04d}', name=f'Client {i}', level=levels[i % 3])
+        for i in range(size)
+    }
+    # Valeurs très dépendantes du niveau: la stratification doit réduire l'erreur
+    scale = {'BASIC': 100.0, 'PREMIUM': 1000.0, 'VIP': 5000.0}
+    values = {cid: scale[c.level] * rng.uniform(0.5, 1.5) for cid, c in customers.items()}
+    return customers, values
+
+
+class TestSamplingPlan:
+    """Tests du tirage et de l'estimateur"""
+
+    def test_stratified_allocation_and_extension(self):
+        """Test allocation proportionnelle, et extension qui conserve l'échantillon"""
+        customers, _ = _population()
+        rng = random.Random(1)
+        plan = SamplingPlan.draw(customers, 30, 'level', rng)
+
+        assert plan.size == 30
+        assert all(len(ids) >= 2 for ids in plan.sample.values())
+        larger = plan.extend(60, rng)
+        assert larger.size == 60
+        assert plan.sample_ids() <= larger.sample_ids()
+
+    @pytest.mark.parametrize('stratify', ['none', 'level'])
+    def test_unbiased_with_nominal_coverage(self, stratify):
+        """Test moyenne des estimations ≈ total, intervalles à 95% couvrant ≈ 95% des cas"""
+        customers, values = _population()
+        true_total = sum(values.values())
+        rng = random.Random(11)
+        estimates = [
+            SamplingPlan.draw(customers, 40, stratify, rng).estimate(values) for _ in range(400)
+        ]
+
+        mean = sum(e.value for e in estimates) / len(estimates)
+        assert abs(mean - true_total) / true_total < 0.02
+        coverage = sum(e.low <= true_total <= e.high for e in estimates) / len(estimates)
+        assert coverage > 0.9
+
+    def test_stratification_reduces_error(self):
+        """Test strates homogènes: intervalle plus étroit qu'en tirage uniforme"""
+        customers, values = _population()
+        uniform = SamplingPlan.draw(customers, 40, 'none', random.Random(5)).estimate(values)
+        stratified = SamplingPlan.draw(customers, 40, 'level', random.Random(5)).estimate(values)
+
+        assert stratified.margin < uniform.margin
+
+    def test_required_size_reaches_target_error(self):
+        """Test taille calculée sur un pilote: l'erreur visée est atteinte"""
+        customers, values = _population(size=2000)
+        rng = random.Random(2)
+        pilot = SamplingPlan.draw(customers, 50, 'level', rng)
+
+        plan = pilot.extend(pilot.required_size(values, 0.02), rng)
+        assert plan.size < len(customers)
+        assert plan.estimate(values).relative_error <= 0.025
+
+
+class TestSampledReport:
+    """Tests du mode estimation de main"""
+
+    def test_full_sample_equals_exact_totals(self, capsys):
+        """Test tous les clients tirés: totaux exacts, intervalle nul"""
+        exact = main(['--totals']).splitlines()
+        report = main(['--sample', '1000', '--stratify', 'zone'])
+        capsys.readouterr()
+
+        lines = report.splitlines()
+        assert lines[0].startswith(exact[0].replace('Grand Total:', 'Grand Total (estimated):'))
+        assert lines[1].startswith(
+            exact[1].replace('Total Tax Collected:', 'Total Tax Collected (estimated):')
+        )
+        assert '± 0.00' in lines[0]
+
+    def test_seed_is_reproducible(self, capsys):
+        """Test même graine: même échantillon, même estimation"""
+        first = main(['--sample', '4', '--seed', '7'])
+        assert main(['--sample', '4', '--seed', '7']) == first
+        capsys.readouterr()
+        assert first.splitlines()[-1] == 'Sample: 4/10 customers'
+
+    @pytest.mark.parametrize('confidence', ['0', '1', '1.0', '95', '-0.5', 'high'])
+    def test_confidence_out_of_range_rejected(self, confidence, capsys):
+        """Test --confidence hors de ]0, 1[: erreur d'usage, pas d'exception de calcul"""
+        with pytest.raises(SystemExit):
+            main(['--sample', '4', '--confidence', confidence])
+        assert '--confidence' in capsys.readouterr().err
@@ -0,0 +1,54 @@
+"""
+Tests du calcul de frais de port par lot
+Vérifie que calculate_many donne exactement les valeurs de calculate.
+"""
+
+import random
+
+import pytest
+
+from src.models.shipping_zone import ShippingZone
+from src.services.shipping_calculator import (
+    DEFAULT_ZONE, ShippingCalculator, build_tariffs
+)
+
+
+ZONES = {
+    'ZONE1': ShippingZone('ZONE1', 5.0, 0.5),
+    'ZONE2': ShippingZone('ZONE2', 7.5, 0.6),
+    'ZONE3': ShippingZone('ZONE3', 10.0, 0.8),
+}
+
+
+class TestCalculateMany:
+    """Tests de ShippingCalculator.calculate_many"""
+
+    def test_matches_scalar_calculation(self):
+        """Test valeurs identiques au calcul client par client"""
+        rng = random.Random(7)
+        names = ['ZONE1', 'ZONE2', 'ZONE3', 'ZONE4', 'UNKNOWN']
+        subtotals = [rng.choice([0.0, 49.99, 50.0, rng.uniform(0, 500)]) for _ in range(500)]
+        weights = [rng.choice([0.0, 5.0, 10.0, 20.0, rng.uniform(0, 40)]) for _ in range(500)]
+        zone_names = [rng.choice(names) for _ in range(500)]
+        calc = ShippingCalculator()
+
+        expected = [
+            calc.calculate(s, w, ZONES.get(z), z)
+            for s, w, z in zip(subtotals, weights, zone_names)
+        ]
+
+        assert calc.calculate_many(subtotals, weights, zone_names, ZONES) == expected
+
+    def test_unknown_zone_uses_default_tariff(self):
+        """Test zone inconnue: tarif DEFAULT, majoration si zone éloignée"""
+        tariffs = build_tariffs(['ZONE4', 'ZONE4', 'NOWHERE'], ZONES)
+
+        assert list(tariffs) == ['ZONE4', 'NOWHERE']
+        assert tariffs['ZONE4'].base == DEFAULT_ZONE.base
+        assert tariffs['ZONE4'].remote is True
+        assert tariffs['NOWHERE'].remote is False
+
+    def test_length_mismatch_raises(self):
+        """Test séquences de longueurs différentes refusées"""
+        with pytest.raises(ValueError, match='Longueurs'):
+            ShippingCalculator().calculate_many([1.0], [1.0, 2.0], ['ZONE1'], ZONES)
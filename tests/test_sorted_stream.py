@@ -0,0 +1,61 @@
+"""
+Tests du traitement en flux d'un orders.csv trié par client
+Vérifie l'identité avec le chemin "chargement complet".
+"""
+
+from dataclasses import replace
+
+import pytest
+
+from benchmarks.synthetic import DatasetSpec, generate_dataset
+from src.main import main
+from src.repositories.order_repository import OrderRepository
+from src.services.order_processor import UnsortedInputError
+
+
+SPEC = DatasetSpec(customers=40, products=15, orders=600, days=10, promo_rate=0.3)
+
+
+@pytest.fixture
+def sorted_dir(tmp_path):
+    return generate_dataset(tmp_path / 'sorted', replace(SPEC, sorted_by_customer=True))
+
+
+@pytest.fixture
+def unsorted_dir(tmp_path):
+    return generate_dataset(tmp_path / 'unsorted', SPEC)
+
+
+class TestSortedStream:
+    """Tests de --sorted-input"""
+
+    def test_stream_matches_full_load(self, sorted_dir, capsys):
+        """Test rapport écrit en flux identique au rapport complet"""
+        full = main(['--data-dir', str(sorted_dir)])
+        capsys.readouterr()
+
+        assert main(['--data-dir', str(sorted_dir), '--sorted-input']) == ''
+        assert capsys.readouterr().out == full + '\n'
+
+    def test_stream_with_filters_and_totals(self, sorted_dir):
+        """Test plage de dates, sous-ensemble de clients et --totals en flux"""
+        options = ['--from', '2025-01-03', '--to', '2025-01-07',
+                   '--customers', 'C000003,C000010,C000031', '--totals']
+
+        expected = main(['--data-dir', str(sorted_dir)] + options)
+
+        assert main(['--data-dir', str(sorted_dir), '--sorted-input'] + options) == expected
+
+    def test_unsorted_input_fails_clearly(self, unsorted_dir):
+        """Test client réapparu hors ordre: erreur explicite"""
+        with pytest.raises(UnsortedInputError, match='non triées'):
+            main(['--data-dir', str(unsorted_dir), '--sorted-input', '--totals'])
+
+    def test_auto_falls_back_to_full_load(self, unsorted_dir, sorted_dir):
+        """Test auto: tri vérifié avant de choisir le flux"""
+        assert OrderRepository.is_sorted_by_customer(sorted_dir / 'orders.csv')
+        assert not OrderRepository.is_sorted_by_customer(unsorted_dir / 'orders.csv')
+
+        report = main(['--data-dir', str(unsorted_dir), '--sorted-input', 'auto'])
+
+        assert report == main(['--data-dir', str(unsorted_dir)])
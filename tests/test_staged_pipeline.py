@@ -0,0 +1,95 @@
+"""
+Tests du pipeline asyncio par étapes
+Vérifie l'identité octet pour octet avec TextReportFormatter.format, l'ordre
+des sections et la contre-pression des files bornées.
+"""
+
+import io
+from dataclasses import replace
+
+import pytest
+
+from benchmarks.synthetic import DatasetSpec, generate_dataset
+from src.main import main
+from src.pipeline.staged import StagedPipeline
+from src.repositories.customer_repository import CustomerRepository
+from src.repositories.order_repository import OrderRepository
+from src.repositories.product_repository import ProductRepository
+from src.repositories.promotion_repository import PromotionRepository
+from src.repositories.shipping_zone_repository import ShippingZoneRepository
+from src.services.order_processor import UnsortedInputError
+
+
+SPEC = DatasetSpec(customers=40, products=15, orders=600, days=10, promo_rate=0.3)
+
+
+@pytest.fixture(params=[False, True], ids=['unsorted', 'sorted'])
+def data_dir(request, tmp_path):
+    return generate_dataset(tmp_path / 'data', replace(SPEC, sorted_by_customer=request.param))
+
+
+def _references(data_dir):
+    return lambda: (
+        CustomerRepository().load_all(data_dir / 'customers.csv'),
+        ProductRepository().load_all(data_dir / 'products.csv'),
+        PromotionRepository().load_all(data_dir / 'promotions.csv'),
+        ShippingZoneRepository().load_all(data_dir / 'shipping_zones.csv'),
+    )
+
+
+class TestStagedPipeline:
+    """Tests de StagedPipeline"""
+
+    def test_main_pipeline_matches_full_report(self, data_dir, capsys):
+        """Test --pipeline: sortie identique au rapport complet"""
+        full = main(['--data-dir', str(data_dir)])
+        capsys.readouterr()
+
+        assert main(['--data-dir', str(data_dir), '--pipeline', '--sorted-input', 'auto']) == ''
+        assert capsys.readouterr().out == full + '\n'
+
+    def test_tiny_queues_keep_order(self, data_dir, capsys):
+        """Test files de capacité 1, lots d'une commande: même texte"""
+        full = main(['--data-dir', str(data_dir)])
+        capsys.readouterr()
+        out = io.StringIO()
+        orders = OrderRepository().iter_all(data_dir / 'orders.csv')
+        pipeline = StagedPipeline(queue_size=1, batch_size=1, write_size=1)
+        pipeline.run(orders, _references(data_dir), out)
+
+        assert out.getvalue() == full + '\n'
+
+    def test_backpressure_bounds_read_ahead(self, tmp_path):
+        """Test entrée triée: à la première écriture, seule une partie des commandes est lue"""
+        data_dir = generate_dataset(tmp_path / 'data', replace(SPEC, sorted_by_customer=True))
+        read = []
+
+        def counting(orders):
+            for order in orders:
+                read.append(order.id)
+                yield order
+
+        class Out(io.StringIO):
+            read_at_first_write = None
+
+            def write(self, text):
+                if self.read_at_first_write is None:
+                    self.read_at_first_write = len(read)
+                return super().write(text)
+
+        out = Out()
+        orders = counting(OrderRepository().iter_all(data_dir / 'orders.csv'))
+        StagedPipeline(queue_size=1, batch_size=10, write_size=1).run(
+            orders, _references(data_dir), out, sorted_input=True
+        )
+        assert out.read_at_first_write < len(read) / 2
+
+    def test_unsorted_input_fails_without_hanging(self, tmp_path):
+        """Test entrée non triée annoncée triée: UnsortedInputError, étapes arrêtées"""
+        data_dir = generate_dataset(tmp_path / 'data', SPEC)
+        orders = OrderRepository().iter_all(data_dir / 'orders.csv')
+
+        with pytest.raises(UnsortedInputError):
+            StagedPipeline(queue_size=1, batch_size=5).run(
+                orders, _references(data_dir), io.StringIO(), sorted_input=True
+            )
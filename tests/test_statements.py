@@ -0,0 +1,86 @@
+"""
+Tests des relevés par client
+Vérifie que les fichiers écrits reprennent exactement les sections du rapport.
+"""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.main import main
+from src.pipeline.statements import (
+    MANIFEST_NAME, StatementWriter, bucket_of, statement_file_name
+)
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+def _sections(report: str) -> dict:
+    """Sections client d'un rapport, indexées par ID"""
+    sections = {}
+    for block in report.split('\n\n'):
+        first_line = block.splitlines()[0]
+        if first_line.startswith('Customer: '):
+            sections[first_line.rsplit('(', 1)[1].rstrip(')')] = block
+    return sections
+
+
+class TestStatementWriter:
+    """Tests de --split-dir"""
+
+    def test_one_file_per_customer(self, tmp_path):
+        """Test un fichier par client, contenu identique à la section du rapport"""
+        full = main([])
+
+        totals = main(['--split-dir', str(tmp_path), '--writers', '3'])
+
+        sections = _sections(full)
+        for cid, section in sections.items():
+            assert (tmp_path / f'{cid}.txt').read_text(encoding='utf-8') == section
+        assert full.endswith(totals)
+
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding='utf-8'))
+        assert manifest['customers'] == len(sections)
+        assert [s['customer_id'] for s in manifest['statements']] == sorted(sections)
+
+    def test_bucket_offsets_locate_sections(self, tmp_path):
+        """Test regroupement en N fichiers: offsets du manifeste exacts"""
+        sections = _sections(main([]))
+
+        main(['--split-dir', str(tmp_path), '--buckets', '3'])
+
+        manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding='utf-8'))
+        for entry in manifest['statements']:
+            assert entry['file'] == f"bucket-{bucket_of(entry['customer_id'], 3):04d}.txt"
+            data = (tmp_path / entry['file']).read_bytes()
+            section = data[entry['offset']:entry['offset'] + entry['length']].decode('utf-8')
+            assert section == sections[entry['customer_id']]
+        assert len(list(tmp_path.glob('bucket-*.txt'))) <= 3
+
+    def test_empty_input_writes_manifest(self, tmp_path):
+        """Test aucun client: manifeste vide"""
+        manifest = StatementWriter(tmp_path).write([])
+
+        assert manifest.entries == ()
+        assert (tmp_path / MANIFEST_NAME).exists()
+
+    def test_sanitized_ids_do_not_share_a_file(self):
+        """Test "A/B" et "A_B": noms distincts, ID sûr inchangé"""
+        assert statement_file_name('A_B') == 'A_B.txt'
+        assert statement_file_name('A/B').startswith('A_B-')
+        assert statement_file_name('A/B') != statement_file_name('A:B')
+
+    def test_case_collision_rejected(self, tmp_path):
+        """Test "C001" et "c001" (même fichier sur un système insensible à la casse): erreur"""
+        data_dir = tmp_path / 'data'
+        shutil.copytree(DATA_PATH, data_dir)
+        with open(data_dir / 'customers.csv', 'a', encoding='utf-8') as f:
+            f.write('c001,Alice Bis,BASIC,ZONE1,EUR\n')
+        with open(data_dir / 'orders.csv', 'a', encoding='utf-8') as f:
+            f.write('O900,c001,P001,1,10.00,2025-01-20,,10:00\n')
+
+        with pytest.raises(ValueError, match='même fichier'):
+            main(['--data-dir', str(data_dir), '--split-dir', str(tmp_path / 'out')])
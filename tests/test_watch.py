@@ -0,0 +1,167 @@
+"""
+Tests du mode watch
+Vérifie que le rapport incrémental est identique à un recalcul complet.
+"""
+
+import gzip
+import io
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.main import main
+from src.pipeline.watch import ReportWatcher, _complete_end, _complete_length
+
+
+DATA_PATH = Path(__file__).parent.parent / 'legacy' / 'data'
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Copie modifiable des données legacy"""
+    target = tmp_path / 'data'
+    shutil.copytree(DATA_PATH, target)
+    return target
+
+
+def _touch(path: Path) -> None:
+    """Force un changement de mtime (réécriture de même taille)"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _full_report(data_dir: Path) -> str:
+    return main(['--data-dir', str(data_dir)])
+
+
+class TestReportWatcher:
+    """Tests de ReportWatcher"""
+
+    def test_initial_report_matches_main(self, data_dir):
+        """Test rapport initial identique au rapport complet"""
+        assert ReportWatcher(data_dir).start() == _full_report(data_dir)
+
+    def test_no_change_does_nothing(self, data_dir):
+        """Test qu'un cycle sans changement ne régénère rien"""
+        watcher = ReportWatcher(data_dir)
+        watcher.start()
+
+        assert watcher.poll_once() is False
+
+    def test_appended_orders_are_parsed_incrementally(self, data_dir):
+        """Test ajout en fin de orders.csv: seules les nouvelles lignes sont lues"""
+        watcher = ReportWatcher(data_dir)
+        watcher.start()
+        offset = watcher._orders_offset
+
+        with open(data_dir / 'orders.csv', 'a', encoding='utf-8') as f:
+            f.write('O900,C002,P001,1,1299.00,2025-01-29,PREMIUM10,09:00\n')
+            f.write('O901,C003,P00')  # Ligne en cours d'écriture
+
+        assert watcher.poll_once() is True
+        assert watcher._orders_offset > offset
+        partial = watcher.report
+
+        with open(data_dir / 'orders.csv', 'a', encoding='utf-8') as f:
+            f.write('2,2,29.99,2025-01-29,,09:30\n')
+
+        assert watcher.poll_once() is True
+        assert partial != watcher.report
+        assert watcher.report == _full_report(data_dir)
+
+    def test_rewritten_orders_trigger_full_reload(self, data_dir):
+        """Test orders.csv tronqué: rechargement complet"""
+        watcher = ReportWatcher(data_dir)
+        watcher.start()
+
+        orders = data_dir / 'orders.csv'
+        lines = orders.read_text(encoding='utf-8').splitlines(keepends=True)
+        orders.write_text(''.join(lines[:10]), encoding='utf-8')
+
+        assert watcher.poll_once() is True
+        assert watcher.report == _full_report(data_dir)
+
+    def test_reference_rewrite_recomputes_affected_customers(self, data_dir):
+        """Test promotion désactivée: rapport identique à un recalcul complet"""
+        watcher = ReportWatcher(data_dir)
+        watcher.start()
+
+        promotions = data_dir / 'promotions.csv'
+        promotions.write_text(
+            promotions.read_text(encoding='utf-8').replace('PREMIUM10,PERCENTAGE,10,true',
+                                                           'PREMIUM10,PERCENTAGE,10,false'),
+            encoding='utf-8'
+        )
+        _touch(promotions)
+
+        assert watcher.poll_once() is True
+        assert watcher.report == _full_report(data_dir)
+
+    def test_compressed_orders_reloaded_on_change(self, data_dir):
+        """Test orders.csv.gz surveillé: relu en entier à chaque changement"""
+        orders = data_dir / 'orders.csv'
+        content = orders.read_bytes()
+        orders.unlink()
+        compressed = data_dir / 'orders.csv.gz'
+        compressed.write_bytes(gzip.compress(content))
+        watcher = ReportWatcher(data_dir)
+
+        assert watcher.start() == _full_report(data_dir)
+        assert watcher.poll_once() is False
+
+        compressed.write_bytes(gzip.compress(
+            content + b'O900,C002,P001,1,1299.00,2025-01-29,PREMIUM10,09:00\n'
+        ))
+        _touch(compressed)
+        assert watcher.poll_once() is True
+        assert watcher.report == _full_report(data_dir)
+
+    def test_run_emits_initial_report(self, data_dir):
+        """Test run(): rapport initial émis, arrêt après max_cycles"""
+        emitted = []
+
+        ReportWatcher(data_dir).run(emitted.append, interval=0, max_cycles=2)
+
+        assert emitted == [_full_report(data_dir)]
+
+
+    @pytest.mark.parametrize('options', [
+        ['--from', '2025-01-01'],
+        ['--to', '2025-01-31'],
+        ['--customers', 'C001'],
+        ['--customers-file', 'ids.txt'],
+        ['--totals'],
+        ['--top', '3'],
+        ['--split-dir', 'out'],
+        ['--columnar'],
+        ['--workers', '2'],
+        ['--rejects-dir', 'rejects'],
+        ['--sorted-input'],
+        ['--explain', 'C001'],
+        ['--rollups', 'rollups.txt'],
+    ], ids=lambda options: options[0])
+    def test_options_ignored_by_watch_rejected(self, options, capsys):
+        """Test option sans effet en mode watch: erreur d'usage au lieu d'être ignorée"""
+        with pytest.raises(SystemExit):
+            main(['--watch', *options])
+        assert 'incompatible avec ' + options[0] in capsys.readouterr().err
+
+
+class TestCompleteLength:
+    """Tests de _complete_length"""
+
+    def test_cuts_after_last_complete_record(self):
+        """Test qu'une fin de ligne dans un champ quoté ne termine pas l'enregistrement"""
+        assert _complete_length(b'a,b\nc,"d\ne') == 4
+        assert _complete_length(b'a,b\nc,"d\ne"\n') == 12
+        assert _complete_length(b'a,b') == 0
+
+    def test_complete_end_scans_by_blocks(self, monkeypatch):
+        """Test fin du dernier enregistrement complet, guillemets comptés entre blocs"""
+        monkeypatch.setattr('src.pipeline.watch._SCAN_BLOCK_BYTES', 3)
+        data = b'h\na,b\nc,"d\ne"\nf,"g\n'
+
+        assert _complete_end(io.BytesIO(data), 2, len(data)) == 14
+        assert _complete_end(io.BytesIO(data), 14, len(data)) == 14